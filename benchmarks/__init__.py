@@ -0,0 +1,3 @@
+"""
+Benchmarks for parsion, run as modules from the repository root
+"""
@@ -0,0 +1,87 @@
+"""
+Concurrent parsing benchmark
+
+Parses a batch of expressions with parse_concurrent, using an increasing
+number of threads, and reports the throughput. On CPython with the GIL,
+threads are not expected to increase throughput, but on free-threaded builds
+they should.
+
+Usage:
+
+    python -m benchmarks.bench_concurrent [-n INPUTS] [THREADS ...]
+"""
+import argparse
+import sys
+import time
+from typing import Any, List, Set
+
+from parsion import Parsion
+
+from .bench_states import expr_grammar
+
+
+class BenchLang(Parsion):
+    LEXER_RULES = [
+        (None,      r'(\s+)', lambda x: None),
+        ('INT',     r'([0-9]+)', lambda x: int(x)),
+        ('(',       r'(\()', lambda x: None),
+        (')',       r'(\))', lambda x: None),
+        (';',       r'(;)', lambda x: None),
+    ] + [
+        (f'op{i}_{op}', rf'(\[{i}{op}\])', lambda x: None)
+        for i in range(4)
+        for op in 'ab'
+    ]
+    GRAMMAR_RULES = expr_grammar(4)
+
+    def __getattr__(self, name: str) -> Any:
+        # Use the same handler for all operators
+        if name.startswith('op'):
+            return self.op
+        raise AttributeError(name)
+
+    def op(self, lhs: int, rhs: int) -> int:
+        return lhs + rhs
+
+    def expr_int(self, v: int) -> int:
+        return v
+
+    def stmts_list(self, stmt: int, stmts: List[int]) -> List[int]:
+        return [stmt] + stmts
+
+    def stmts_tail(self, stmt: int) -> List[int]:
+        return [stmt]
+
+    def stmt_error(self, gen: str, start: int, pos: int, end: int,
+                   expect: Set[str]) -> Any:
+        return None
+
+
+def gil_status() -> str:
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    if is_gil_enabled is None:
+        return 'GIL'
+    return 'GIL' if is_gil_enabled() else 'free-threaded'
+
+
+def run(inputs: List[str], threads: int) -> None:
+    lang = BenchLang()
+    start = time.perf_counter()
+    lang.parse_concurrent(inputs, max_workers=threads)
+    duration = time.perf_counter() - start
+    print(f'{threads:>3} threads {len(inputs) / duration:>10.0f} inputs/s')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('-n', '--inputs', type=int, default=2000)
+    parser.add_argument('threads', type=int, nargs='*', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    inputs = [
+        f'{i} [0a] ({i} [3b] 2) [1a] 7; {i} [2b] 4 [0a] 1; ({i})'
+        for i in range(args.inputs)
+    ]
+    print(f'Python {sys.version.split()[0]}, {gil_status()}')
+    for threads in args.threads:
+        run(inputs, threads)
@@ -0,0 +1,37 @@
+"""
+Error recovery benchmark
+
+Parses statement lists where a part of the statements contain errors, which
+are recovered by an error handler, and reports the parse time per statement.
+
+Usage:
+
+    python -m benchmarks.bench_error_recovery [STATEMENTS ...]
+"""
+import argparse
+import time
+
+from .bench_concurrent import BenchLang
+
+
+def run(statements: int) -> None:
+    lang = BenchLang()
+    for name, stmt in [
+        ('valid', '1 [0a] (2 [3b] 3)'),
+        ('errors', '1 [0a] (2 [3b] 3 4 5'),
+    ]:
+        input = '; '.join([stmt] * statements)
+        start = time.perf_counter()
+        lang.parse(input)
+        duration = time.perf_counter() - start
+        print(f'{statements:>7} statements {name:<8} '
+              f'{duration * 1e3:>9.1f} ms '
+              f'{duration / statements * 1e6:>7.1f} us/statement')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('statements', type=int, nargs='*',
+                        default=[100, 1000, 10000])
+    for statements in parser.parse_args().statements:
+        run(statements)
@@ -0,0 +1,61 @@
+"""
+Expected token query benchmark
+
+Queries the expected tokens at increasing offsets from the middle of the
+inputs of the benchmark suite languages, a few characters apart, as when
+completing while moving through a document. Reports the time per query when
+parsing from the start each time, and when continuing from the previous
+query.
+
+Usage:
+
+    python -m benchmarks.bench_expected [-q QUERIES] [-s STEP] [SIZE]
+"""
+import argparse
+from typing import Any, Iterator
+
+from parsion import ParsionParseError
+
+from .languages import LANGUAGES
+from .suite import measure
+
+
+def _query(lang: Any, input: str, offsets: Iterator[int],
+           from_start: bool) -> None:
+    if from_start:
+        lang._expected_prefix = None
+    try:
+        lang.expected_at(input, next(offsets))
+    except ParsionParseError:
+        # An error just before the offset, which needs tokens after the
+        # offset to recover from
+        pass
+
+
+def run(size: int, queries: int, step: int) -> None:
+    for name, (cls, generate_input) in LANGUAGES.items():
+        lang = cls()
+        input = generate_input(size)
+
+        # One more query than timed, which measure makes first
+        results = []
+        for from_start in (True, False):
+            offsets = iter(range(len(input) // 2, len(input), step))
+            results.append(measure(
+                lambda: _query(lang, input, offsets, from_start),
+                queries
+            ))
+        from_start_stats, continued = results
+
+        print(f'{name:<6} {len(input):>8} chars '
+              f'{from_start_stats["median"] * 1e3:>8.2f} ms/query from start '
+              f'{continued["median"] * 1e3:>8.3f} ms/query continued')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('-q', '--queries', type=int, default=20)
+    parser.add_argument('-s', '--step', type=int, default=10)
+    parser.add_argument('size', type=int, nargs='?', default=100000)
+    args = parser.parse_args()
+    run(args.size, args.queries, args.step)
@@ -0,0 +1,49 @@
+"""
+Position-free parse mode benchmark
+
+Parses the inputs of the benchmark suite languages with and without tracking
+positions, and reports the time per parser step, a shift or a reduce.
+
+Usage:
+
+    python -m benchmarks.bench_fast_mode [-r REPEAT] [SIZE]
+"""
+import argparse
+
+from .languages import LANGUAGES
+from .suite import measure
+
+
+def run(size: int, repeat: int) -> None:
+    for name, (cls, generate_input) in LANGUAGES.items():
+        fast_cls = type(f'Fast{cls.__name__}', (cls,),
+                        {'TRACK_POSITIONS': False})
+        lang = cls()
+        fast_lang = fast_cls()
+        tokens = list(lang.lexer.tokenize(generate_input(size)))
+
+        # Count the steps of one parse
+        instrumentation = lang.parser.enable_instrumentation()
+        lang.parser.parse(tokens, lang)
+        lang.parser.disable_instrumentation()
+        steps = sum(instrumentation.shifts.values()) + \
+            sum(instrumentation.gotos.values()) + \
+            sum(instrumentation.reduces.values())
+
+        tracked = measure(lambda: lang.parser.parse(tokens, lang), repeat)
+        fast = measure(lambda: fast_lang.parser.parse(tokens, fast_lang),
+                       repeat)
+
+        saving = 1 - fast['median'] / tracked['median']
+        print(f'{name:<6} {steps:>8} steps '
+              f'{tracked["median"] / steps * 1e9:>7.0f} ns/step tracked '
+              f'{fast["median"] / steps * 1e9:>7.0f} ns/step fast '
+              f'{saving * 100:>6.1f}% saved')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    parser.add_argument('size', type=int, nargs='?', default=100000)
+    args = parser.parse_args()
+    run(args.size, args.repeat)
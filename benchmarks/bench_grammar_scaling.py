@@ -0,0 +1,170 @@
+"""
+Grammar size scaling benchmark for the table generator
+
+Builds synthetic grammars of increasing size N, in a few shapes, and reports
+the number of rules and states, the build time and the peak memory used by
+the generator. For each step, the growth relative to the previous size is
+reported as an exponent, where 1 is linear growth. Steps where the build time
+or memory grows faster than the limit, by default N^1.5, are flagged. Build
+times below 10 ms are too noisy to compare, and are not flagged.
+
+Usage:
+
+    python -m benchmarks.bench_grammar_scaling [-s SHAPE ...] [-l LIMIT]
+        [N ...]
+"""
+import argparse
+import math
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+from parsion.parsegen import ParsionFSM
+
+from .bench_states import expr_grammar
+
+Grammar = List[Tuple[Optional[str], str, str]]
+
+MIN_TIME = 0.01
+
+
+def precedence_grammar(n: int) -> Grammar:
+    """
+    Expressions with N precedence levels
+    """
+    return expr_grammar(n)
+
+
+def alternation_grammar(n: int) -> Grammar:
+    """
+    Statements of N kinds, each starting with its own keyword
+    """
+    rules: Grammar = [
+        ('entry',       'entry',    'stmts'),
+        ('stmts_list',  'stmts',    'stmts stmt'),
+        ('stmts_first', 'stmts',    'stmt'),
+    ]
+    for i in range(n):
+        rules.append((f'stmt{i}', 'stmt', f'_K{i} value _;'))
+    rules += [
+        (None,          'value',    'INT'),
+        (None,          'value',    'NAME'),
+    ]
+    return rules
+
+
+def sequence_grammar(n: int) -> Grammar:
+    """
+    Two rules of N symbols, sharing all but the last symbol
+    """
+    prefix = ' '.join(f'T{i}' for i in range(n - 1))
+    return [
+        ('entry',       'entry',    'item'),
+        ('item_a',      'item',     f'{prefix} A'),
+        ('item_b',      'item',     f'{prefix} B'),
+    ]
+
+
+def error_grammar(n: int) -> Grammar:
+    """
+    Blocks of N kinds, each with its own error handler
+    """
+    rules: Grammar = [
+        ('entry',       'entry',    'blocks'),
+        ('blocks_list', 'blocks',   'blocks block'),
+        ('blocks_first', 'blocks',  'block'),
+    ]
+    for i in range(n):
+        rules += [
+            (None,              'block',        f'block{i}'),
+            (f'block{i}',       f'block{i}',    f'_OPEN{i} body{i} _CLOSE'),
+            (None,              f'body{i}',     'INT'),
+            (f'body{i}_error',  f'body{i}',     '$ERROR'),
+        ]
+    return rules
+
+
+SHAPES: Dict[str, Callable[[int], Grammar]] = {
+    'precedence': precedence_grammar,
+    'alternation': alternation_grammar,
+    'sequence': sequence_grammar,
+    'errors': error_grammar,
+}
+
+
+def measure(grammar: Grammar) -> Dict[str, float]:
+    start = time.perf_counter()
+    fsm = ParsionFSM(grammar)
+    duration = time.perf_counter() - start
+
+    # Measure memory in a separate run, tracing slows down the generator
+    tracemalloc.start()
+    ParsionFSM(grammar)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'rules': len(grammar),
+        'states': len(fsm.states),
+        'time': duration,
+        'memory': peak,
+    }
+
+
+def exponent(n0: int, v0: float, n1: int, v1: float) -> float:
+    """
+    Growth exponent between two sizes, v1 / v0 = (n1 / n0) ^ exponent
+
+    >>> round(exponent(10, 1.0, 20, 4.0), 3)
+    2.0
+    """
+    if v0 <= 0 or v1 <= 0:
+        return 0.0
+    return math.log(v1 / v0) / math.log(n1 / n0)
+
+
+def run(shape: str, sizes: List[int], limit: float) -> int:
+    """
+    Run one shape for all sizes, and return the number of flagged steps
+    """
+    flagged = 0
+    previous: Optional[Tuple[int, Dict[str, float]]] = None
+    for n in sizes:
+        result = measure(SHAPES[shape](n))
+        line = (f'{shape:<12} N={n:<5} '
+                f'{result["rules"]:>6} rules '
+                f'{result["states"]:>6} states '
+                f'{result["time"]:>8.3f} s '
+                f'{result["memory"] / 1e6:>8.1f} MB')
+        if previous is not None:
+            n0, result0 = previous
+            growth = {
+                key: exponent(n0, result0[key], n, result[key])
+                for key in ['states', 'time', 'memory']
+            }
+            line += ''.join(
+                f' {key} ^{value:.2f}' for key, value in growth.items())
+            if (growth['time'] > limit and result0['time'] >= MIN_TIME) \
+                    or growth['memory'] > limit:
+                line += '  SUPERLINEAR'
+                flagged += 1
+        print(line, flush=True)
+        previous = (n, result)
+    return flagged
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('-s', '--shape', action='append',
+                        choices=list(SHAPES),
+                        help='grammar shape to run, default all')
+    parser.add_argument('-l', '--limit', type=float, default=1.5,
+                        help='growth exponent flagged as superlinear')
+    parser.add_argument('sizes', type=int, nargs='*',
+                        default=[10, 20, 40, 80, 160])
+    args = parser.parse_args()
+    flagged = sum(
+        run(shape, args.sizes, args.limit)
+        for shape in args.shape or list(SHAPES)
+    )
+    raise SystemExit(1 if flagged > 0 else 0)
@@ -0,0 +1,62 @@
+"""
+Import time benchmark
+
+Measures the time to import the package, using python -X importtime, in a
+new interpreter for each run. The median cumulative import time of each
+module is reported.
+
+Usage:
+
+    python -m benchmarks.bench_import [-n RUNS] [--max-ms MS] [MODULE ...]
+
+With --max-ms, exits with an error if the import time of any module is above
+the limit, to be used for tracking regressions.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import List
+
+
+def import_time(module: str) -> float:
+    """
+    Import a module in a new interpreter, and return its cumulative import
+    time, in milliseconds
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    for line in result.stderr.splitlines():
+        _, cumulative, name = line.split('|')
+        if name.strip() == module:
+            return int(cumulative) / 1000
+    raise ValueError(f'{module}: not found in import time output')
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('-n', '--runs', type=int, default=20)
+    parser.add_argument('--max-ms', type=float, default=None,
+                        help='fail if any import time is above this limit')
+    parser.add_argument('modules', nargs='*',
+                        default=['parsion', 'parsion.parsegen'])
+    args = parser.parse_args(argv)
+
+    status = 0
+    for module in args.modules:
+        median = statistics.median(
+            import_time(module) for _ in range(args.runs)
+        )
+        print(f'{module:<24} {median:>8.2f} ms')
+        if args.max_ms is not None and median > args.max_ms:
+            print(f'{module}: above limit of {args.max_ms} ms')
+            status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,95 @@
+"""
+Incremental table generation benchmark for grammar dialects
+
+Builds a base grammar of statements and expressions, and dialects adding a
+few rules to it, both from scratch and by extending the generator of the
+base. Reports the build times, and how many states of each dialect were
+copied from the base.
+
+Rules added outside of the expressions, such as new statements, leave most
+states of the base unchanged. Rules added to the expressions change the
+lookahead of nearly every state, so little can be reused.
+
+Usage:
+
+    python -m benchmarks.bench_incremental [-r REPEAT] [LEVELS]
+"""
+import argparse
+from typing import Dict, List, Optional, Tuple
+
+from parsion.parsegen import ParsionFSM
+
+from .suite import measure
+
+Grammar = List[Tuple[Optional[str], str, str]]
+
+
+def base_grammar(levels: int) -> Grammar:
+    """
+    Statements with expressions of N precedence levels
+    """
+    rules: Grammar = [
+        ('entry',       'entry',    'stmts'),
+        ('stmts_list',  'stmts',    'stmts stmt'),
+        ('stmts_first', 'stmts',    'stmt'),
+        ('assign',      'stmt',     'NAME _= expr0 _;'),
+        ('if',          'stmt',     '_IF expr0 _THEN stmts _END'),
+        ('while',       'stmt',     '_WHILE expr0 _DO stmts _END'),
+    ]
+    for i in range(levels):
+        rules += [
+            (f'op{i}_a',    f'expr{i}',     f'expr{i} _op{i}_a expr{i + 1}'),
+            (f'op{i}_b',    f'expr{i}',     f'expr{i} _op{i}_b expr{i + 1}'),
+            (None,          f'expr{i}',     f'expr{i + 1}'),
+        ]
+    rules += [
+        ('expr_int',    f'expr{levels}',    'INT'),
+        ('expr_name',   f'expr{levels}',    'NAME'),
+        (None,          f'expr{levels}',    '_( expr0 _)'),
+    ]
+    return rules
+
+
+def dialects(levels: int) -> Dict[str, Grammar]:
+    return {
+        'print': [
+            ('print',   'stmt',     '_PRINT expr0 _;'),
+        ],
+        'return': [
+            ('return',  'stmt',     '_RETURN _;'),
+            ('return',  'stmt',     '_RETURN expr0 _;'),
+        ],
+        'call': [
+            ('call',    f'expr{levels}',    'NAME _( expr0 _)'),
+        ],
+        'operator': [
+            ('op_c',    f'expr{levels - 1}',
+             f'expr{levels - 1} _op_c expr{levels}'),
+        ],
+    }
+
+
+def run(levels: int, repeat: int) -> None:
+    rules = base_grammar(levels)
+    base_stats = measure(lambda: ParsionFSM(rules), repeat)
+    base = ParsionFSM(rules)
+    print(f'{"base":<10} {len(base.states):>6} states '
+          f'{base_stats["median"] * 1e3:>9.2f} ms')
+
+    for name, extra in dialects(levels).items():
+        dialect = rules + extra
+        scratch = measure(lambda: ParsionFSM(dialect), repeat)
+        incremental = measure(lambda: ParsionFSM(dialect, base=base), repeat)
+        fsm = ParsionFSM(dialect, base=base)
+        print(f'{name:<10} {len(fsm.states):>6} states '
+              f'{scratch["median"] * 1e3:>9.2f} ms scratch '
+              f'{incremental["median"] * 1e3:>9.2f} ms incremental '
+              f'{fsm.base_states:>6} states copied')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    parser.add_argument('levels', type=int, nargs='?', default=20)
+    args = parser.parse_args()
+    run(args.levels, args.repeat)
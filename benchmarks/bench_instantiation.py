@@ -0,0 +1,50 @@
+"""
+Instantiation benchmark
+
+Compares the time to create an instance of a language class when the tables
+and lexer are compiled for each instance, which was the case before they were
+shared per class, with the time to create further instances of an already
+compiled class.
+
+Usage:
+
+    python -m benchmarks.bench_instantiation [COUNT]
+"""
+import sys
+import time
+
+from parsion import Parsion
+
+from .bench_states import expr_grammar
+
+
+class BenchLang(Parsion):
+    LEXER_RULES = [
+        (None,      r'(\s+)', lambda x: None),
+        ('INT',     r'([0-9]+)', lambda x: int(x)),
+    ]
+    GRAMMAR_RULES = expr_grammar(10)
+    SELF_CHECK = False
+
+
+def run(count: int) -> None:
+    start = time.perf_counter()
+    for _ in range(count):
+        # Drop the compiled lexer and parser, to compile for each instance
+        if '_compiled' in BenchLang.__dict__:
+            del BenchLang._compiled
+        BenchLang()
+    uncached = (time.perf_counter() - start) / count
+
+    BenchLang()
+    start = time.perf_counter()
+    for _ in range(count):
+        BenchLang()
+    cached = (time.perf_counter() - start) / count
+
+    print(f'compiled per instance: {uncached * 1e3:>10.3f} ms')
+    print(f'shared per class:      {cached * 1e3:>10.3f} ms')
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,40 @@
+"""
+Instrumentation overhead benchmark
+
+Parses the inputs of the benchmark suite languages with and without
+instrumentation enabled, and reports the overhead of instrumentation.
+
+Usage:
+
+    python -m benchmarks.bench_instrumentation [-r REPEAT] [SIZE]
+"""
+import argparse
+
+from .languages import LANGUAGES
+from .suite import measure
+
+
+def run(size: int, repeat: int) -> None:
+    for name, (cls, generate_input) in LANGUAGES.items():
+        lang = cls()
+        tokens = list(lang.lexer.tokenize(generate_input(size)))
+
+        plain = measure(lambda: lang.parser.parse(tokens, lang), repeat)
+        lang.parser.enable_instrumentation()
+        instrumented = measure(lambda: lang.parser.parse(tokens, lang),
+                               repeat)
+        lang.parser.disable_instrumentation()
+
+        overhead = instrumented['median'] / plain['median'] - 1
+        print(f'{name:<6} '
+              f'{plain["median"] * 1e3:>9.2f} ms plain '
+              f'{instrumented["median"] * 1e3:>9.2f} ms instrumented '
+              f'{overhead * 100:>6.1f}% overhead')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    parser.add_argument('size', type=int, nargs='?', default=100000)
+    args = parser.parse_args()
+    run(args.size, args.repeat)
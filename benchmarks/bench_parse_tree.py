@@ -0,0 +1,75 @@
+"""
+Parse tree benchmark
+
+Compares parsing into a tree of nested tuples, built by one handler per rule,
+with parse_tree, which builds an array based tree without calling handlers.
+Reports time and memory of the resulting tree per input size.
+
+Usage:
+
+    python -m benchmarks.bench_parse_tree [STATEMENTS ...]
+"""
+import argparse
+import sys
+import time
+from typing import Any, Callable, Tuple
+
+from parsion.table import _deep_sizeof
+
+from .bench_concurrent import BenchLang
+
+
+class TupleLang(BenchLang):
+    """
+    Build a tuple node for every rule with a handler name
+    """
+    def op(self, lhs: Any, rhs: Any) -> Any:
+        return ('op', lhs, rhs)
+
+    def expr_int(self, v: Any) -> Any:
+        return ('expr_int', v)
+
+    def stmts_list(self, stmt: Any, stmts: Any) -> Any:
+        return ('stmts_list', stmt, stmts)
+
+    def stmts_tail(self, stmt: Any) -> Any:
+        return ('stmts_tail', stmt)
+
+
+def measure(func: Callable[[], Any]) -> Tuple[float, Any]:
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def run(statements: int) -> None:
+    input = '; '.join(
+        f'{i} [0a] ({i} [3b] 2) [1a] 7'
+        for i in range(statements)
+    )
+    tuple_lang = TupleLang()
+    tree_lang = BenchLang()
+
+    tuple_time, tuple_tree = measure(lambda: tuple_lang.parse(input))
+    tree_time, tree = measure(lambda: tree_lang.parse_tree(input))
+
+    # Token values are small ints, shared by both trees, and not counted
+    nodes = len(tree)
+    tuple_size = _deep_sizeof(tuple_tree, set(map(id, tree.values)))
+    tree_size = _deep_sizeof(vars(tree), set(map(id, tree.values)))
+
+    print(f'{statements:>6} statements {nodes:>7} nodes | '
+          f'handlers {tuple_time * 1e3:>8.1f} ms '
+          f'{tuple_size / nodes:>6.1f} B/node | '
+          f'parse_tree {tree_time * 1e3:>8.1f} ms '
+          f'{tree_size / nodes:>6.1f} B/node')
+
+
+if __name__ == '__main__':
+    # The tuple tree is nested as deep as the statement list is long
+    sys.setrecursionlimit(100000)
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('statements', type=int, nargs='*',
+                        default=[100, 1000, 10000])
+    for statements in parser.parse_args().statements:
+        run(statements)
@@ -0,0 +1,74 @@
+"""
+State count benchmark for the table generator
+
+Builds expression grammars with an increasing number of precedence levels,
+and reports the number of states and items, the build time and the peak
+memory used by the generator.
+
+Usage:
+
+    python -m benchmarks.bench_states [-j PROCESSES] [LEVELS ...]
+"""
+import argparse
+import time
+import tracemalloc
+from typing import List, Optional, Tuple
+
+from parsion.parsegen import ParsionFSM
+
+
+def expr_grammar(levels: int) -> List[Tuple[Optional[str], str, str]]:
+    """
+    Statement list grammar with two binary operators per precedence level
+    """
+    rules: List[Tuple[Optional[str], str, str]] = [
+        ('entry',       'entry',        'stmts'),
+        ('stmts_list',  'stmts',        'stmt _; stmts'),
+        ('stmts_tail',  'stmts',        'stmt'),
+        (None,          'stmt',         'expr0'),
+        ('stmt_error',  'stmt',         '$ERROR'),
+    ]
+    for i in range(levels):
+        rules += [
+            (f'op{i}_a',    f'expr{i}',     f'expr{i} _op{i}_a expr{i + 1}'),
+            (f'op{i}_b',    f'expr{i}',     f'expr{i} _op{i}_b expr{i + 1}'),
+            (None,          f'expr{i}',     f'expr{i + 1}'),
+        ]
+    rules += [
+        ('expr_int',    f'expr{levels}',    'INT'),
+        (None,          f'expr{levels}',    '_( expr0 _)'),
+    ]
+    return rules
+
+
+def run(levels: int, processes: Optional[int]) -> None:
+    grammar = expr_grammar(levels)
+
+    start = time.perf_counter()
+    fsm = ParsionFSM(grammar, processes)
+    duration = time.perf_counter() - start
+
+    # Measure memory in a separate run, tracing slows down the generator.
+    # Only memory of this process is traced
+    tracemalloc.start()
+    ParsionFSM(grammar, processes)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f'{len(grammar):>6} rules '
+          f'{len(fsm.states):>6} states '
+          f'{len(fsm.pool.items):>8} items '
+          f'{len(fsm.pool.follows):>6} follow sets '
+          f'{duration:>8.3f} s '
+          f'{peak / 1e6:>8.1f} MB')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('-j', '--processes', type=int, default=None,
+                        help='build states in a pool of processes')
+    parser.add_argument('levels', type=int, nargs='*',
+                        default=[10, 20, 40, 80])
+    args = parser.parse_args()
+    for levels in args.levels:
+        run(levels, args.processes)
@@ -0,0 +1,56 @@
+"""
+Parse table load benchmark
+
+Compares the time to get a usable parse table by generating it, by
+compressing a precalculated dict table, and by loading the binary format with
+mmap, for expression grammars of increasing size.
+
+Usage:
+
+    python -m benchmarks.bench_table_load [LEVELS ...]
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Any, Callable
+
+from parsion.binary import dump_tables, load_tables
+from parsion.parsegen import ParsionFSM
+from parsion.table import ParsionCompressedTable
+
+from .bench_states import expr_grammar
+
+
+def timed(func: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def run(levels: int) -> None:
+    grammar = expr_grammar(levels)
+    exported = ParsionFSM(grammar).export()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'bench.tables')
+        with open(path, 'wb') as f:
+            dump_tables(f, *exported)
+
+        generate = timed(lambda: ParsionFSM(grammar))
+        compress = timed(lambda: ParsionCompressedTable(exported[1]))
+        load = timed(lambda: load_tables(path))
+
+        print(f'{len(exported[1]):>6} states '
+              f'{os.path.getsize(path) / 1e3:>8.1f} kB '
+              f'generate {generate * 1e3:>9.2f} ms '
+              f'compress {compress * 1e3:>9.2f} ms '
+              f'load {load * 1e3:>7.2f} ms')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('levels', type=int, nargs='*',
+                        default=[10, 20, 40, 80])
+    for levels in parser.parse_args().levels:
+        run(levels)
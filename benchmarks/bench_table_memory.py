@@ -0,0 +1,57 @@
+"""
+Parse table memory benchmark
+
+Compares the estimated memory of the dict form of the parse table with the
+compressed form, and the lookup time of both, for a set of grammars.
+
+Usage:
+
+    python -m benchmarks.bench_table_memory [LEVELS ...]
+"""
+import argparse
+import time
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from parsion.parsegen import ParsionFSM
+from parsion.table import ParsionCompressedTable, memory_report
+
+from .bench_states import expr_grammar
+
+
+def lookup_time(table: Sequence[Mapping[str, Tuple[str, int]]],
+                entries: List[Tuple[int, str]]) -> float:
+    start = time.perf_counter()
+    for state, sym in entries:
+        table[state][sym]
+    return (time.perf_counter() - start) / len(entries)
+
+
+def run(name: str, grammar: List[Tuple[Optional[str], str, str]]) -> None:
+    _, table, _ = ParsionFSM(grammar).export()
+    report: Dict[str, int] = memory_report(table)
+    entries = [
+        (state_id, sym)
+        for state_id, state in enumerate(table)
+        for sym in state
+    ]
+    dict_ns = lookup_time(table, entries) * 1e9
+    compressed_ns = lookup_time(ParsionCompressedTable(table), entries) * 1e9
+
+    ratio = report['compressed_bytes'] / report['dict_bytes']
+    print(f'{name:<12} '
+          f'{report["states"]:>6} states '
+          f'{report["rows"]:>6} rows '
+          f'{report["entries"]:>8} entries '
+          f'{report["packed_slots"]:>8} slots '
+          f'{report["dict_bytes"] / 1e3:>9.1f} kB dict '
+          f'{report["compressed_bytes"] / 1e3:>9.1f} kB compressed '
+          f'({ratio:.0%}) '
+          f'{dict_ns:>5.0f} / {compressed_ns:>5.0f} ns per lookup')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('levels', type=int, nargs='*', default=[4, 10, 40])
+    args = parser.parse_args()
+    for levels in args.levels:
+        run(f'expr{levels}', expr_grammar(levels))
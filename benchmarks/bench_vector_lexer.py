@@ -0,0 +1,51 @@
+"""
+Vectorized lexer benchmark
+
+Tokenizes the inputs of the benchmark suite languages with the regular
+expression lexer and the NumPy lexer, and reports the time per token. For the
+NumPy lexer, both token objects and token columns are measured, and the peak
+memory per input character for columns. Requires NumPy.
+
+Usage:
+
+    python -m benchmarks.bench_vector_lexer [-r REPEAT] [SIZE]
+"""
+import argparse
+from typing import Dict
+
+from parsion import ParsionLexer
+from parsion.veclex import ParsionVectorLexer
+
+from .languages import LANGUAGES
+from .suite import measure, peak_memory
+
+
+def run(size: int, repeat: int) -> None:
+    for name, (cls, generate_input) in LANGUAGES.items():
+        lexer = ParsionLexer(cls.LEXER_RULES)
+        vector_lexer = ParsionVectorLexer(cls.LEXER_RULES)
+        input = generate_input(size)
+        tokens = len(list(lexer.tokenize(input)))
+
+        regex = measure(lambda: list(lexer.tokenize(input)), repeat)
+        vector = measure(lambda: list(vector_lexer.tokenize(input)), repeat)
+        columns = measure(lambda: vector_lexer.tokenize_columns(input),
+                          repeat)
+        memory = peak_memory(lambda: vector_lexer.tokenize_columns(input))
+
+        def per_token(stats: Dict[str, float]) -> float:
+            return stats['median'] / tokens * 1e9
+
+        print(f'{name:<6} {tokens:>8} tokens '
+              f'{per_token(regex):>7.0f} ns/token regex '
+              f'{per_token(vector):>7.0f} ns/token vector '
+              f'{per_token(columns):>7.0f} ns/token columns '
+              f'{memory["peak_bytes"] / len(input):>5.1f} B/char')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    parser.add_argument('size', type=int, nargs='?', default=100000)
+    args = parser.parse_args()
+    run(args.size, args.repeat)
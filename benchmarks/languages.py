@@ -0,0 +1,298 @@
+"""
+Languages and input generators for the benchmark suite
+
+Each generator returns deterministic input of approximately the requested
+size in characters.
+"""
+import random
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from parsion import Parsion
+
+from example import ExprLang
+
+
+def _keyword(word: str) -> str:
+    return f'({word})(?:[^a-zA-Z0-9_]|$)'
+
+
+class JsonLang(Parsion):
+    LEXER_RULES = [
+        (None,       r'(\s+)', lambda x: None),
+        ('STR',      r'("(?:[^"\\]|\\.)*")', lambda x: x[1:-1]),
+        ('NUMBER',   r'(-?[0-9]+(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?)',
+         lambda x: float(x) if any(c in x for c in '.eE') else int(x)),
+        ('TRUE',     _keyword('true'), lambda x: True),
+        ('FALSE',    _keyword('false'), lambda x: False),
+        ('NULL',     _keyword('null'), lambda x: None),
+        ('{',        r'(\{)', lambda x: None),
+        ('}',        r'(\})', lambda x: None),
+        ('[',        r'(\[)', lambda x: None),
+        (']',        r'(\])', lambda x: None),
+        (':',        r'(:)', lambda x: None),
+        (',',        r'(,)', lambda x: None),
+    ]
+
+    GRAMMAR_RULES = [
+        ('entry',           'entry',    'value'),
+
+        (None,              'value',    'object'),
+        (None,              'value',    'array'),
+        (None,              'value',    'STR'),
+        (None,              'value',    'NUMBER'),
+        (None,              'value',    'TRUE'),
+        (None,              'value',    'FALSE'),
+        (None,              'value',    'NULL'),
+
+        ('object',          'object',   '_{ members _}'),
+        ('object_empty',    'object',   '_{ _}'),
+        ('members_list',    'members',  'members _, member'),
+        ('members_first',   'members',  'member'),
+        ('member',          'member',   'STR _: value'),
+
+        (None,              'array',    '_[ elements _]'),
+        ('array_empty',     'array',    '_[ _]'),
+        ('elements_list',   'elements', 'elements _, value'),
+        ('elements_first',  'elements', 'value'),
+    ]
+
+    def object(self, members: List[Tuple[str, Any]]) -> Dict[str, Any]:
+        return dict(members)
+
+    def object_empty(self) -> Dict[str, Any]:
+        return {}
+
+    def members_list(self,
+                     members: List[Tuple[str, Any]],
+                     member: Tuple[str, Any]) -> List[Tuple[str, Any]]:
+        members.append(member)
+        return members
+
+    def members_first(self,
+                      member: Tuple[str, Any]) -> List[Tuple[str, Any]]:
+        return [member]
+
+    def member(self, key: str, value: Any) -> Tuple[str, Any]:
+        return key, value
+
+    def array_empty(self) -> List[Any]:
+        return []
+
+    def elements_list(self, elements: List[Any], value: Any) -> List[Any]:
+        elements.append(value)
+        return elements
+
+    def elements_first(self, value: Any) -> List[Any]:
+        return [value]
+
+
+class SqlLang(Parsion):
+    """
+    Subset of SQL, with SELECT statements with simple conditions
+    """
+    LEXER_RULES = [
+        (None,       r'(\s+)', lambda x: None),
+        ('SELECT',   _keyword('SELECT'), lambda x: None),
+        ('FROM',     _keyword('FROM'), lambda x: None),
+        ('WHERE',    _keyword('WHERE'), lambda x: None),
+        ('AND',      _keyword('AND'), lambda x: None),
+        ('OR',       _keyword('OR'), lambda x: None),
+        ('NAME',     r'([a-zA-Z_][a-zA-Z0-9_]*)', lambda x: x),
+        ('INT',      r'([0-9]+)', lambda x: int(x)),
+        ('STR',      r"('[^']*')", lambda x: x[1:-1]),
+        ('CMP',      r'(<=|>=|<>|=|<|>)', lambda x: x),
+        ('*',        r'(\*)', lambda x: None),
+        (',',        r'(,)', lambda x: None),
+        (';',        r'(;)', lambda x: None),
+        ('(',        r'(\()', lambda x: None),
+        (')',        r'(\))', lambda x: None),
+    ]
+
+    GRAMMAR_RULES = [
+        ('entry',           'entry',    'stmts'),
+        ('stmts_list',      'stmts',    'stmts stmt'),
+        ('stmts_first',     'stmts',    'stmt'),
+        (None,              'stmt',     'select _;'),
+
+        ('select',          'select',   '_SELECT columns _FROM NAME'),
+        ('select_where',    'select',
+         '_SELECT columns _FROM NAME _WHERE cond'),
+
+        ('columns_all',     'columns',  '_*'),
+        (None,              'columns',  'names'),
+        ('names_list',      'names',    'names _, NAME'),
+        ('names_first',     'names',    'NAME'),
+
+        ('cond_or',         'cond',     'cond _OR cond1'),
+        (None,              'cond',     'cond1'),
+        ('cond_and',        'cond1',    'cond1 _AND cond2'),
+        (None,              'cond1',    'cond2'),
+        ('cond_cmp',        'cond2',    'operand CMP operand'),
+        (None,              'cond2',    '_( cond _)'),
+        (None,              'operand',  'NAME'),
+        (None,              'operand',  'INT'),
+        (None,              'operand',  'STR'),
+    ]
+
+    def stmts_list(self, stmts: List[Any], stmt: Any) -> List[Any]:
+        stmts.append(stmt)
+        return stmts
+
+    def stmts_first(self, stmt: Any) -> List[Any]:
+        return [stmt]
+
+    def select(self, columns: Optional[List[str]], table: str) -> Any:
+        return ('select', columns, table, None)
+
+    def select_where(self, columns: Optional[List[str]], table: str,
+                     cond: Any) -> Any:
+        return ('select', columns, table, cond)
+
+    def columns_all(self) -> None:
+        return None
+
+    def names_list(self, names: List[str], name: str) -> List[str]:
+        names.append(name)
+        return names
+
+    def names_first(self, name: str) -> List[str]:
+        return [name]
+
+    def cond_or(self, lhs: Any, rhs: Any) -> Any:
+        return ('or', lhs, rhs)
+
+    def cond_and(self, lhs: Any, rhs: Any) -> Any:
+        return ('and', lhs, rhs)
+
+    def cond_cmp(self, lhs: Any, op: str, rhs: Any) -> Any:
+        return (op, lhs, rhs)
+
+
+class StmtLang(Parsion):
+    """
+    Assignment statements, where invalid statements are recovered from
+    """
+    LEXER_RULES = [
+        (None,       r'(\s+)', lambda x: None),
+        ('NAME',     r'([a-z_][a-z0-9_]*)', lambda x: x),
+        ('INT',      r'([0-9]+)', lambda x: int(x)),
+        ('+',        r'(\+)', lambda x: None),
+        ('-',        r'(-)', lambda x: None),
+        ('*',        r'(\*)', lambda x: None),
+        ('=',        r'(=)', lambda x: None),
+        ('(',        r'(\()', lambda x: None),
+        (')',        r'(\))', lambda x: None),
+        (';',        r'(;)', lambda x: None),
+    ]
+
+    GRAMMAR_RULES = [
+        ('entry',           'entry',    'stmts'),
+        ('stmts_list',      'stmts',    'stmts stmt _;'),
+        ('stmts_first',     'stmts',    'stmt _;'),
+        ('assign',          'stmt',     'NAME _= expr'),
+        ('stmt_error',      'stmt',     '$ERROR'),
+
+        ('expr_add',        'expr',     'expr _+ expr1'),
+        ('expr_sub',        'expr',     'expr _- expr1'),
+        (None,              'expr',     'expr1'),
+        ('expr_mult',       'expr1',    'expr1 _* expr2'),
+        (None,              'expr1',    'expr2'),
+        ('expr_var',        'expr2',    'NAME'),
+        (None,              'expr2',    'INT'),
+        (None,              'expr2',    '_( expr _)'),
+    ]
+
+    def stmts_list(self, stmts: List[Any], stmt: Any) -> List[Any]:
+        stmts.append(stmt)
+        return stmts
+
+    def stmts_first(self, stmt: Any) -> List[Any]:
+        return [stmt]
+
+    def assign(self, name: str, value: Any) -> Any:
+        return (name, value)
+
+    def stmt_error(self, gen: str, start: int, pos: int, end: int,
+                   expect: Any) -> None:
+        return None
+
+    def expr_add(self, lhs: Any, rhs: Any) -> Any:
+        return ('+', lhs, rhs)
+
+    def expr_sub(self, lhs: Any, rhs: Any) -> Any:
+        return ('-', lhs, rhs)
+
+    def expr_mult(self, lhs: Any, rhs: Any) -> Any:
+        return ('*', lhs, rhs)
+
+    def expr_var(self, name: str) -> Any:
+        return ('var', name)
+
+
+def _generate(size: int, sep: str, part: Callable[[random.Random], str]
+              ) -> List[str]:
+    rand = random.Random(size)
+    parts: List[str] = []
+    length = 0
+    while length < size:
+        parts.append(part(rand))
+        length += len(parts[-1]) + len(sep)
+    return parts
+
+
+def expr_input(size: int) -> str:
+    def term(rand: random.Random) -> str:
+        a, b, c = (rand.randint(0, 999) for _ in range(3))
+        return rand.choice([
+            f'{a}',
+            f'({a} * {b} - {c})',
+            f'{a} * -{b}',
+            f'{a}.5',
+        ])
+    return ' + '.join(_generate(size, ' + ', term))
+
+
+def json_input(size: int) -> str:
+    def record(rand: random.Random) -> str:
+        id = rand.randint(0, 100000)
+        tags = ', '.join(f'"t{rand.randint(0, 99)}"'
+                         for _ in range(rand.randint(0, 3)))
+        return (
+            f'{{"id": {id}, "name": "item {id}", "score": '
+            f'{rand.random() * 100:.3f}, "tags": [{tags}], '
+            f'"ok": {rand.choice(["true", "false"])}, "next": null, '
+            f'"meta": {{}}}}'
+        )
+    return '[' + ',\n'.join(_generate(size, ',\n', record)) + ']'
+
+
+def sql_input(size: int) -> str:
+    def stmt(rand: random.Random) -> str:
+        table = f't{rand.randint(0, 9)}'
+        columns = rand.choice(['*', 'a, b, c', 'id', 'name, score'])
+        if rand.random() < 0.3:
+            return f'SELECT {columns} FROM {table};'
+        return (
+            f'SELECT {columns} FROM {table} WHERE '
+            f'a = {rand.randint(0, 999)} AND (b < c OR '
+            f"name <> 'x{rand.randint(0, 99)}');"
+        )
+    return '\n'.join(_generate(size, '\n', stmt))
+
+
+def stmt_input(size: int) -> str:
+    def stmt(rand: random.Random) -> str:
+        a, b = rand.randint(0, 999), rand.randint(0, 999)
+        if rand.random() < 0.05:
+            # Invalid statement, recovered by stmt_error
+            return f'x = {a} + * {b} );'
+        return f'v{a} = {a} + v{b} * ({b} - x);'
+    return '\n'.join(_generate(size, '\n', stmt))
+
+
+LANGUAGES: Dict[str, Tuple[type, Callable[[int], str]]] = {
+    'expr': (ExprLang, expr_input),
+    'json': (JsonLang, json_input),
+    'sql': (SqlLang, sql_input),
+    'stmt': (StmtLang, stmt_input),
+}
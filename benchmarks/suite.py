@@ -0,0 +1,203 @@
+"""
+Benchmark suite for table generation, lexing, parsing and memory usage
+
+Each language of benchmarks.languages is generated and used to parse inputs
+of increasing size. Every measurement is repeated, and the minimum, median,
+mean and standard deviation are reported. Peak memory of a full parse is
+measured in a separate run, since tracing slows down parsing.
+
+Results can be saved as JSON, and compared to a previously saved baseline.
+Measurements slower, or using more memory, than the baseline by more than the
+threshold are reported as regressions, and the exit code is 1.
+
+Usage:
+
+    python -m benchmarks.suite [-l LANGUAGE ...] [-s SIZE ...] [-r REPEAT]
+        [-o OUTPUT] [-b BASELINE] [-t THRESHOLD]
+
+Sizes are given in characters, with an optional K or M suffix, for example
+1K, 100K or 100M.
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+from .languages import LANGUAGES
+
+FORMAT_VERSION = 1
+
+_SUFFIXES = {'': 1, 'K': 1000, 'M': 1000 ** 2}
+
+
+def parse_size(value: str) -> int:
+    """
+    Parse a size with an optional K or M suffix
+
+    >>> parse_size('512'), parse_size('1K'), parse_size('100m')
+    (512, 1000, 100000000)
+    """
+    value = value.strip().upper()
+    suffix = value[-1:] if value[-1:] in _SUFFIXES else ''
+    return int(value[:len(value) - len(suffix)]) * _SUFFIXES[suffix]
+
+
+def format_size(size: int) -> str:
+    """
+    Format a size using the largest exact suffix
+
+    >>> format_size(512), format_size(1000), format_size(100000000)
+    ('512', '1K', '100M')
+    """
+    for suffix, factor in reversed(_SUFFIXES.items()):
+        if size % factor == 0:
+            return f'{size // factor}{suffix}'
+    return str(size)
+
+
+def measure(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """
+    Run func repeat times, and return statistics of the durations in seconds
+
+    One untimed run is made first, so lazy imports and caches are excluded.
+    """
+    func()
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return {
+        'runs': repeat,
+        'min': min(durations),
+        'median': statistics.median(durations),
+        'mean': statistics.mean(durations),
+        'stdev': statistics.stdev(durations) if repeat > 1 else 0.0,
+    }
+
+
+def peak_memory(func: Callable[[], Any]) -> Dict[str, float]:
+    """
+    Run func once, and return the peak memory allocated in bytes
+    """
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'peak_bytes': peak}
+
+
+def run_language(name: str, sizes: List[int], repeat: int
+                 ) -> Dict[str, Dict[str, float]]:
+    cls, generate_input = LANGUAGES[name]
+    results: Dict[str, Dict[str, float]] = {}
+
+    # The compiled tables are cached per class, so compile directly to
+    # measure the generator
+    results[f'{name}/generate'] = measure(cls._compile, repeat)
+    lang = cls()
+
+    for size in sizes:
+        input = generate_input(size)
+        tokens = list(lang.lexer.tokenize(input))
+        prefix = f'{name}/{format_size(size)}'
+        results[f'{prefix}/lex'] = measure(
+            lambda: list(lang.lexer.tokenize(input)), repeat)
+        results[f'{prefix}/parse'] = measure(
+            lambda: lang.parser.parse(tokens, lang), repeat)
+        results[f'{prefix}/memory'] = peak_memory(lambda: lang.parse(input))
+        for stage in ['lex', 'parse']:
+            stats = results[f'{prefix}/{stage}']
+            stats['mb_per_s'] = len(input) / stats['median'] / 1e6
+    return results
+
+
+def format_result(key: str, stats: Dict[str, float]) -> str:
+    if 'peak_bytes' in stats:
+        return f'{key:<24} {stats["peak_bytes"] / 1e6:>10.2f} MB peak'
+    text = (f'{key:<24} {stats["median"] * 1e3:>10.2f} ms median '
+            f'{stats["min"] * 1e3:>10.2f} ms min '
+            f'{stats["stdev"] * 1e3:>8.2f} ms stdev')
+    if 'mb_per_s' in stats:
+        text += f' {stats["mb_per_s"]:>8.3f} MB/s'
+    return text
+
+
+def compare(results: Dict[str, Dict[str, float]],
+            baseline: Dict[str, Dict[str, float]],
+            threshold: float) -> List[str]:
+    """
+    Compare results to a baseline, and return the keys of regressions
+
+    Durations are compared by median, and memory by peak. Keys only present
+    in one of them are ignored.
+
+    >>> compare({'a/parse': {'median': 1.5}, 'a/memory': {'peak_bytes': 9}},
+    ...         {'a/parse': {'median': 1.0}, 'a/memory': {'peak_bytes': 9}},
+    ...         0.1)
+    ['a/parse']
+    """
+    regressions = []
+    for key, stats in results.items():
+        if key not in baseline:
+            continue
+        metric = 'peak_bytes' if 'peak_bytes' in stats else 'median'
+        old, new = baseline[key][metric], stats[metric]
+        if new > old * (1 + threshold):
+            regressions.append(key)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('-l', '--language', action='append',
+                        choices=list(LANGUAGES),
+                        help='language to run, default all')
+    parser.add_argument('-s', '--size', action='append', type=parse_size,
+                        help='input size, default 1K, 10K and 100K')
+    parser.add_argument('-r', '--repeat', type=int, default=5,
+                        help='number of runs of each measurement')
+    parser.add_argument('-o', '--output',
+                        help='save the results as JSON')
+    parser.add_argument('-b', '--baseline',
+                        help='compare to results saved as JSON')
+    parser.add_argument('-t', '--threshold', type=float, default=0.1,
+                        help='relative increase reported as regression')
+    args = parser.parse_args(argv)
+
+    sizes = args.size or [1000, 10000, 100000]
+    results: Dict[str, Dict[str, float]] = {}
+    for name in args.language or list(LANGUAGES):
+        for key, stats in run_language(name, sizes, args.repeat).items():
+            results[key] = stats
+            print(format_result(key, stats), flush=True)
+
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'version': FORMAT_VERSION,
+                'python': platform.python_version(),
+                'repeat': args.repeat,
+                'results': results,
+            }, f, indent=2)
+
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        for key in regressions:
+            print(f'Regression: {format_result(key, results[key])}')
+            print(f'  baseline: {format_result(key, baseline[key])}')
+        if len(regressions) > 0:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
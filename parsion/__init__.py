@@ -2,8 +2,11 @@ from .core import Parsion, ParsionStatic
 from .lex import ParsionLexer, ParsionEndToken, ParsionLexerError, ParsionToken
 from .parser import ParsionParser
 from .exceptions import ParsionException, ParsionGeneratorError, \
-    ParsionInternalError, ParsionSelfCheckError, ParsionParseError
+    ParsionInternalError, ParsionSelfCheckError, ParsionParseError, \
+    ParsionTableFormatError, ParsionRecoveryLimitError
 
+# Names loaded on first use by __getattr__ are left out, so a star import does
+# not load them
 __all__ = [
     'Parsion',
     'ParsionStatic',
@@ -17,5 +20,25 @@ __all__ = [
     'ParsionException',
     'ParsionGeneratorError',
     'ParsionInternalError',
-    'ParsionSelfCheckError'
+    'ParsionSelfCheckError',
+    'ParsionTableFormatError',
+    'ParsionRecoveryLimitError'
 ]
+
+
+def __getattr__(name: str) -> object:
+    # Parts not needed to parse with handlers are loaded on first use, to keep
+    # import fast
+    if name == 'ParsionCompressedTable':
+        from .table import ParsionCompressedTable
+        return ParsionCompressedTable
+    if name == 'ParsionTree':
+        from .tree import ParsionTree
+        return ParsionTree
+    if name == 'ParsionInstrumentation':
+        from .instrument import ParsionInstrumentation
+        return ParsionInstrumentation
+    if name == 'ParsionVectorLexer':
+        from .veclex import ParsionVectorLexer
+        return ParsionVectorLexer
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
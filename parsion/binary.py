@@ -0,0 +1,234 @@
+"""
+Binary format for parse tables
+
+The grammar, compressed parse table and error handlers are stored as arrays of
+32 bit little endian integers, and a table of UTF-8 encoded strings. All
+strings are referred to by index in the string table, -1 for None.
+
+Layout:
+
+    magic           b'PRSN'
+    version         int32
+    string data     int32 length, bytes, padded to a multiple of 4 bytes
+    arrays          each as int32 count, followed by count int32 values
+
+The arrays are, in order:
+
+    string_offsets  start of each string in the string data, and the end
+    symbols         string of each symbol of the compressed table
+    rule_gen        string of the generated symbol of each rule
+    rule_goal       string of the handler of each rule, or -1
+    rule_accepts    start of each rule in accepts, and the end
+    accepts         1 if the part of the rule is passed to the handler
+    state_rows      row of each state in the compressed table
+    base            displacement of each row
+    default         default action of each row
+    check           row owning each slot
+    action          action of each slot, 0 for an error
+    handler_state   state of each error handler
+    handler_sym     symbol triggering each error handler
+    handler_gen     symbol generated by each error handler
+    handler_name    handler function of each error handler
+
+When loaded, the table arrays are used directly from a memory mapped file, so
+processes loading the same file share its memory.
+"""
+import mmap
+import struct
+import sys
+from array import array
+from typing import BinaryIO, Dict, List, Optional, Sequence, Tuple
+
+from .exceptions import ParsionTableFormatError
+from .table import ParsionCompressedTable
+
+MAGIC = b'PRSN'
+FORMAT_VERSION = 1
+
+_ARRAY_NAMES = [
+    'string_offsets',
+    'symbols',
+    'rule_gen',
+    'rule_goal',
+    'rule_accepts',
+    'accepts',
+    'state_rows',
+    'base',
+    'default',
+    'check',
+    'action',
+    'handler_state',
+    'handler_sym',
+    'handler_gen',
+    'handler_name',
+]
+
+_header = struct.Struct('<4si')
+_count = struct.Struct('<i')
+
+
+def _int_array(values: Sequence[int]) -> 'array[int]':
+    result = array('i', values)
+    if sys.byteorder != 'little':  # pragma: no cover
+        result.byteswap()
+    return result
+
+
+def dump_tables(file: BinaryIO,
+                parse_grammar: List[Tuple[str, Optional[str], List[bool]]],
+                parse_table: List[Dict[str, Tuple[str, int]]],
+                error_handlers: Dict[int, Dict[str, Tuple[str, str]]],
+                nonassoc_errors: Optional[Dict[int, List[str]]] = None
+                ) -> None:
+    """
+    Write the tables generated by ParsionFSM to a binary file
+
+    The table is compressed, see ParsionCompressedTable. Nonassoc errors are
+    stored in it as entries without action.
+    """
+    strings: Dict[str, int] = {}
+
+    def string_id(value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        return strings.setdefault(value, len(strings))
+
+    table = ParsionCompressedTable(parse_table, nonassoc_errors)
+    arrays: Dict[str, List[int]] = {name: [] for name in _ARRAY_NAMES}
+
+    arrays['symbols'] = [string_id(sym) for sym in table.symbols]
+    for gen, goal, accepts in parse_grammar:
+        arrays['rule_gen'].append(string_id(gen))
+        arrays['rule_goal'].append(string_id(goal))
+        arrays['rule_accepts'].append(len(arrays['accepts']))
+        arrays['accepts'] += [int(accept) for accept in accepts]
+    arrays['rule_accepts'].append(len(arrays['accepts']))
+
+    for name in ['state_rows', 'base', 'default', 'check', 'action']:
+        arrays[name] = list(getattr(table, name))
+
+    for state, handlers in sorted(error_handlers.items()):
+        for sym, (gen, handler) in sorted(handlers.items()):
+            arrays['handler_state'].append(state)
+            arrays['handler_sym'].append(string_id(sym))
+            arrays['handler_gen'].append(string_id(gen))
+            arrays['handler_name'].append(string_id(handler))
+
+    data = b''
+    for value in strings:
+        arrays['string_offsets'].append(len(data))
+        data += value.encode('utf-8')
+    arrays['string_offsets'].append(len(data))
+
+    file.write(_header.pack(MAGIC, FORMAT_VERSION))
+    file.write(_count.pack(len(data)))
+    file.write(data + b'\0' * (-len(data) % 4))
+    for name in _ARRAY_NAMES:
+        file.write(_count.pack(len(arrays[name])))
+        file.write(_int_array(arrays[name]).tobytes())
+
+
+def load_tables(path: str) -> Tuple[
+    List[Tuple[str, Optional[str], List[bool]]],
+    ParsionCompressedTable,
+    Dict[int, Dict[str, Tuple[str, str]]]
+]:
+    """
+    Load tables written by dump_tables, by memory mapping the file
+
+    The parse table arrays refer to the mapped memory, and are not copied.
+    The grammar and error handlers are small, and are loaded as Python
+    objects.
+    """
+    try:
+        with open(path, 'rb') as f:
+            buffer = memoryview(
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+    except ValueError:
+        # Empty files can't be mapped
+        raise ParsionTableFormatError(f'{path}: empty parse table file')
+
+    try:
+        magic, version = _header.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ParsionTableFormatError(f'{path}: not a parse table file')
+        if version != FORMAT_VERSION:
+            raise ParsionTableFormatError(
+                f'{path}: unsupported format version {version}')
+
+        pos = _header.size
+        (length,) = _count.unpack_from(buffer, pos)
+        pos += _count.size
+        data = bytes(buffer[pos:pos + length])
+        pos += length + (-length % 4)
+
+        arrays: Dict[str, Sequence[int]] = {}
+        for name in _ARRAY_NAMES:
+            (count,) = _count.unpack_from(buffer, pos)
+            pos += _count.size
+            values = buffer[pos:pos + 4 * count]
+            if len(values) != 4 * count:
+                raise struct.error('array out of range')
+            arrays[name] = _load_array(values)
+            pos += 4 * count
+    except struct.error:
+        raise ParsionTableFormatError(f'{path}: truncated parse table file')
+
+    offsets = arrays['string_offsets']
+    strings = [
+        data[start:end].decode('utf-8')
+        for start, end in zip(offsets[:-1], offsets[1:])
+    ]
+
+    def string(string_id: int) -> str:
+        if not 0 <= string_id < len(strings):
+            raise ParsionTableFormatError(
+                f'{path}: invalid string id {string_id}')
+        return strings[string_id]
+
+    def optional_string(string_id: int) -> Optional[str]:
+        return None if string_id == -1 else string(string_id)
+
+    rule_accepts = arrays['rule_accepts']
+    accepts = arrays['accepts']
+    parse_grammar = [
+        (
+            string(gen),
+            optional_string(goal),
+            [bool(accept) for accept in accepts[start:end]]
+        )
+        for gen, goal, start, end in zip(
+            arrays['rule_gen'],
+            arrays['rule_goal'],
+            rule_accepts[:-1],
+            rule_accepts[1:]
+        )
+    ]
+
+    error_handlers: Dict[int, Dict[str, Tuple[str, str]]] = {}
+    for state, sym, gen, handler in zip(
+        arrays['handler_state'],
+        arrays['handler_sym'],
+        arrays['handler_gen'],
+        arrays['handler_name']
+    ):
+        error_handlers.setdefault(state, {})[string(sym)] = \
+            (string(gen), string(handler))
+
+    parse_table = ParsionCompressedTable.from_arrays(
+        [string(sym) for sym in arrays['symbols']],
+        arrays['state_rows'],
+        arrays['base'],
+        arrays['default'],
+        arrays['check'],
+        arrays['action']
+    )
+    return parse_grammar, parse_table, error_handlers
+
+
+def _load_array(values: memoryview) -> Sequence[int]:
+    if sys.byteorder != 'little':  # pragma: no cover
+        result = array('i', values.tobytes())
+        result.byteswap()
+        return result
+    return values.cast('i')
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import sys
+import threading
+from collections import OrderedDict
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Optional, Tuple
+
+
+class ParsionParseCache:
+    """
+    Least recently used cache of parse results, keyed by input
+
+    The cache is bounded by number of entries, and optionally by the total
+    size in bytes of the cached inputs and results. Inputs are measured by
+    sys.getsizeof, and results by the sizeof function, by default an estimate
+    including the containers referenced by the result. Sizes are only
+    measured if max_bytes is given. Results are not copied, so all hits for
+    the same input return the same object. Parse errors are not cached.
+
+    >>> cache = ParsionParseCache(max_entries=2)
+    >>> cache.get('1+2', lambda input: eval(input))
+    3
+    >>> cache.get('1+2', lambda input: 0)
+    3
+    >>> cache.get('2+2', len), cache.get('3+2', len), cache.get('1+2', len)
+    (3, 3, 3)
+    >>> cache.hits, cache.misses, len(cache)
+    (1, 4, 2)
+    """
+    max_entries: int
+    max_bytes: Optional[int]
+    sizeof: Callable[[Any], int]
+
+    hits: int
+    misses: int
+    bytes: int
+
+    # Result and size of each cached input
+    _entries: OrderedDict[str, Tuple[Any, int]]
+    _lock: threading.Lock
+
+    def __init__(self,
+                 max_entries: int,
+                 max_bytes: Optional[int] = None,
+                 sizeof: Optional[Callable[[Any], int]] = None):
+        if sizeof is None:
+            from .table import _deep_sizeof
+            sizeof = _deep_sizeof
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, input: str, parse: Callable[[str], Any]) -> Any:
+        """
+        Get the cached result for input, or parse and cache it
+        """
+        with self._lock:
+            if input in self._entries:
+                self._entries.move_to_end(input)
+                self.hits += 1
+                return self._entries[input][0]
+            self.misses += 1
+
+        # Parse without holding the lock, other threads may parse meanwhile
+        result = parse(input)
+
+        size = 0
+        if self.max_bytes is not None:
+            size = sys.getsizeof(input) + self.sizeof(result)
+            if size > self.max_bytes:
+                return result
+
+        with self._lock:
+            if input not in self._entries:
+                self._entries[input] = (result, size)
+                self.bytes += size
+                while len(self._entries) > self.max_entries or (
+                    self.max_bytes is not None and self.bytes > self.max_bytes
+                ):
+                    _, (_, old_size) = self._entries.popitem(last=False)
+                    self.bytes -= old_size
+        return result
+
+    def invalidate(self, input: Optional[str] = None) -> None:
+        """
+        Remove the result of one input from the cache, or all results if no
+        input is given
+
+        The hit and miss counters are not reset.
+        """
+        with self._lock:
+            if input is None:
+                self._entries.clear()
+                self.bytes = 0
+            elif input in self._entries:
+                _, size = self._entries.pop(input)
+                self.bytes -= size
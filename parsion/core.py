@@ -1,28 +1,262 @@
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from __future__ import annotations
 
-from .exceptions import ParsionParseError
-from .lex import ParsionLexer
-from .parser import ParsionParser
-from .parsegen import ParsionFSM
+import threading
+from abc import ABC, abstractmethod
 
+from .exceptions import ParsionParseError, ParsionSelfCheckError
+from .lex import ParsionEndToken, ParsionLexer, ParsionLexerError
+from .parser import ParsionParser, ParsionStackItem
 
-class ParsionBase:
+# Importing typing is slow compared to the rest of the package, and it is
+# only needed for annotations. The generator, the compressed table and the self
+# check are imported when first used, so a ParsionStatic language only loads
+# the lexer and parser.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import AbstractSet, Any, Callable, ClassVar, Dict, \
+        FrozenSet, Iterable, List, Mapping, Optional, Sequence, Tuple
+    from .lex import ParsionToken
+    from .cache import ParsionParseCache
+    from .parsegen import ParsionFSM
+    from .tree import ParsionTree
+
+# Serializes compilation of language classes, so each class is only compiled
+# once, even if first instantiated by several threads at the same time
+_compile_lock = threading.RLock()
+
+
+class ParsionBase(ABC):
     LEXER_RULES: List[Tuple[Optional[str], str,
                             Callable[[str], Optional[Any]]]] = []
     SELF_CHECK: bool = True
+    COMPRESS_TABLE: bool = False
+    PURE_HANDLERS: bool = False
+    PARSE_CACHE_SIZE: int = 0
+    PARSE_CACHE_BYTES: Optional[int] = None
+    MAX_ERRORS: Optional[int] = None
+    MAX_SKIPPED_TOKENS: Optional[int] = None
+    MAX_STATE_RECOVERIES: Optional[int] = None
+    TRACK_POSITIONS: bool = True
+    ENTRY_POINTS: List[str] = []
+    VECTOR_LEXER: bool = False
 
     lexer: ParsionLexer
     parser: ParsionParser
+    parse_cache: Optional[ParsionParseCache]
+
+    # Input, start symbol, offset, lexer position and parser stack of the
+    # last call to expected_at
+    _expected_prefix: Optional[Tuple[str, str, int, int,
+                                     List[ParsionStackItem]]]
+
+    # Per class state, only valid when defined in the class itself, not
+    # inherited from a base class
+    _compiled: ClassVar[Tuple[ParsionLexer, ParsionParser]]
+    _self_checked: ClassVar[bool]
 
     def __init__(self, lexer: ParsionLexer, parser: ParsionParser):
         self.lexer = lexer
         self.parser = parser
-        if self.SELF_CHECK:
+        if self.SELF_CHECK and \
+                not type(self).__dict__.get('_self_checked', False):
             self._self_check()
+            type(self)._self_checked = True
+
+        self._expected_prefix = None
+        self.parse_cache = None
+        if self.PARSE_CACHE_SIZE > 0:
+            if not self.PURE_HANDLERS:
+                raise ParsionSelfCheckError(
+                    'PARSE_CACHE_SIZE requires PURE_HANDLERS')
+            from .cache import ParsionParseCache
+            self.parse_cache = ParsionParseCache(
+                self.PARSE_CACHE_SIZE,
+                self.PARSE_CACHE_BYTES,
+                self.parse_result_size
+            )
+
+    @classmethod
+    def _get_compiled(cls) -> Tuple[ParsionLexer, ParsionParser]:
+        """
+        Get the lexer and parser of the class, compiled on first use
+
+        The lexer and parser only depend on the class, and are shared by all
+        instances of it. Changes to the rules of the class after the first
+        instance is created have no effect.
+        """
+        compiled: Optional[Tuple[ParsionLexer, ParsionParser]] = \
+            cls.__dict__.get('_compiled')
+        if compiled is None:
+            with _compile_lock:
+                compiled = cls.__dict__.get('_compiled')
+                if compiled is None:
+                    compiled = cls._compile()
+                    cls._compiled = compiled
+        return compiled
 
-    def parse(self, input: str) -> Any:
+    @classmethod
+    @abstractmethod
+    def _compile(cls) -> Tuple[ParsionLexer, ParsionParser]:
+        """
+        Create the lexer and parser of the class, implemented by Parsion and
+        ParsionStatic
+        """
+
+    @classmethod
+    def _create_lexer(cls) -> ParsionLexer:
+        if cls.VECTOR_LEXER:
+            try:
+                from .veclex import ParsionVectorLexer
+            except ImportError:
+                # NumPy is not installed, the regular expression lexer gives
+                # the same tokens
+                pass
+            else:
+                return ParsionVectorLexer(cls.LEXER_RULES)
+        return ParsionLexer(cls.LEXER_RULES)
+
+    @classmethod
+    def _create_parser(cls,
+                       parse_grammar: List[Tuple[str, Optional[str],
+                                                 List[bool]]],
+                       parse_table: Sequence[Mapping[str, Tuple[str, int]]],
+                       error_handlers: Dict[int, Dict[str, Tuple[str, str]]]
+                       ) -> ParsionParser:
+        return ParsionParser(
+            parse_grammar,
+            parse_table,
+            error_handlers,
+            max_errors=cls.MAX_ERRORS,
+            max_skipped_tokens=cls.MAX_SKIPPED_TOKENS,
+            max_state_recoveries=cls.MAX_STATE_RECOVERIES,
+            track_positions=cls.TRACK_POSITIONS,
+            entry_points=cls.ENTRY_POINTS
+        )
+
+    def parse(self, input: str, start: str = 'entry') -> Any:
+        """
+        Parse input, starting from entry or a symbol in ENTRY_POINTS
+
+        Only results starting from entry are cached.
+        """
+        if self.parse_cache is not None and start == 'entry':
+            return self.parse_cache.get(input, self._parse_uncached)
+        return self._parse_uncached(input, start)
+
+    def parse_result_size(self, result: Any) -> int:
+        """
+        Estimate the memory used by a parse result, in bytes, counted by
+        PARSE_CACHE_BYTES
+
+        Lists, tuples, sets and dicts in the result are included. Override if
+        results hold memory in other objects.
+        """
+        from .table import _deep_sizeof
+        return _deep_sizeof(result)
+
+    def _parse_uncached(self, input: str, start: str = 'entry') -> Any:
         tokens = self.lexer.tokenize(input)
-        return self.parser.parse(tokens, self)
+        return self.parser.parse(tokens, self, start)
+
+    def parse_tree(self, input: str, start: str = 'entry') -> ParsionTree:
+        """
+        Parse input into a syntax tree, without calling any handlers
+
+        See ParsionTree for how the tree is built from the grammar
+        """
+        return self.parser.parse_tree(self.lexer.tokenize(input), start)
+
+    def expected_at(self, input: str, offset: int,
+                    start: str = 'entry') -> FrozenSet[str]:
+        """
+        Get the names of the tokens that may follow the input before offset
+
+        The parser is run over the tokens ending at or before offset, without
+        calling handlers, so a token that the offset is inside of is not
+        included. Errors before offset are recovered from where the grammar
+        has an $ERROR rule, even if its handler would raise when parsing.
+        Other errors are raised. $END is expected where the input may end.
+
+        The parser state is kept from the last call. If called again with the
+        same input, and an offset not before the last one, parsing continues
+        from there, so queries in increasing order only parse each token once.
+        """
+        parser = self.parser
+        prefix = self._expected_prefix
+        if prefix is not None and prefix[0] == input and \
+                prefix[1] == start and prefix[2] <= offset:
+            pos = prefix[3]
+            stack = list(prefix[4])
+        else:
+            pos = 0
+            stack = [
+                ParsionStackItem('START', parser._get_start_state(start), 0, 0)
+            ]
+
+        tokens: List[ParsionToken] = []
+        while pos < offset:
+            token = self.lexer.next_token(input, pos)
+            if token is None:
+                # Only input before offset has to be valid
+                if self.lexer.skip(input, pos) < offset:
+                    raise ParsionLexerError('Invalid input', input, pos)
+                break
+            if type(token) is ParsionEndToken or token.end > offset:
+                break
+            tokens.append(token)
+            pos = token.end
+        parser._advance(tokens, stack)
+
+        self._expected_prefix = (input, start, offset, pos, stack)
+        return parser._get_expected_terminals(
+            stack,
+            self.lexer.get_token_set()
+        )
+
+    def parse_concurrent(self,
+                         inputs: Iterable[str],
+                         max_workers: Optional[int] = None,
+                         handler_factory: Optional[Callable[[], Any]] = None,
+                         start: str = 'entry'
+                         ) -> List[Any]:
+        """
+        Parse several inputs in a pool of threads
+
+        The lexer and parser keep no state between calls, so they are shared
+        by all threads. Handlers are called on this object, unless
+        handler_factory is given, in which case it is called once in each
+        thread, to create the object the handlers of that thread are called
+        on.
+
+        Without handler_factory, inputs are parsed with parse, so cached
+        results are used. Results are returned in the order of the inputs.
+        If parsing any input fails, the first error in input order is raised.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        local = threading.local()
+
+        def parse_one(input: str) -> Any:
+            if handler_factory is None:
+                return self.parse(input, start)
+            handlers = getattr(local, 'handlers', None)
+            if handlers is None:
+                handlers = local.handlers = handler_factory()
+            return self.parser.parse(self.lexer.tokenize(input), handlers,
+                                     start)
+
+        with ThreadPoolExecutor(max_workers) as executor:
+            return list(executor.map(parse_one, inputs))
+
+    @classmethod
+    def _load_table(cls,
+                    parse_table: List[Dict[str, Tuple[str, int]]],
+                    nonassoc_errors: Dict[int, List[str]]
+                    ) -> Sequence[Mapping[str, Tuple[str, int]]]:
+        if cls.COMPRESS_TABLE:
+            from .table import ParsionCompressedTable
+            return ParsionCompressedTable(parse_table, nonassoc_errors)
+        return parse_table
 
     def _self_check(self) -> None:
         from .self_check import run_self_check
@@ -36,7 +270,7 @@ class ParsionBase:
                       start: int,
                       pos: int,
                       end: int,
-                      expect: Set[str]) -> Any:
+                      expect: AbstractSet[str]) -> Any:
         raise ParsionParseError(
             'Error parsing',
             start, pos, end, expect
@@ -45,24 +279,91 @@ class ParsionBase:
 
 class Parsion(ParsionBase):
     GRAMMAR_RULES: List[Tuple[Optional[str], str, str]] = []
+    GENERATOR_PROCESSES: Optional[int] = None
+    PRECEDENCE: List[Tuple[str, str]] = []
+    KEEP_GENERATOR: bool = False
 
     parse_grammar: List[Tuple[str, Optional[str], List[bool]]]
-    parse_table: List[Dict[str, Tuple[str, int]]]
+    parse_table: Sequence[Mapping[str, Tuple[str, int]]]
     error_handlers: Dict[int, Dict[str, Tuple[str, str]]]
 
+    # Generator of the class, kept if KEEP_GENERATOR is set, so subclasses can
+    # extend it
+    _generator: ClassVar[ParsionFSM]
+
     def __init__(self) -> None:
-        (
-            self.parse_grammar,
-            self.parse_table,
-            self.error_handlers
-        ) = ParsionFSM(self.GRAMMAR_RULES).export()
-
-        super().__init__(
-            ParsionLexer(self.LEXER_RULES),
-            ParsionParser(
-                self.parse_grammar,
-                self.parse_table,
-                self.error_handlers
+        lexer, parser = self._get_compiled()
+        self.parse_grammar = parser.parse_grammar
+        self.parse_table = parser.parse_table
+        self.error_handlers = parser.error_handlers
+        super().__init__(lexer, parser)
+
+    @classmethod
+    def _create_fsm(cls) -> ParsionFSM:
+        from .parsegen import ParsionFSM
+
+        # Generators extending a base share its item pool, so only build one
+        # at a time
+        with _compile_lock:
+            return ParsionFSM(
+                cls.GRAMMAR_RULES,
+                cls.GENERATOR_PROCESSES,
+                cls.PRECEDENCE,
+                base=cls._get_base_generator(),
+                entry_points=cls.ENTRY_POINTS
+            )
+
+    @classmethod
+    def _get_base_generator(cls) -> Optional[ParsionFSM]:
+        """
+        Get the generator of the nearest base class defining a grammar, if it
+        keeps its generator
+
+        The base class is compiled first if needed. The generator only uses it
+        if the rules of the class start with the rules of the base class.
+        """
+        for base in cls.__mro__[1:]:
+            if issubclass(base, Parsion) and base is not Parsion:
+                if not base.KEEP_GENERATOR:
+                    return None
+                base._get_compiled()
+                generator: Optional[ParsionFSM] = \
+                    base.__dict__.get('_generator')
+                return generator
+        return None
+
+    @classmethod
+    def _get_generator(cls) -> ParsionFSM:
+        """
+        Get a generator of the class, and compile the class from it if not
+        compiled yet
+
+        A new generator is created, unless the class keeps its generator.
+        """
+        with _compile_lock:
+            fsm: Optional[ParsionFSM] = cls.__dict__.get('_generator')
+            if fsm is None:
+                fsm = cls._create_fsm()
+                if '_compiled' not in cls.__dict__:
+                    cls._compiled = cls._compile_fsm(fsm)
+            return fsm
+
+    @classmethod
+    def _compile(cls) -> Tuple[ParsionLexer, ParsionParser]:
+        return cls._compile_fsm(cls._create_fsm())
+
+    @classmethod
+    def _compile_fsm(cls, fsm: ParsionFSM
+                     ) -> Tuple[ParsionLexer, ParsionParser]:
+        if cls.KEEP_GENERATOR:
+            cls._generator = fsm
+        parse_grammar, parse_table, error_handlers = fsm.export()
+        return (
+            cls._create_lexer(),
+            cls._create_parser(
+                parse_grammar,
+                cls._load_table(parse_table, fsm.nonassoc_errors),
+                error_handlers
             )
         )
 
@@ -71,13 +372,35 @@ class ParsionStatic(ParsionBase):
     STATIC_GRAMMAR: List[Tuple[str, Optional[str], List[bool]]] = []
     STATIC_TABLE: List[Dict[str, Tuple[str, int]]] = []
     STATIC_ERROR_HANDLERS: Dict[int, Dict[str, Tuple[str, str]]] = {}
+    STATIC_NONASSOC_ERRORS: Dict[int, List[str]] = {}
+    STATIC_SELF_CHECKED: bool = False
+    STATIC_TABLE_FILE: Optional[str] = None
 
     def __init__(self) -> None:
-        super().__init__(
-            ParsionLexer(self.LEXER_RULES),
-            ParsionParser(
-                self.STATIC_GRAMMAR,
-                self.STATIC_TABLE,
-                self.STATIC_ERROR_HANDLERS
+        # The self check was done when the tables were exported. Only trust
+        # it for the exported class itself, a subclass may change handlers
+        cls = type(self)
+        if cls.__dict__.get('STATIC_SELF_CHECKED', False):
+            cls._self_checked = True
+
+        # Call ParsionBase directly, so a static class can inherit handlers
+        # and lexer rules from the Parsion class it was exported from
+        ParsionBase.__init__(self, *self._get_compiled())
+
+    @classmethod
+    def _compile(cls) -> Tuple[ParsionLexer, ParsionParser]:
+        if cls.STATIC_TABLE_FILE is not None:
+            from .binary import load_tables
+            return (
+                cls._create_lexer(),
+                cls._create_parser(*load_tables(cls.STATIC_TABLE_FILE))
+            )
+        return (
+            cls._create_lexer(),
+            cls._create_parser(
+                cls.STATIC_GRAMMAR,
+                cls._load_table(cls.STATIC_TABLE,
+                                cls.STATIC_NONASSOC_ERRORS),
+                cls.STATIC_ERROR_HANDLERS
             )
         )
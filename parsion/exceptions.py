@@ -1,4 +1,8 @@
-from typing import Set
+from __future__ import annotations
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import AbstractSet, List
 
 
 class ParsionException(Exception):
@@ -17,15 +21,37 @@ class ParsionSelfCheckError(ParsionException):
     pass
 
 
+class ParsionTableFormatError(ParsionException):
+    pass
+
+
 class ParsionParseError(Exception):
     def __init__(self,
                  msg: str,
                  start: int,
                  pos: int,
                  end: int,
-                 expect: Set[str]):
+                 expect: AbstractSet[str]):
         super().__init__(self, msg, start, pos, end)
         self.start = start
         self.pos = pos
         self.end = end
         self.expect = expect
+
+
+class ParsionRecoveryLimitError(ParsionParseError):
+    """
+    Raised when error recovery is stopped by one of the recovery limits
+
+    The position is of the error that was not recovered from. All errors of
+    the parse, including that one, are listed in errors, in input order.
+    """
+    def __init__(self,
+                 msg: str,
+                 start: int,
+                 pos: int,
+                 end: int,
+                 expect: AbstractSet[str],
+                 errors: List[ParsionParseError]):
+        super().__init__(msg, start, pos, end, expect)
+        self.errors = errors
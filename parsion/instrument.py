@@ -0,0 +1,170 @@
+import time
+from typing import AbstractSet, Any, Callable, Dict, Iterable, Iterator, \
+    List, Mapping, Optional, Sequence, Tuple, TYPE_CHECKING
+
+from .lex import ParsionToken
+
+if TYPE_CHECKING:
+    from .parser import ParsionParser
+
+
+class _CountingRow(Mapping[str, Tuple[str, int]]):
+    """
+    Row of a parse table, counting the shifts of tokens, and the gotos on
+    symbols generated by reductions, made from the state
+    """
+    __slots__ = ('row', 'state', 'shifts', 'gotos', 'nonterminals')
+
+    row: Mapping[str, Tuple[str, int]]
+    state: int
+    shifts: Dict[int, int]
+    gotos: Dict[int, int]
+    nonterminals: AbstractSet[str]
+
+    def __init__(self,
+                 row: Mapping[str, Tuple[str, int]],
+                 state: int,
+                 shifts: Dict[int, int],
+                 gotos: Dict[int, int],
+                 nonterminals: AbstractSet[str]):
+        self.row = row
+        self.state = state
+        self.shifts = shifts
+        self.gotos = gotos
+        self.nonterminals = nonterminals
+
+    def __contains__(self, sym: object) -> bool:
+        return sym in self.row
+
+    def __getitem__(self, sym: str) -> Tuple[str, int]:
+        action = self.row[sym]
+        if action[0] == 's':
+            counts = self.gotos if sym in self.nonterminals else self.shifts
+            counts[self.state] = counts.get(self.state, 0) + 1
+        return action
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.row)
+
+    def __len__(self) -> int:
+        return len(self.row)
+
+
+class ParsionInstrumentation:
+    """
+    Statistics of the parses made by a ParsionParser
+
+    Enabled by ParsionParser.enable_instrumentation. Instrumented parses use
+    a wrapped parse table and wrapped handlers, so parsing without
+    instrumentation runs unchanged.
+
+    Records the number of parses, the number of shifts of tokens made from
+    each state, the number of gotos from each state on the symbols generated
+    by reductions and error recovery, the number of reductions of each rule,
+    by index in parse_grammar, the total time spent in each reduce handler, in
+    seconds, and the number of recoveries by each error handler.
+
+    The parser is shared by all instances of a language class, so
+    instrumentation records the parses of all of them, from all threads,
+    including parse_concurrent.
+
+    Counts are updated without locking, and may be slightly low when parsing
+    from several threads at the same time.
+    """
+    parses: int
+    shifts: Dict[int, int]
+    gotos: Dict[int, int]
+    reduces: Dict[int, int]
+    handler_time: Dict[str, float]
+    recoveries: Dict[str, int]
+    parse_table: List[_CountingRow]
+
+    def __init__(self,
+                 parse_table: Sequence[Mapping[str, Tuple[str, int]]],
+                 nonterminals: AbstractSet[str]):
+        self.parses = 0
+        self.shifts = {}
+        self.gotos = {}
+        self.reduces = {}
+        self.handler_time = {}
+        self.recoveries = {}
+        self.parse_table = [
+            _CountingRow(row, state, self.shifts, self.gotos, nonterminals)
+            for state, row in enumerate(parse_table)
+        ]
+
+    def _parse(self,
+               parser: 'ParsionParser',
+               input: Iterable[ParsionToken],
+               reduce_handler: Callable[[
+                   int,
+                   Optional[str],
+                   List[bool],
+                   List[Any],
+                   int,
+                   int
+               ], Any],
+               error_handler: Callable[[
+                   str, str, int, int, int, AbstractSet[str]], Any],
+               start_state: int = 0
+               ) -> Any:
+        reduces = self.reduces
+        handler_time = self.handler_time
+        recoveries = self.recoveries
+
+        def _timed_reduce(
+                id: int,
+                goal: Optional[str],
+                accepts: List[bool],
+                parts: List[Any],
+                start: int,
+                end: int) -> Any:
+            reduces[id] = reduces.get(id, 0) + 1
+            if goal is None:
+                return reduce_handler(id, goal, accepts, parts, start, end)
+            handler_start = time.perf_counter()
+            result = reduce_handler(id, goal, accepts, parts, start, end)
+            handler_time[goal] = handler_time.get(goal, 0.0) + \
+                time.perf_counter() - handler_start
+            return result
+
+        def _counted_error_handler(
+                handler: str,
+                gen: str,
+                error_start: int,
+                error_pos: int,
+                error_end: int,
+                expect: AbstractSet[str]) -> Any:
+            recoveries[handler] = recoveries.get(handler, 0) + 1
+            return error_handler(handler, gen, error_start, error_pos,
+                                 error_end, expect)
+
+        self.parses += 1
+        return parser._parse(
+            input,
+            _timed_reduce,
+            _counted_error_handler,
+            self.parse_table,
+            start_state
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get a copy of the statistics, as a dict that can be exported as JSON
+        """
+        return {
+            'parses': self.parses,
+            'shifts': dict(self.shifts),
+            'gotos': dict(self.gotos),
+            'reduces': dict(self.reduces),
+            'handler_time': dict(self.handler_time),
+            'recoveries': dict(self.recoveries),
+        }
+
+    def reset(self) -> None:
+        self.parses = 0
+        self.shifts.clear()
+        self.gotos.clear()
+        self.reduces.clear()
+        self.handler_time.clear()
+        self.recoveries.clear()
@@ -1,8 +1,13 @@
 
+from __future__ import annotations
+
 import re
-from typing import Any, Callable, Generator, List, Optional, Set, Tuple
 from .exceptions import ParsionException
 
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Generator, List, Optional, Set, Tuple
+
 
 class ParsionLexerError(ParsionException):
     intput: str
@@ -57,6 +62,12 @@ class ParsionEndToken(ParsionToken):
 
 
 class ParsionLexer:
+    """
+    Split input into tokens, using a list of regular expressions
+
+    The lexer is not modified when tokenizing, so one lexer can tokenize any
+    number of inputs at the same time, from several threads.
+    """
     rules: List[Tuple[Optional[str], re.Pattern[str],
                       Callable[[str], Optional[Any]]]]
 
@@ -73,6 +84,14 @@ class ParsionLexer:
         ]
 
     def next_token(self, input: str, pos: int) -> Optional[ParsionToken]:
+        """
+        Get the token at pos, after any skipped input
+
+        Returns the end token if only skipped input is left, or None if no
+        rule matches.
+        """
+        if pos == len(input):
+            return ParsionEndToken(pos)
         for name, regexp, handler in self.rules:
             m = regexp.match(input, pos)
             if m is not None:
@@ -87,15 +106,37 @@ class ParsionLexer:
                     )
         return None
 
+    def skip(self, input: str, pos: int) -> int:
+        """
+        Get the position after any skipped input at pos
+
+        >>> lexer = ParsionLexer([
+        ...     (None, r'(\\s+)', lambda x: None),
+        ...     ('NAME', r'([a-z]+)', lambda x: x),
+        ... ])
+        >>> lexer.skip('a  b', 1)
+        3
+        >>> lexer.skip('a  b', 0)
+        0
+        """
+        for name, regexp, _ in self.rules:
+            m = regexp.match(input, pos)
+            if m is not None:
+                if name is None:
+                    return self.skip(input, m.end(1))
+                return pos
+        return pos
+
     def tokenize(self, input: str) -> Generator[ParsionToken, None, None]:
         pos = 0
-        while pos < len(input):
+        while True:
             token = self.next_token(input, pos)
             if token is None:
                 raise ParsionLexerError('Invalid input', input, pos)
             pos = token.end
             yield token
-        yield ParsionEndToken(pos)
+            if type(token) is ParsionEndToken:
+                return
 
     def get_token_set(self) -> Set[str]:
         return {
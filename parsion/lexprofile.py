@@ -0,0 +1,296 @@
+"""
+Profile the lexer rules of a Parsion language on a sample corpus
+
+The lexer tries the rules in order, until one matches. Each rule tried
+before the matching one costs a failed match. The profile counts the
+attempts and hits of each rule, and suggests an order of the rules with
+frequent rules earlier, while keeping the order of all rules that may match
+at the same position, so the same rule wins for any input.
+
+Usage:
+
+    python -m parsion.lexprofile module:ClassName FILE [FILE ...]
+"""
+import argparse
+import importlib
+import re
+import sys
+from typing import Any, Callable, FrozenSet, Iterable, List, Optional, \
+    Tuple
+
+from .lex import ParsionLexer, ParsionLexerError
+from .stats import load_language
+
+# The regular expression parser is internal to the re module, and was moved in
+# Python 3.11
+_sre_parse: Any = importlib.import_module(
+    're._parser' if sys.version_info >= (3, 11) else 'sre_parse')
+
+LexerRules = List[Tuple[Optional[str], str, Callable[[str], Optional[Any]]]]
+
+# First characters of a match, as the set of ASCII code points and if any
+# other character is possible
+FirstSet = Tuple[FrozenSet[int], bool]
+
+_ASCII = frozenset(range(128))
+_ANY: FirstSet = (_ASCII, True)
+
+_CATEGORIES = {
+    'CATEGORY_DIGIT': r'\d',
+    'CATEGORY_NOT_DIGIT': r'\D',
+    'CATEGORY_SPACE': r'\s',
+    'CATEGORY_NOT_SPACE': r'\S',
+    'CATEGORY_WORD': r'\w',
+    'CATEGORY_NOT_WORD': r'\W',
+}
+
+
+def _union(a: FirstSet, b: FirstSet) -> FirstSet:
+    return a[0] | b[0], a[1] or b[1]
+
+
+def _class_first(items: List[Tuple[Any, Any]]) -> FirstSet:
+    """
+    First characters of a character class, [...]
+    """
+    result: FirstSet = (frozenset(), False)
+    negate = False
+    for op, arg in items:
+        if op is _sre_parse.NEGATE:
+            negate = True
+        elif op is _sre_parse.LITERAL:
+            result = _union(result, (_ASCII & {arg}, arg >= 128))
+        elif op is _sre_parse.RANGE:
+            low, high = arg
+            result = _union(result, (
+                frozenset(range(low, min(high + 1, 128))),
+                high >= 128
+            ))
+        elif op is _sre_parse.CATEGORY and str(arg) in _CATEGORIES:
+            category = re.compile(_CATEGORIES[str(arg)])
+            result = _union(result, (
+                frozenset(c for c in _ASCII if category.match(chr(c))),
+                True
+            ))
+        else:  # pragma: no cover
+            # No other items are generated for patterns without IGNORECASE
+            return _ANY
+    if negate:
+        # Any non-ASCII character may be outside of the class
+        return _ASCII - result[0], True
+    return result
+
+
+def _sequence_first(items: Iterable[Tuple[Any, Any]]
+                    ) -> Tuple[FirstSet, bool]:
+    """
+    First characters of a sequence of regular expression items, and if the
+    sequence can match the empty string
+    """
+    result: FirstSet = (frozenset(), False)
+    for op, arg in items:
+        nullable = False
+        if op is _sre_parse.LITERAL:
+            first: FirstSet = (_ASCII & {arg}, arg >= 128)
+        elif op is _sre_parse.NOT_LITERAL:
+            first = (_ASCII - {arg}, True)
+        elif op is _sre_parse.ANY:
+            first = _ANY
+        elif op is _sre_parse.IN:
+            first = _class_first(arg)
+        elif op is _sre_parse.SUBPATTERN:
+            _, add_flags, _, pattern = arg
+            if add_flags & re.IGNORECASE:
+                return _ANY, True
+            first, nullable = _sequence_first(pattern)
+        elif op is _sre_parse.BRANCH:
+            first = (frozenset(), False)
+            for branch in arg[1]:
+                branch_first, branch_nullable = _sequence_first(branch)
+                first = _union(first, branch_first)
+                nullable = nullable or branch_nullable
+        elif op in (_sre_parse.MAX_REPEAT, _sre_parse.MIN_REPEAT,
+                    getattr(_sre_parse, 'POSSESSIVE_REPEAT', None)):
+            min_count, _, pattern = arg
+            first, nullable = _sequence_first(pattern)
+            nullable = nullable or min_count == 0
+        elif op in (_sre_parse.AT, _sre_parse.ASSERT,
+                    _sre_parse.ASSERT_NOT):
+            # Zero width, only limits where the rest matches
+            first, nullable = (frozenset(), False), True
+        else:
+            return _ANY, True
+        result = _union(result, first)
+        if not nullable:
+            return result, False
+    return result, True
+
+
+def first_chars(regexp: str) -> Optional[FirstSet]:
+    """
+    Get the possible first characters of a match of a regular expression
+
+    Returns the set of ASCII code points, and if any non-ASCII character is
+    possible. Returns None if the expression can match the empty string, or
+    uses constructs that are not analyzed, in which case it may overlap with
+    any other expression.
+
+    >>> first_chars(r'([0-9]+)')
+    (frozenset({48, 49, 50, 51, 52, 53, 54, 55, 56, 57}), False)
+    >>> first_chars(r'(a*)') is None
+    True
+    """
+    parsed = _sre_parse.parse(regexp)
+    if parsed.state.flags & re.IGNORECASE:
+        return None
+    first, nullable = _sequence_first(parsed.data)
+    if nullable:
+        return None
+    return first
+
+
+def rules_may_overlap(a: str, b: str) -> bool:
+    """
+    Check if two regular expressions may match at the same position
+
+    If this returns False, the order of the two rules in a lexer doesn't
+    affect which rule matches. The check is conservative, and may return True
+    for expressions that never match the same input.
+
+    >>> rules_may_overlap(r'([0-9]+)', r'([a-z]+)')
+    False
+    >>> rules_may_overlap(r'(for)(?:[^a-z]|$)', r'([a-z]+)')
+    True
+    >>> rules_may_overlap(r'([a-z]+)', r'(\\s*)')
+    True
+    """
+    first_a = first_chars(a)
+    first_b = first_chars(b)
+    if first_a is None or first_b is None:
+        return True
+    return len(first_a[0] & first_b[0]) > 0 or (first_a[1] and first_b[1])
+
+
+class ParsionLexerProfile:
+    """
+    Number of attempts and hits of each lexer rule, in the order of the rules
+    """
+    names: List[Optional[str]]
+    attempts: List[int]
+    hits: List[int]
+
+    def __init__(self, names: List[Optional[str]]):
+        self.names = names
+        self.attempts = [0] * len(names)
+        self.hits = [0] * len(names)
+
+    @property
+    def total_attempts(self) -> int:
+        return sum(self.attempts)
+
+    def format(self) -> str:
+        return '\n'.join(
+            f'{str(name):<16} {attempts:>12} attempts {hits:>12} hits'
+            for name, attempts, hits
+            in zip(self.names, self.attempts, self.hits)
+        )
+
+
+def profile_lexer(lexer: ParsionLexer, corpus: Iterable[str]
+                  ) -> ParsionLexerProfile:
+    """
+    Tokenize each input of the corpus, counting attempts and hits of each rule
+
+    Uses the same matching as ParsionLexer.tokenize, without calling the
+    token handlers, so the lexer itself is not slowed down.
+    """
+    profile = ParsionLexerProfile([name for name, _, _ in lexer.rules])
+    attempts = profile.attempts
+    hits = profile.hits
+    regexps = [regexp for _, regexp, _ in lexer.rules]
+    for input in corpus:
+        pos = 0
+        while pos < len(input):
+            for i, regexp in enumerate(regexps):
+                attempts[i] += 1
+                m = regexp.match(input, pos)
+                if m is not None:
+                    hits[i] += 1
+                    pos = m.end(1)
+                    break
+            else:
+                raise ParsionLexerError('Invalid input', input, pos)
+    return profile
+
+
+def reorder_rules(rules: LexerRules, hits: List[int]) -> LexerRules:
+    """
+    Reorder lexer rules, to try the rules with most hits first
+
+    A rule is only moved before an earlier rule if the two rules can't match
+    at the same position, according to rules_may_overlap. Therefore the
+    reordered rules match the same tokens as the original rules, for any
+    input.
+
+    >>> rules = [('A', r'(a)', str), ('NAME', r'([a-z]+)', str),
+    ...          ('INT', r'([0-9]+)', int)]
+    >>> [name for name, _, _ in reorder_rules(rules, [1, 5, 10])]
+    ['INT', 'A', 'NAME']
+    """
+    # Rules that must stay before each rule
+    before = [
+        {
+            j for j in range(i)
+            if rules_may_overlap(rules[j][1], rules[i][1])
+        }
+        for i in range(len(rules))
+    ]
+
+    order: List[int] = []
+    remaining = list(range(len(rules)))
+    while len(remaining) > 0:
+        placed = set(order)
+        ready = [i for i in remaining if before[i] <= placed]
+        best = max(ready, key=lambda i: (hits[i], -i))
+        order.append(best)
+        remaining.remove(best)
+    return [rules[i] for i in order]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m parsion.lexprofile',
+        description='Profile the lexer rules of a Parsion language, and '
+                    'suggest an order with fewer failed matches'
+    )
+    parser.add_argument('language',
+                        help='language class, as module:ClassName')
+    parser.add_argument('files', nargs='+',
+                        help='sample inputs')
+    args = parser.parse_args(argv)
+
+    try:
+        cls = load_language(args.language)
+    except (ImportError, AttributeError, ValueError) as e:
+        parser.error(str(e))
+
+    corpus = []
+    for file in args.files:
+        with open(file) as f:
+            corpus.append(f.read())
+
+    profile = profile_lexer(ParsionLexer(cls.LEXER_RULES), corpus)
+    print(profile.format())
+
+    rules = reorder_rules(cls.LEXER_RULES, profile.hits)
+    reordered = profile_lexer(ParsionLexer(rules), corpus)
+    print()
+    print(f'Suggested order, {reordered.total_attempts} attempts instead of '
+          f'{profile.total_attempts}:')
+    for name, regexp, _ in rules:
+        print(f'    ({name!r}, {regexp!r}, ...),')
+    return 0
+
+
+if __name__ == '__main__':  # pragma: no cover
+    sys.exit(main())
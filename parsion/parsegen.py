@@ -1,8 +1,14 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import re
+import time
+from typing import TYPE_CHECKING, AbstractSet, Any, Dict, FrozenSet, \
+    Iterable, List, Optional, Set, Tuple
 from .exceptions import ParsionGeneratorError
 
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
 
 def _noset(obj: Any) -> Any:
     """
@@ -23,7 +29,7 @@ def _noset(obj: Any) -> Any:
     >>> _noset([1, 4, {1, 3}, 3])
     [1, 4, [1, 3], 3]
     """
-    if isinstance(obj, set):
+    if isinstance(obj, (set, frozenset)):
         return sorted(_noset(x) for x in obj)
     elif isinstance(obj, tuple):
         return tuple(_noset(x) for x in obj)
@@ -33,34 +39,139 @@ def _noset(obj: Any) -> Any:
         return obj
 
 
+# Placeholder follow symbol, marking where the follow set of the requesting
+# item propagates into a closure of a generated symbol
+_PROPAGATE = '$PROPAGATE'
+
+# Repetition of a named symbol in a rule: X*, X+ or X?, with an optional
+# separator for X* and X+, as X*/SEP. Only names are repeated, so tokens such
+# as * or ** can still be used in rules
+_REPETITION = re.compile(r'^(\w[\w$]*)([*+?])(?:/(\S+))?$')
+
+
+def _expand_repetitions(grammar_rules: List[Tuple[Optional[str], str, str]],
+                        generated: AbstractSet[str] = frozenset()
+                        ) -> List[Tuple[Optional[str], str, str]]:
+    """
+    Replace repetitions in rules by generated symbols
+
+    Rules for symbols in generated are already defined, and not added again.
+
+    The generated symbol is named as the repetition itself, and defined by
+    left recursive rules, so the stack doesn't grow with the length of the
+    list. The lists are built by the builtin handlers $list_new,
+    $list_append and $list_empty, and an absent optional by $none.
+
+    >>> for rule in _expand_repetitions([('args', 'args', 'arg*/,')]):
+    ...     print(rule)
+    ('args', 'args', 'arg*/,')
+    ('$list_empty', 'arg*/,', '')
+    ('$list_new', 'arg+/,', 'arg')
+    ('$list_append', 'arg+/,', 'arg+/, _, arg')
+    (None, 'arg*/,', 'arg+/,')
+    """
+    result = list(grammar_rules)
+    generated = set(generated)
+
+    def generate(sym: str, op: str, sep: Optional[str]) -> str:
+        gen = sym + op + ('' if sep is None else '/' + sep)
+        if gen in generated:
+            return gen
+        generated.add(gen)
+        if op == '?':
+            result.append(('$none', gen, ''))
+            result.append((None, gen, sym))
+        elif op == '*':
+            result.append(('$list_empty', gen, ''))
+            result.append((None, gen, generate(sym, '+', sep)))
+        else:
+            result.append(('$list_new', gen, sym))
+            sep_part = '' if sep is None else f' _{sep}'
+            result.append(('$list_append', gen, f'{gen}{sep_part} {sym}'))
+        return gen
+
+    for name, gen, rulestr in grammar_rules:
+        for part in rulestr.split():
+            m = _REPETITION.match(part[1:] if part[0] == '_' else part)
+            if m is not None:
+                sym, op, sep = m.groups()
+                if op == '?' and sep is not None:
+                    raise ParsionGeneratorError(
+                        f'Separator not allowed for optional {part}')
+                generate(sym, op, sep)
+    return result
+
+
 class ParsionFSMMergeError(Exception):
     pass
 
 
 class ParsionFSMGrammarRule:
+    """
+    A rule of the grammar
+
+    Each rule is created once per grammar and identified by its id, so rules
+    compare and hash by identity.
+    """
     id: int
     name: Optional[str]
     gen: str
     parts: List[str]
     attrtokens: List[bool]
-    _hash: int
+    prec: Optional[str]
+    rest: List[Tuple[FrozenSet[str], bool]]
 
     def __init__(self, id: int, name: Optional[str], gen: str, rulestr: str):
+        """
+        Parse a rule string
+
+        The rule may end with %prec followed by a symbol, to give the rule
+        the precedence of that symbol
+
+        >>> rule = ParsionFSMGrammarRule(1, 'neg', 'expr', '_- expr %prec NEG')
+        >>> rule.parts, rule.attrtokens, rule.prec
+        (['-', 'expr'], [False, True], 'NEG')
+        """
         self.id = id
         self.name = name
         self.gen = gen
 
-        parts = rulestr.split(' ')
+        parts = rulestr.split()
+        self.prec = None
+        if len(parts) > 2 and parts[-2] == '%prec':
+            self.prec = parts[-1]
+            parts = parts[:-2]
         self.attrtokens = [part[0] != '_' for part in parts]
         self.parts = [part[1:] if part[0] == '_' else part for part in parts]
+        self.set_nullable(set())
 
-        # This class will never change value. Precalculate hash
-        self._hash = hash((
-            type(self).__name__,
-            self.gen,
-            self.name,
-            sum(hash(t) for t in self.attrtokens)
-        ))
+    def set_nullable(self, nullable: AbstractSet[str]) -> None:
+        """
+        Calculate what follows each part of the rule, given the set of
+        symbols that can be empty
+
+        For each part, rest is the following parts up to and including the
+        first that can't be empty, and if the follow set of the item follows
+        the part, which is when all following parts can be empty
+
+        >>> rule = ParsionFSMGrammarRule(1, 'name', 'gen', 'a b c d')
+        >>> rule.set_nullable({'b', 'c', 'd'})
+        >>> _noset(rule.rest[:2])
+        [(['b', 'c', 'd'], True), (['c', 'd'], True)]
+        >>> rule.set_nullable({'c'})
+        >>> _noset(rule.rest)
+        [(['b'], False), (['c', 'd'], False), (['d'], False), ([], True)]
+        """
+        self.rest = []
+        for pos in range(len(self.parts)):
+            rest: List[str] = []
+            propagate = True
+            for part in self.parts[pos + 1:]:
+                rest.append(part)
+                if part not in nullable:
+                    propagate = False
+                    break
+            self.rest.append((frozenset(rest), propagate))
 
     def get(self, idx: int, default: Optional[str] = None) -> Optional[str]:
         if idx < len(self.parts):
@@ -71,52 +182,38 @@ class ParsionFSMGrammarRule:
     def export(self) -> Tuple[str, Optional[str], List[bool]]:
         return (self.gen, self.name, self.attrtokens)
 
-    def _tupleize(self) -> Tuple[str, str, List[str], List[bool]]:
-        """
-        Get a tuple of all relevant parameters, for usage in __eq__ and __lt__
-
-        >>> ParsionFSMGrammarRule(12, 'name', 'gen', 'lhs _op rhs')._tupleize()
-        ('name', 'gen', ['lhs', 'op', 'rhs'], [True, False, True])
-        """
-        return (self.name or '', self.gen, self.parts, self.attrtokens)
-
-    def __hash__(self) -> int:
-        return self._hash
-
-    def __lt__(self, other: object) -> bool:
-        assert isinstance(other, ParsionFSMGrammarRule)
-        return self._tupleize() < other._tupleize()
-
-    def __eq__(self, other: object) -> bool:
-        assert isinstance(other, ParsionFSMGrammarRule)
-        return self._tupleize() == other._tupleize()
-
     def __str__(self) -> str:  # pragma: no cover
         name = f'{self.name}:' if self.name is not None else ''
         return f'{name:<12} {self.gen:<10} = {" ".join(self.parts)}'
 
 
 class ParsionFSMItem:
+    """
+    An item, a rule with a position and a follow set
+
+    Items are interned by ParsionFSMItemPool, so each combination of rule,
+    position and follow set exists only once per pool. Items are immutable,
+    and compare and hash by identity through their id.
+    """
+    __slots__ = ('id', 'rule', 'pos', 'follow', 'pool')
+
+    id: int
     rule: ParsionFSMGrammarRule
     pos: int
-    follow: Set[str]
-    _hash: int
+    follow: FrozenSet[str]
+    pool: 'ParsionFSMItemPool'
 
     def __init__(self,
+                 pool: 'ParsionFSMItemPool',
+                 id: int,
                  rule: ParsionFSMGrammarRule,
-                 follow: Set[str],
-                 pos: int = 0):
+                 follow: FrozenSet[str],
+                 pos: int):
+        self.pool = pool
+        self.id = id
         self.rule = rule
         self.pos = pos
-        self.follow = set(follow)
-
-        # This class will never change value. Precalculate hash
-        self._hash = hash((
-            type(self).__name__,
-            self.rule,
-            self.pos,
-            sum(hash(x) for x in self.follow)
-        ))
+        self.follow = follow
 
     def __str__(self) -> str:  # pragma: no cover
         name = f'{self.rule.name}:' if self.rule.name is not None else ''
@@ -126,59 +223,57 @@ class ParsionFSMItem:
         ]
         return f'{name:<12} {self.rule.gen:<10} = {" ".join(fmt_parts)}'
 
-    def _tupleize(self) -> Tuple[ParsionFSMGrammarRule, int, Set[str]]:
-        """
-        Get a tuple of all relevant parameters, for usage in __eq__ and __lt__
-        """
-        return (self.rule, self.pos, self.follow)
-
     def __hash__(self) -> int:
-        return self._hash
-
-    def __lt__(self, other: object) -> bool:
-        assert isinstance(other, ParsionFSMItem)
-        return self._tupleize() < other._tupleize()
-
-    def __eq__(self, other: object) -> bool:
-        assert isinstance(other, ParsionFSMItem)
-        return self._tupleize() == other._tupleize()
+        return self.id
 
-    def get_next(self) -> Tuple[str, Set[str]]:
+    def get_next(self) -> Tuple[str, AbstractSet[str]]:
         """
         Get next two symbols from an item
 
+        >>> pool = ParsionFSMItemPool()
         >>> rule = ParsionFSMGrammarRule(12, 'name', 'gen', 'lhs _op rhs')
 
-        >>> ParsionFSMItem(rule, {'fa', 'fb'}, 0).get_next()
-        ('lhs', {'op'})
+        >>> _noset(pool.item(rule, {'fa', 'fb'}, 0).get_next())
+        ('lhs', ['op'])
 
-        >>> ParsionFSMItem(rule, {'fa', 'fb'}, 1).get_next()
-        ('op', {'rhs'})
+        >>> _noset(pool.item(rule, {'fa', 'fb'}, 1).get_next())
+        ('op', ['rhs'])
 
-        >>> _noset(ParsionFSMItem(rule, {'fa', 'fb'}, 2).get_next())
+        >>> _noset(pool.item(rule, {'fa', 'fb'}, 2).get_next())
         ('rhs', ['fa', 'fb'])
 
         """
         n = self.rule.get(self.pos)
         assert n is not None  # Should be checked before calling
-        f = self.rule.get(self.pos + 1)
-        if f is None:
-            fs = self.follow
+        rest, propagate = self.rule.rest[self.pos]
+        if propagate:
+            return n, rest | self.follow
         else:
-            fs = {f}
-        return n, fs
+            return n, rest
 
     def is_complete(self) -> bool:
         return self.rule.get(self.pos) is None
 
     def take(self, sym: str) -> Optional['ParsionFSMItem']:
+        """
+        Get the item after passing sym, if sym is the next symbol
+
+        >>> pool = ParsionFSMItemPool()
+        >>> rule = ParsionFSMGrammarRule(12, 'name', 'gen', 'lhs _op rhs')
+
+        >>> pool.item(rule, {'fa'}, 1).take('op').pos
+        2
+
+        >>> pool.item(rule, {'fa'}, 1).take('rhs') is None
+        True
+        """
         if self.rule.get(self.pos) == sym:
-            return ParsionFSMItem(self.rule, self.follow, self.pos + 1)
+            return self.pool.item(self.rule, self.follow, self.pos + 1)
         else:
             return None
 
     def is_mergable(self, other: 'ParsionFSMItem') -> bool:
-        return self.rule == other.rule and self.pos == other.pos
+        return self.rule is other.rule and self.pos == other.pos
 
     def merge(self, other: 'ParsionFSMItem') -> 'ParsionFSMItem':
         """
@@ -187,14 +282,18 @@ class ParsionFSMItem:
 
         If the two items are not compatible, throw an error
 
+        >>> pool = ParsionFSMItemPool()
         >>> rule = ParsionFSMGrammarRule(12, 'name', 'gen', 'lhs _op rhs')
-        >>> a = ParsionFSMItem(rule, {'fa', 'fb'}, 0)
-        >>> b = ParsionFSMItem(rule, {'fb', 'fc'}, 0)
+        >>> a = pool.item(rule, {'fa', 'fb'}, 0)
+        >>> b = pool.item(rule, {'fb', 'fc'}, 0)
         >>> sorted(a.merge(b).follow)
         ['fa', 'fb', 'fc']
 
-        >>> a0 = ParsionFSMItem(rule, {'fa', 'fb'}, 0)
-        >>> b1 = ParsionFSMItem(rule, {'fb', 'fc'}, 1)
+        >>> a.merge(b) is pool.item(rule, {'fa', 'fb', 'fc'}, 0)
+        True
+
+        >>> a0 = pool.item(rule, {'fa', 'fb'}, 0)
+        >>> b1 = pool.item(rule, {'fb', 'fc'}, 1)
         >>> a0.merge(b1)
         Traceback (most recent call last):
         ...
@@ -203,65 +302,195 @@ class ParsionFSMItem:
         """
         if not self.is_mergable(other):
             raise ParsionFSMMergeError()
-        return ParsionFSMItem(
+        return self.pool.item(
             self.rule,
             self.follow.union(other.follow),
             self.pos
         )
 
 
+class ParsionFSMItemPool:
+    """
+    Interning pool for items and follow sets
+
+    Equal follow sets are shared between items, and each item is created
+    once, so items can be compared by identity and hashed by id. Items are
+    keyed by rule object, so generators extending the same base generator can
+    share its pool.
+
+    >>> pool = ParsionFSMItemPool()
+    >>> rule = ParsionFSMGrammarRule(12, 'name', 'gen', 'lhs _op rhs')
+    >>> a = pool.item(rule, {'fa', 'fb'}, 1)
+    >>> a is pool.item(rule, ['fb', 'fa'], 1)
+    True
+    >>> a.follow is pool.item(rule, {'fa', 'fb'}, 2).follow
+    True
+    >>> (a.id, pool.item(rule, {'fa'}, 1).id)
+    (0, 2)
+    """
+    items: Dict[Tuple[ParsionFSMGrammarRule, int, FrozenSet[str]],
+                ParsionFSMItem]
+    follows: Dict[FrozenSet[str], FrozenSet[str]]
+
+    def __init__(self) -> None:
+        self.items = {}
+        self.follows = {}
+
+    def follow(self, follow: Iterable[str]) -> FrozenSet[str]:
+        frozen = frozenset(follow)
+        return self.follows.setdefault(frozen, frozen)
+
+    def item(self,
+             rule: ParsionFSMGrammarRule,
+             follow: Iterable[str],
+             pos: int = 0) -> ParsionFSMItem:
+        frozen = self.follow(follow)
+        key = (rule, pos, frozen)
+        item = self.items.get(key)
+        if item is None:
+            item = ParsionFSMItem(self, len(self.items), rule, frozen, pos)
+            self.items[key] = item
+        return item
+
+
 class ParsionFSMState:
-    items: Set[ParsionFSMItem]
-    _hash: int
-
-    def __init__(self, items: Iterable[ParsionFSMItem]):
-        self.items = set(items)
-        self._hash = sum(hash(it) for it in self.items)
-
-    def next_syms(self) -> Set[str]:
-        return set(
-            it.get_next()[0]
-            for it
-            in self.items
-            if not it.is_complete()
-        )
+    """
+    A state of the FSM, an interned set of items
+
+    The generator creates one state per distinct set of items, and numbers
+    them in the order they are found. States compare by identity.
+    """
+    __slots__ = ('id', 'items')
+
+    id: int
+    items: FrozenSet[ParsionFSMItem]
+
+    def __init__(self, id: int, items: FrozenSet[ParsionFSMItem]):
+        self.id = id
+        self.items = items
 
     def reductions(self) -> List[ParsionFSMItem]:
         return [it for it in self.items if it.is_complete()]
 
-    def take(self, sym: str) -> List[ParsionFSMItem]:
-        result = []
+    def transitions(self) -> Dict[str, List[ParsionFSMItem]]:
+        """
+        Get the kernel of the next state for each symbol, in a single pass
+        over the items
+        """
+        result: Dict[str, List[ParsionFSMItem]] = {}
         for item in self.items:
-            next_item = item.take(sym)
-            if next_item is not None:
-                result.append(next_item)
+            sym = item.rule.get(item.pos)
+            if sym is not None:
+                result.setdefault(sym, []).append(
+                    item.pool.item(item.rule, item.follow, item.pos + 1))
         return result
 
-    def __hash__(self) -> int:
-        return self._hash
-
     def __str__(self) -> str:  # pragma: no cover
         return "\n".join(str(it) for it in self.items)
 
-    def __eq__(self, other: object) -> bool:
-        assert isinstance(other, ParsionFSMState)
-        return self.items == other.items
+
+_GenClosureItem = Tuple[str, Set[str], bool]
 
 
 class ParsionFSM:
+    grammar_rules: List[Tuple[Optional[str], str, str]]
     error_rules: Dict[str, str]
     grammar: List[ParsionFSMGrammarRule]
+    precedence: Dict[str, Tuple[int, str]]
+    base: Optional[ParsionFSM]
+    entry_points: List[str]
 
-    state_ids: Dict[ParsionFSMState, int]
+    pool: ParsionFSMItemPool
+    state_ids: Dict[FrozenSet[ParsionFSMItem], int]
     states: List[ParsionFSMState]
+    state_transitions: Dict[int, List[Tuple[str, List[ParsionFSMItem]]]]
     table: List[Dict[str, Tuple[str, int]]]
+    base_states: int
 
     sym_set: Set[str]
 
+    nullable: Set[str]
     firsts: Dict[str, Set[str]]
     error_handlers: Dict[int, Dict[str, Tuple[str, str]]]
 
-    def __init__(self, grammar_rules: List[Tuple[Optional[str], str, str]]):
+    # Symbols made errors by nonassoc precedence in each state. The table has
+    # no action for them, but a compressed table must not apply the default
+    # reduction of the state to them
+    nonassoc_errors: Dict[int, List[str]]
+
+    rules_by_gen: Dict[str, List[ParsionFSMGrammarRule]]
+    timings: Dict[str, float]
+    _gen_closure_cache: Dict[str, List[_GenClosureItem]]
+    _closure_cache: Dict[FrozenSet[ParsionFSMItem], FrozenSet[ParsionFSMItem]]
+
+    # Symbols where the grammar differs from the base, and which symbols of
+    # the base only generate unchanged symbols
+    _base_dirty: Set[str]
+    _base_valid: Dict[str, bool]
+    _base_rows: bool
+
+    def __init__(self,
+                 grammar_rules: List[Tuple[Optional[str], str, str]],
+                 processes: Optional[int] = None,
+                 precedence: Optional[List[Tuple[str, str]]] = None,
+                 base: Optional[ParsionFSM] = None,
+                 entry_points: Optional[List[str]] = None):
+        """
+        Generate the FSM for a grammar
+
+        If processes is given, the closures of each frontier of new states are
+        calculated in a pool of that many processes. The resulting tables are
+        identical to the ones generated in a single process.
+
+        Precedence is a list of levels, lowest first, each given as an
+        associativity, 'left', 'right' or 'nonassoc', and a space separated
+        list of symbols. Shift/reduce conflicts between a rule and a symbol
+        are resolved by their precedence, as described in _resolve_conflict.
+
+        If base is a generator for a grammar that grammar_rules starts with,
+        the work done for base is reused. Closures not affected by the added
+        rules are taken from base, and states with the same items as a state of
+        base get the same actions. The rules of base keep their ids, and the
+        added rules are numbered after them. The item pool of base is shared,
+        so base must not be used by another thread at the same time. If the
+        added rules make more symbols nullable, base is not used.
+
+        Entry points are symbols besides entry that parsing can start from.
+        Each gets a start rule, numbered directly after the start rule of
+        entry, and a start state, with the same number as its rule. All entry
+        points share the rest of the states.
+        """
+        self._init_grammar(grammar_rules, base, entry_points or [])
+        self._init_precedence(precedence or [])
+        self._base_rows = self.base is not None and \
+            self.precedence == self.base.precedence and \
+            self.error_rules == self.base.error_rules
+
+        if processes is None:
+            self._build_states()
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(
+                processes,
+                initializer=_init_worker,
+                initargs=(grammar_rules, self.entry_points)
+            ) as executor:
+                self._build_states(executor, processes)
+
+    def _init_grammar(self,
+                      grammar_rules: List[Tuple[Optional[str], str, str]],
+                      base: Optional[ParsionFSM] = None,
+                      entry_points: Optional[List[str]] = None
+                      ) -> None:
+        self.grammar_rules = grammar_rules
+        self.entry_points = entry_points or []
+        if base is not None and \
+                grammar_rules[:len(base.grammar_rules)] != base.grammar_rules:
+            base = None
+        if base is not None and self.entry_points != base.entry_points:
+            base = None
+        self.base = base
+
         # TODO: verify no error hanlders has None as name
         self.error_rules = {
             gen: name
@@ -277,32 +506,136 @@ class ParsionFSM:
             if rulestr != '$ERROR'
         ]
 
-        self.grammar = [
-            ParsionFSMGrammarRule(
-                0,
-                None,
-                '$ENTRY',
-                'entry _$END'
+        if base is None:
+            self.grammar = [
+                ParsionFSMGrammarRule(
+                    0,
+                    None,
+                    '$ENTRY',
+                    'entry _$END'
+                )
+            ] + [
+                ParsionFSMGrammarRule(id, None, '$ENTRY', f'{sym} _$END')
+                for id, sym in enumerate(self.entry_points, 1)
+            ]
+            no_error_rules = _expand_repetitions(no_error_rules)
+            self.pool = ParsionFSMItemPool()
+        else:
+            # Share the rules of the base, and only expand the added rules
+            base_count = sum(
+                1 for (_, _, rulestr) in base.grammar_rules
+                if rulestr != '$ERROR'
+            )
+            no_error_rules = _expand_repetitions(
+                no_error_rules[base_count:],
+                {rule.gen for rule in base.grammar
+                 if _REPETITION.match(rule.gen) is not None}
             )
-        ] + [
-            ParsionFSMGrammarRule(id + 1, name, gen, rulestr)
+            self.grammar = list(base.grammar)
+            self.pool = base.pool
+        shared_count = len(self.grammar)
+        self.grammar += [
+            ParsionFSMGrammarRule(shared_count + id, name, gen, rulestr)
             for id, (name, gen, rulestr)
             in enumerate(no_error_rules)
         ]
 
+        self.rules_by_gen = {}
+        for rule in self.grammar:
+            self.rules_by_gen.setdefault(rule.gen, []).append(rule)
+        for sym in self.entry_points:
+            if sym not in self.rules_by_gen or sym[0] == '$':
+                raise ParsionGeneratorError(f'{sym}: no rules for entry point')
+            if sym == 'entry' or self.entry_points.count(sym) > 1:
+                raise ParsionGeneratorError(
+                    f'{sym}: entry point already defined')
+        self._gen_closure_cache = {}
+        self._closure_cache = {}
+
+        self.timings = {'firsts': 0.0, 'closures': 0.0, 'states': 0.0}
+
         self._build_sym_set()
+        start = time.perf_counter()
+        self._calculate_nullable()
+        if base is not None and self.nullable != base.nullable:
+            # What follows the parts of the shared rules would change
+            self._init_grammar(grammar_rules, None, entry_points)
+            return
+        # The shared rules already use the same nullable symbols
+        for rule in self.grammar[0 if base is None else shared_count:]:
+            rule.set_nullable(self.nullable)
         self._calculate_firsts()
-        self._build_states()
+        self.timings['firsts'] = time.perf_counter() - start
+
+        if base is not None:
+            self._base_dirty = {
+                rule.gen for rule in self.grammar[shared_count:]
+            }
+            self._base_dirty.update(
+                sym for sym in self.sym_set
+                if self.firsts[sym] != base.firsts.get(sym)
+            )
+            self._base_valid = {}
+
+    def _init_precedence(self, precedence: List[Tuple[str, str]]) -> None:
+        self.precedence = {}
+        for level, (assoc, syms) in enumerate(precedence):
+            if assoc not in ('left', 'right', 'nonassoc'):
+                raise ParsionGeneratorError(
+                    f'{assoc}: unknown associativity')
+            for sym in syms.split():
+                if sym in self.precedence:
+                    raise ParsionGeneratorError(
+                        f'{sym}: precedence already defined')
+                self.precedence[sym] = (level, assoc)
+
+        for rule in self.grammar:
+            if rule.prec is not None and rule.prec not in self.precedence:
+                raise ParsionGeneratorError(
+                    f'{rule.prec}: no precedence defined for %prec')
+
+    def _rule_precedence(self,
+                         rule: ParsionFSMGrammarRule
+                         ) -> Optional[Tuple[int, str]]:
+        """
+        Get the precedence of a rule, given by %prec, or otherwise by the last
+        symbol of the rule with a precedence
+        """
+        if rule.prec is not None:
+            return self.precedence[rule.prec]
+        for part in reversed(rule.parts):
+            if part in self.precedence:
+                return self.precedence[part]
+        return None
+
+    def _resolve_conflict(self,
+                          rule: ParsionFSMGrammarRule,
+                          sym: str) -> Optional[str]:
+        """
+        Resolve a conflict between shifting sym and reducing by rule
+
+        Returns 's' to shift, 'r' to reduce, 'e' to make sym an error, or None
+        if the rule or symbol has no precedence. The one with higher precedence
+        wins. On equal precedence, left associativity reduces, right
+        associativity shifts, and nonassoc makes sym an error.
+        """
+        rule_prec = self._rule_precedence(rule)
+        sym_prec = self.precedence.get(sym)
+        if rule_prec is None or sym_prec is None:
+            return None
+        if sym_prec[0] != rule_prec[0]:
+            return 's' if sym_prec[0] > rule_prec[0] else 'r'
+        return {'left': 'r', 'right': 's', 'nonassoc': 'e'}[sym_prec[1]]
 
     def _get_rules_by_gen(self, gen: str) -> List[ParsionFSMGrammarRule]:
-        return [rule for rule in self.grammar if rule.gen == gen]
+        return self.rules_by_gen.get(gen, [])
 
-    def _add_state(self, state: ParsionFSMState) -> int:
-        state_id = self.state_ids.get(state)
+    def _add_state(self, items: FrozenSet[ParsionFSMItem]) -> int:
+        state_id = self.state_ids.get(items)
         if state_id is None:
             state_id = len(self.states)
-            self.state_ids[state] = state_id
-            self.states.append(state)
+            self.state_ids[items] = state_id
+            self.states.append(ParsionFSMState(state_id, items))
             self.table.append({})
         return state_id
 
@@ -312,113 +645,414 @@ class ParsionFSM:
             self.sym_set.add(rule.gen)
             self.sym_set.update(rule.parts)
 
+    def _calculate_nullable(self) -> None:
+        """
+        Calculate the set of symbols that can be generated from no input
+        """
+        self.nullable = set()
+        changed = True
+        while changed:
+            changed = False
+            for rule in self.grammar:
+                if rule.gen not in self.nullable and \
+                        all(part in self.nullable for part in rule.parts):
+                    self.nullable.add(rule.gen)
+                    changed = True
+
     def _calculate_firsts(self) -> None:
-        rule_firsts = {rule.gen: rule.parts[0] for rule in self.grammar}
-        self.firsts = {}
-        for sym in self.sym_set:
-            first_set = set()
-            cur_sym = sym
-            while cur_sym not in first_set:
-                first_set.add(cur_sym)
-                if cur_sym in rule_firsts:
-                    cur_sym = rule_firsts[cur_sym]
-            self.firsts[sym] = first_set
-
-    def _get_first(self, syms: Set[str]) -> Set[str]:
+        """
+        Calculate the set of symbols each symbol can start with
+
+        A symbol always starts with itself. A generated symbol also starts with
+        everything the first parts of any of its rules starts with, up to the
+        first part that can't be empty. Iterate until no set grows, to handle
+        recursive rules.
+        """
+        self.firsts = {sym: {sym} for sym in self.sym_set}
+        changed = True
+        while changed:
+            changed = False
+            for gen, rules in self.rules_by_gen.items():
+                first_set = self.firsts[gen]
+                size = len(first_set)
+                for rule in rules:
+                    for part in rule.parts:
+                        first_set.update(self.firsts[part])
+                        if part not in self.nullable:
+                            break
+                if len(first_set) != size:
+                    changed = True
+
+    def _get_first(self, syms: Iterable[str]) -> Set[str]:
         result = set()
         for sym in syms:
-            result.update(self.firsts.get(sym, set()))
+            result.update(self.firsts.get(sym, {sym}))
+        return result
+
+    def _get_gen_closure(self, gen: str) -> List[_GenClosureItem]:
+        """
+        Get all items needed to generate gen, independent of what follows gen
+
+        The follow set of each item is split in the part given by the grammar
+        itself, and a flag telling if the follow set of whatever item requested
+        gen also propagates to the item.
+        """
+        cached = self._gen_closure_cache.get(gen)
+        if cached is not None:
+            return cached
+
+        # All rules of a symbol share the same follow set in a closure.
+        # Accumulate follow sets per symbol. Pending additions are merged per
+        # symbol, so each symbol only propagates the part that is new to it
+        follows: Dict[str, Set[str]] = {}
+        pending: Dict[str, Set[str]] = {gen: {_PROPAGATE}}
+
+        while len(pending) > 0:
+            sym = next(iter(pending))
+            follow = pending.pop(sym)
+
+            if sym in follows:
+                follow -= follows[sym]
+                if len(follow) == 0:
+                    continue
+                follows[sym].update(follow)
+            else:
+                follows[sym] = set(follow)
+
+            for rule in self._get_rules_by_gen(sym):
+                # Parts after parts that can be empty may also be first
+                for pos, part in enumerate(rule.parts):
+                    if part in self.rules_by_gen:
+                        rest, propagate = rule.rest[pos]
+                        part_follow = pending.setdefault(part, set())
+                        part_follow.update(self._get_first(rest))
+                        if propagate:
+                            part_follow.update(follow)
+                    if part not in self.nullable:
+                        break
+
+        result = [
+            (sym, follow - {_PROPAGATE}, _PROPAGATE in follow)
+            for sym, follow in follows.items()
+        ]
+        self._gen_closure_cache[gen] = result
         return result
 
     def _get_closure(self,
                      items: Iterable[ParsionFSMItem]
-                     ) -> List[ParsionFSMItem]:
+                     ) -> FrozenSet[ParsionFSMItem]:
         """
         Get a closure from list of items
 
         A closure is the input items, but also populated with new items from
         grammars, which generates the next symbol of the incoming list of items
-        """
 
-        all_items: Dict[Tuple[ParsionFSMGrammarRule, int], ParsionFSMItem] = {}
-        queue: List[ParsionFSMItem] = []
+        The same kernel is often reached from several states, so the closures
+        are cached by kernel. The same closure object is returned for the same
+        kernel, so its hash is only calculated once.
+        """
+        kernel = frozenset(items)
+
+        cached = self._closure_cache.get(kernel)
+        if cached is not None:
+            return cached
+
+        start = time.perf_counter()
+        requests = self._get_closure_requests(kernel)
+        result = self._get_base_closure(kernel, requests)
+        if result is None:
+            result = self._add_closure(
+                kernel,
+                self._get_gen_follows(requests)
+            )
+        self.timings['closures'] += time.perf_counter() - start
+        return result
 
-        for item in items:
-            queue.append(item)
+    def _get_base_closure(self,
+                          kernel: FrozenSet[ParsionFSMItem],
+                          requests: List[Tuple[str, AbstractSet[str]]]
+                          ) -> Optional[FrozenSet[ParsionFSMItem]]:
+        """
+        Get the closure of a kernel calculated by the base generator, if the
+        added rules don't affect it
+        """
+        if self.base is None:
+            return None
+        closure = self.base._closure_cache.get(kernel)
+        if closure is None:
+            return None
+        for sym, follow in requests:
+            if not self._base_dirty.isdisjoint(follow) or \
+                    not self._is_base_gen_valid(sym):
+                return None
+        self._closure_cache[kernel] = closure
+        return closure
+
+    def _is_base_gen_valid(self, gen: str) -> bool:
+        """
+        Check if the closure of gen in the base generator is still valid
 
-        # Resolve all sub items
-        while len(queue) > 0:
-            it = queue.pop()
+        It is, if no rule was added to any symbol in it, and the first sets of
+        all parts of their rules are unchanged.
+        """
+        valid = self._base_valid.get(gen)
+        if valid is None:
+            assert self.base is not None
+            deps = set()
+            for sym, _, _ in self.base._get_gen_closure(gen):
+                deps.add(sym)
+                for rule in self.base._get_rules_by_gen(sym):
+                    deps.update(rule.parts)
+            valid = deps.isdisjoint(self._base_dirty)
+            self._base_valid[gen] = valid
+        return valid
+
+    def _get_closure_requests(self,
+                              kernel: Iterable[ParsionFSMItem]
+                              ) -> List[Tuple[str, AbstractSet[str]]]:
+        """
+        Get the symbols the kernel items expects next, and what follows them
+        """
+        return [it.get_next() for it in kernel if not it.is_complete()]
 
-            key = (it.rule, it.pos)
-            if key in all_items:
-                old_it = all_items[key]
-                new_it = old_it.merge(it)
-                if new_it == old_it:
-                    continue
-                all_items[key] = new_it
-            else:
-                all_items[key] = it
+    def _get_gen_follows(self,
+                         requests: Iterable[Tuple[str, AbstractSet[str]]]
+                         ) -> Dict[str, Set[str]]:
+        """
+        Get the follow set of each symbol that needs to be generated to
+        fulfill the requests
 
-            if not it.is_complete():
-                sym, follow = it.get_next()
-                follow_first = self._get_first(follow)
-                for rule in self._get_rules_by_gen(sym):
-                    queue.append(ParsionFSMItem(rule, follow_first))
+        All rules of a generated symbol share the same follow set in a closure
+        """
+        gen_follows: Dict[str, Set[str]] = {}
+        for sym, follow in requests:
+            follow_first = self._get_first(follow)
+            for gen, gen_follow, propagate in self._get_gen_closure(sym):
+                item_follow = gen_follows.setdefault(gen, set())
+                item_follow.update(gen_follow)
+                if propagate:
+                    item_follow.update(follow_first)
+        return gen_follows
+
+    def _add_closure(self,
+                     kernel: FrozenSet[ParsionFSMItem],
+                     gen_follows: Dict[str, Set[str]]
+                     ) -> FrozenSet[ParsionFSMItem]:
+        # Kernel items are past their first symbol, except for the entry item
+        # which no rule generates, so the kernel never overlaps the new items
+        result_items = set(kernel)
+        for gen, gen_follow in gen_follows.items():
+            frozen_follow = self.pool.follow(gen_follow)
+            for rule in self._get_rules_by_gen(gen):
+                result_items.add(self.pool.item(rule, frozen_follow))
+
+        result = frozenset(result_items)
+        self._closure_cache[kernel] = result
+        return result
 
-        return sorted(all_items.values())
+    def _prefetch_closures(self,
+                           executor: Executor,
+                           processes: int,
+                           kernels: Iterable[Iterable[ParsionFSMItem]]
+                           ) -> None:
+        """
+        Calculate the closures of all kernels not already cached in parallel
 
-    def _build_states(self) -> None:
+        The items are interned in this process, in the order of the kernels,
+        so the result doesn't depend on which worker finishes first.
+        """
+        start = time.perf_counter()
+        requests: Dict[FrozenSet[ParsionFSMItem],
+                       List[Tuple[str, AbstractSet[str]]]] = {}
+        for items in kernels:
+            kernel = frozenset(items)
+            if kernel not in self._closure_cache and kernel not in requests:
+                kernel_requests = self._get_closure_requests(kernel)
+                if self._get_base_closure(kernel, kernel_requests) is None:
+                    requests[kernel] = kernel_requests
+
+        results = executor.map(
+            _worker_gen_follows,
+            requests.values(),
+            chunksize=1 + len(requests) // (4 * processes)
+        )
+        for kernel, gen_follows in zip(requests, results):
+            self._add_closure(kernel, gen_follows)
+        self.timings['closures'] += time.perf_counter() - start
+
+    def _build_states(self,
+                      executor: Optional[Executor] = None,
+                      processes: int = 1) -> None:
+        start = time.perf_counter()
         self.states = []
+        self.state_transitions = {}
         self.table = []
         self.state_ids = {}
         self.error_handlers = {}
+        self.nonassoc_errors = {}
+        self.base_states = 0
 
-        self._add_state(
-            ParsionFSMState(self._get_closure([
-                ParsionFSMItem(
-                    self.grammar[0],
-                    set()
-                )
-            ]))
-        )
-
-        state_queue = [0]
-        processed = set()
-
-        while len(state_queue) > 0:
-            state_id = state_queue.pop(0)
-            if state_id in processed:
-                continue
-            state = self.states[state_id]
-            processed.add(state_id)
+        # One start state for each start rule, with the same number
+        for rule in self.grammar[:len(self.entry_points) + 1]:
+            self._add_state(
+                self._get_closure([self.pool.item(rule, set())])
+            )
 
-            # Check if state can have an error handler
-            error_handlers: Dict[str, Tuple[str, str]] = {}
-            for it in state.items:
-                if it.rule.gen in self.error_rules:
+        # Process the states breadth first, one frontier of new states at a
+        # time. States are numbered in the order they are found, and the
+        # transitions of each state are visited sorted by symbol, so the
+        # numbering is deterministic.
+        frontier = list(range(len(self.states)))
+        while len(frontier) > 0:
+            frontier_transitions = [
+                self._get_transitions(state_id)
+                for state_id in frontier
+            ]
+
+            if executor is not None:
+                self._prefetch_closures(executor, processes, (
+                    kernel
+                    for transitions in frontier_transitions
+                    for _, kernel in transitions
+                ))
+
+            next_frontier = []
+            for state_id, transitions in zip(frontier, frontier_transitions):
+                state = self.states[state_id]
+
+                # Process rules
+                for sym, kernel in transitions:
+                    state_count = len(self.states)
+                    next_id = self._add_state(self._get_closure(kernel))
+                    if next_id == state_count:
+                        next_frontier.append(next_id)
+                    self.table[state_id][sym] = ('s', next_id)
+
+                # States with the same items as a state of the base have the
+                # same actions, except for the ids of the next states
+                if self._base_rows:
+                    assert self.base is not None
+                    base_id = self.base.state_ids.get(state.items)
+                    if base_id is not None:
+                        self._copy_base_state(state_id, base_id)
+                        continue
+
+                # Check if state can have an error handler
+                error_handlers: Dict[str, Tuple[str, str]] = {}
+                for it in state.items:
+                    if it.pos == 0 and it.rule.gen in self.error_rules:
+                        for sym in it.follow:
+                            if sym in error_handlers:
+                                raise ParsionGeneratorError(
+                                    f'{it.rule.gen}: {sym} handler already '
+                                    'defined'
+                                )
+                            error_handlers[sym] = (
+                                it.rule.gen, self.error_rules[it.rule.gen])
+                if error_handlers != {}:
+                    self.error_handlers[state_id] = error_handlers
+
+                # Process reductions. Symbols made errors by nonassoc
+                # precedence can't be reduced by another rule either
+                table = self.table[state_id]
+                errors: Set[str] = set()
+                for it in state.reductions():
                     for sym in it.follow:
-                        if sym in error_handlers:
+                        if sym not in table and sym not in errors:
+                            table[sym] = ('r', it.rule.id)
+                            continue
+                        resolution = None
+                        if sym in table and table[sym][0] == 's':
+                            resolution = self._resolve_conflict(it.rule, sym)
+                        if resolution is None:
                             raise ParsionGeneratorError(
-                                f'{it.rule.gen}: {sym} handler already defined'
-                            )
-                        error_handlers[sym] = (
-                            it.rule.gen, self.error_rules[it.rule.gen])
-            if error_handlers != {}:
-                self.error_handlers[state_id] = error_handlers
-
-            # Process rules
-            for sym in state.next_syms():
-                next_id = self._add_state(ParsionFSMState(
-                    self._get_closure(state.take(sym))))
-                state_queue.append(next_id)
-                self.table[state_id][sym] = ('s', next_id)
-
-            for it in state.reductions():
-                for sym in it.follow:
-                    if sym in self.table[state_id]:
-                        raise ParsionGeneratorError("Shift/Reduce conflict")
-                    self.table[state_id][sym] = ('r', it.rule.id)
+                                "Shift/Reduce conflict")
+                        if resolution == 'r':
+                            table[sym] = ('r', it.rule.id)
+                        elif resolution == 'e':
+                            del table[sym]
+                            errors.add(sym)
+                if len(errors) > 0:
+                    self.nonassoc_errors[state_id] = sorted(errors)
+
+            frontier = next_frontier
+
+        # Time spent in closures is reported separately
+        self.timings['states'] = \
+            time.perf_counter() - start - self.timings['closures']
+
+    def _get_transitions(self, state_id: int
+                         ) -> List[Tuple[str, List[ParsionFSMItem]]]:
+        """
+        Get the kernel of the next state for each symbol, sorted by symbol
+
+        The transitions only depend on the items of the state, so they are
+        taken from the base generator if it has a state with the same items.
+        """
+        state = self.states[state_id]
+        base_id = None
+        if self.base is not None:
+            base_id = self.base.state_ids.get(state.items)
+        if self.base is not None and base_id is not None:
+            transitions = self.base.state_transitions[base_id]
+        else:
+            transitions = sorted(state.transitions().items())
+        self.state_transitions[state_id] = transitions
+        return transitions
+
+    def _copy_base_state(self, state_id: int, base_id: int) -> None:
+        """
+        Copy the error handlers and reductions of a state of the base
+
+        Shifts are already added, and are replaced by the result of conflict
+        resolution in the base.
+        """
+        assert self.base is not None
+        table = self.table[state_id]
+        base_table = self.base.table[base_id]
+        for sym in [sym for sym in table if sym not in base_table]:
+            # Made an error by nonassoc precedence
+            del table[sym]
+        for sym, action in base_table.items():
+            if action[0] == 'r':
+                table[sym] = action
+        if base_id in self.base.error_handlers:
+            self.error_handlers[state_id] = self.base.error_handlers[base_id]
+        if base_id in self.base.nonassoc_errors:
+            self.nonassoc_errors[state_id] = self.base.nonassoc_errors[base_id]
+        self.base_states += 1
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get statistics about the generated FSM
+
+        Includes the time spent in each phase of the generator, in seconds,
+        the size of the FSM and the estimated memory used by the parse table,
+        in bytes. Table density is the part of all state/symbol combinations
+        which has an action.
+        """
+        from .table import _deep_sizeof
+
+        items_per_state = [len(state.items) for state in self.states]
+        entries = sum(len(actions) for actions in self.table)
+        return {
+            'rules': len(self.grammar),
+            'symbols': len(self.sym_set),
+            'states': len(self.states),
+            'items': len(self.pool.items),
+            'follow_sets': len(self.pool.follows),
+            'items_per_state_min': min(items_per_state),
+            'items_per_state_avg': sum(items_per_state) / len(self.states),
+            'items_per_state_max': max(items_per_state),
+            'table_entries': entries,
+            'table_density': entries / (len(self.states) * len(self.sym_set)),
+            'error_handler_states': len(self.error_handlers),
+            'base_states': self.base_states,
+            'table_bytes': _deep_sizeof(self.table),
+            'time_firsts': self.timings['firsts'],
+            'time_closures': self.timings['closures'],
+            'time_states': self.timings['states'],
+        }
 
     def export(self) -> Tuple[
         List[Tuple[str, Optional[str], List[bool]]],
@@ -430,3 +1064,20 @@ class ParsionFSM:
             self.table,
             self.error_handlers
         )
+
+
+# Generator used by the worker processes when building states in parallel
+_worker_fsm: Optional[ParsionFSM] = None
+
+
+def _init_worker(grammar_rules: List[Tuple[Optional[str], str, str]],
+                 entry_points: Optional[List[str]] = None) -> None:
+    global _worker_fsm
+    _worker_fsm = ParsionFSM.__new__(ParsionFSM)
+    _worker_fsm._init_grammar(grammar_rules, None, entry_points)
+
+
+def _worker_gen_follows(requests: List[Tuple[str, AbstractSet[str]]]
+                        ) -> Dict[str, Set[str]]:
+    assert _worker_fsm is not None
+    return _worker_fsm._get_gen_follows(requests)
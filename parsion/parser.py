@@ -1,134 +1,431 @@
-from dataclasses import dataclass
-from typing import Any, Callable, List, Optional, Set, Tuple, Dict, Iterable
-from .exceptions import ParsionParseError, ParsionInternalError
+from __future__ import annotations
+
+from .exceptions import ParsionParseError, ParsionInternalError, \
+    ParsionRecoveryLimitError
 from .lex import ParsionToken
 
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import AbstractSet, Any, Callable, List, Optional, \
+        Tuple, Dict, FrozenSet, Iterable, Mapping, Sequence
+    from .instrument import ParsionInstrumentation
+    from .tree import ParsionTree
+
 
-@dataclass
 class ParsionStackItem:
+    __slots__ = ('value', 'state', 'start', 'end')
+
     value: Any
     state: int
     start: int
     end: int
 
+    def __init__(self, value: Any, state: int, start: int, end: int):
+        self.value = value
+        self.state = state
+        self.start = start
+        self.end = end
+
 
-@dataclass
 class ParsionQueueItem:
+    __slots__ = ('sym', 'value', 'start', 'end')
+
     sym: str
     value: Any
     start: int
     end: int
 
+    def __init__(self, sym: str, value: Any, start: int, end: int):
+        self.sym = sym
+        self.value = value
+        self.start = start
+        self.end = end
+
+
+def _list_append(values: List[Any], value: Any) -> List[Any]:
+    values.append(value)
+    return values
+
+
+# Handlers of the rules generated for repetitions in the grammar, see
+# parsion.parsegen._expand_repetitions
+_BUILTIN_HANDLERS: Dict[str, Callable[..., Any]] = {
+    '$list_new': lambda value: [value],
+    '$list_append': _list_append,
+    '$list_empty': lambda: [],
+    '$none': lambda: None,
+}
+
 
 class ParsionParser:
+    """
+    LR parser, driven by tables generated by ParsionFSM
+
+    All state of a parse is local to the call, and the tables are only read.
+    One parser can therefore run any number of parses at the same time, from
+    several threads, as long as the handler objects allow it.
+    """
     parse_grammar: List[Tuple[str, Optional[str], List[bool]]]
-    parse_table: List[Dict[str, Tuple[str, int]]]
+    parse_table: Sequence[Mapping[str, Tuple[str, int]]]
     error_handlers: Dict[int, Dict[str, Tuple[str, str]]]
+    max_errors: Optional[int]
+    max_skipped_tokens: Optional[int]
+    max_state_recoveries: Optional[int]
+    track_positions: bool
+    start_states: Dict[str, int]
+    instrumentation: Optional[ParsionInstrumentation]
+    _expected: Dict[int, FrozenSet[str]]
+    _expected_terminals: Dict[int, FrozenSet[str]]
 
     def __init__(self,
                  parse_grammar: List[Tuple[str, Optional[str], List[bool]]],
-                 parse_table: List[Dict[str, Tuple[str, int]]],
-                 error_handlers: Dict[int, Dict[str, Tuple[str, str]]]
+                 parse_table: Sequence[Mapping[str, Tuple[str, int]]],
+                 error_handlers: Dict[int, Dict[str, Tuple[str, str]]],
+                 max_errors: Optional[int] = None,
+                 max_skipped_tokens: Optional[int] = None,
+                 max_state_recoveries: Optional[int] = None,
+                 track_positions: bool = True,
+                 entry_points: Sequence[str] = ()
                  ):
         self.parse_grammar = parse_grammar
         self.parse_table = parse_table
         self.error_handlers = error_handlers
+        self.max_errors = max_errors
+        self.max_skipped_tokens = max_skipped_tokens
+        self.max_state_recoveries = max_state_recoveries
+        self.track_positions = track_positions
+        # The generator numbers the start states in the order of the start
+        # rules, entry first
+        self.start_states = {'entry': 0}
+        for state, sym in enumerate(entry_points, 1):
+            self.start_states[sym] = state
+        self.instrumentation = None
+        self._expected = {}
+        self._expected_terminals = {}
+
+    def enable_instrumentation(self) -> ParsionInstrumentation:
+        """
+        Start recording statistics of calls to parse
+
+        Returns the instrumentation, which is kept if already enabled. See
+        ParsionInstrumentation for what is recorded. A language class has one
+        parser, so this applies to all instances of the class.
+        """
+        if self.instrumentation is None:
+            from .instrument import ParsionInstrumentation
+            self.instrumentation = ParsionInstrumentation(
+                self.parse_table,
+                {gen for gen, _, _ in self.parse_grammar}
+            )
+        return self.instrumentation
+
+    def disable_instrumentation(self) -> None:
+        self.instrumentation = None
+
+    def _get_start_state(self, start: str) -> int:
+        state = self.start_states.get(start)
+        if state is None:
+            raise ValueError(f'{start}: not an entry point')
+        return state
+
+    def _get_expected(self, state: int) -> FrozenSet[str]:
+        """
+        Get the set of tokens expected in a state, calculated on first error
+        in the state
+        """
+        expected = self._expected.get(state)
+        if expected is None:
+            expected = frozenset(self.parse_table[state].keys())
+            self._expected[state] = expected
+        return expected
+
+    def _advance(self,
+                 input: Iterable[ParsionToken],
+                 stack: List[ParsionStackItem]) -> None:
+        """
+        Run the parser from a stack over tokens, without calling handlers
+
+        The stack is updated in place. Reductions waiting for the token after
+        the last one are not made. Errors are recovered from by the error
+        rules as in _parse, but since the error handlers are not called,
+        recovery succeeds even where a handler would raise.
+        """
+        tokens = [
+            ParsionQueueItem(tok.name, None, tok.start, tok.end)
+            for tok
+            in input
+        ]
+        if len(tokens) > 0:
+            tokens.reverse()
+            self._run(tokens, stack, lambda *args: None, lambda *args: None,
+                      self.parse_table)
+
+    def _get_expected_terminals(self,
+                                stack: Sequence[ParsionStackItem],
+                                terminals: AbstractSet[str]
+                                ) -> FrozenSet[str]:
+        """
+        Get the terminals that can be shifted next from a stack
+
+        A terminal with a reduce action is only expected if the reductions it
+        causes lead to a shift of it. Terminals is the set of token names of
+        the lexer, and must be the same for all calls, since the terminals
+        with an action in each state are cached.
+        """
+        parse_table = self.parse_table
+        parse_grammar = self.parse_grammar
+        candidates = self._expected_terminals.get(stack[-1].state)
+        if candidates is None:
+            row = parse_table[stack[-1].state]
+            candidates = frozenset(sym for sym in terminals if sym in row)
+            self._expected_terminals[stack[-1].state] = candidates
+
+        expected = []
+        for sym in candidates:
+            # Reduce without copying the stack, by keeping the states pushed
+            # by the reductions above the part of the stack still used
+            depth = len(stack)
+            pushed: List[int] = []
+            state = stack[-1].state
+            op, id = parse_table[state][sym]
+            while op == 'r':
+                gen, _, accepts = parse_grammar[id]
+                popped = len(accepts) - len(pushed)
+                if popped > 0:
+                    depth -= popped
+                    pushed = []
+                else:
+                    del pushed[len(pushed) - len(accepts):]
+                state = pushed[-1] if len(pushed) > 0 \
+                    else stack[depth - 1].state
+                state = parse_table[state][gen][1]
+                pushed.append(state)
+                if sym not in parse_table[state]:
+                    break
+                op, id = parse_table[state][sym]
+            else:
+                expected.append(sym)
+        return frozenset(expected)
+
+    def _error(self,
+               error: Tuple[int, str, int, int, int]
+               ) -> ParsionParseError:
+        """
+        Create the error of an unexpected token, from the state, token name,
+        and start, position and end of the error
+        """
+        state, sym, start, pos, end = error
+        expect_toks = self._get_expected(state)
+        expect_str = ",".join(expect_toks)
+        return ParsionParseError(
+            f'Unexpected {sym}, expected {expect_str}',
+            start,
+            pos,
+            end,
+            expect_toks
+        )
+
+    def _limit_error(self,
+                     reason: str,
+                     error: Tuple[int, str, int, int, int],
+                     errors: List[Tuple[int, str, int, int, int]]
+                     ) -> ParsionRecoveryLimitError:
+        """
+        Create the error raised when a recovery limit is reached, at the
+        position of the error that could not be recovered from
+        """
+        _, _, start, pos, end = error
+        return ParsionRecoveryLimitError(
+            f'{reason}, {len(errors)} errors recovered',
+            start,
+            pos,
+            end,
+            self._get_expected(error[0]),
+            [self._error(e) for e in errors + [error]]
+        )
 
     def _parse(self,
                input: Iterable[ParsionToken],
                reduce_handler: Callable[[
+                   int,
                    Optional[str],
-                   str,
                    List[bool],
-                   List[Any]
+                   List[Any],
+                   int,
+                   int
                ], Any],
                error_handler: Callable[[
-                   str, str, int, int, int, Set[str]], Any]
+                   str, str, int, int, int, AbstractSet[str]], Any],
+               parse_table: Optional[
+                   Sequence[Mapping[str, Tuple[str, int]]]] = None,
+               start_state: int = 0
                ) -> Any:
+        if parse_table is None:
+            parse_table = self.parse_table
+
+        # Tokens are queued in reverse order, so the next token is popped from
+        # the end of the list in constant time
         tokens: List[ParsionQueueItem] = [
             ParsionQueueItem(tok.name, tok.value, tok.start, tok.end)
             for tok
             in input
         ]
-        stack: List[ParsionStackItem] = [ParsionStackItem('START', 0, 0, 0)]
+        tokens.reverse()
+        return self._run(
+            tokens,
+            [ParsionStackItem('START', start_state, 0, 0)],
+            reduce_handler,
+            error_handler,
+            parse_table
+        )
+
+    def _run(self,
+             tokens: List[ParsionQueueItem],
+             stack: List[ParsionStackItem],
+             reduce_handler: Callable[[
+                 int,
+                 Optional[str],
+                 List[bool],
+                 List[Any],
+                 int,
+                 int
+             ], Any],
+             error_handler: Callable[[
+                 str, str, int, int, int, AbstractSet[str]], Any],
+             parse_table: Sequence[Mapping[str, Tuple[str, int]]]
+             ) -> Any:
+        """
+        Run the parser from a stack, until all queued tokens are consumed
+        """
+        # Position in the stack of the nearest state with error handlers, for
+        # each position of the stack, or -1 if there is none
+        error_handlers = self.error_handlers
+        recovery: List[int] = []
+        nearest = -1
+        for pos, item in enumerate(stack):
+            if item.state in error_handlers:
+                nearest = pos
+            recovery.append(nearest)
+
+        # Errors recovered from so far, and the budget used for recovery.
+        # Errors are kept as the arguments of _error, and only if a limit may
+        # raise them, so recovering is cheap
+        max_errors = self.max_errors
+        max_skipped_tokens = self.max_skipped_tokens
+        max_state_recoveries = self.max_state_recoveries
+        keep_errors = max_errors is not None or \
+            max_skipped_tokens is not None or \
+            max_state_recoveries is not None
+        errors: List[Tuple[int, str, int, int, int]] = []
+        skipped_tokens = 0
+        state_recoveries: Dict[int, int] = {}
 
         while len(tokens) > 0:
-            cur_tok = tokens[0]
+            cur_tok = tokens[-1]
             cur_state = stack[-1]
-            if cur_tok.sym not in self.parse_table[cur_state.state]:
+            cur_row = parse_table[cur_state.state]
+            if cur_tok.sym not in cur_row:
                 # Unexpected token, do error recovery
-                expect_toks = set(self.parse_table[cur_state.state].keys())
-                try:
-                    # First, pop stack until error handler
-                    error_stack: List[ParsionStackItem] = []
-                    while stack[-1].state not in self.error_handlers:
-                        error_stack.append(stack.pop())
-
-                    state_error_handlers = self.error_handlers[stack[-1].state]
-
-                    error_tokens = []
-                    while tokens[0].sym not in state_error_handlers:
-                        error_tokens.append(tokens.pop(0))
-
-                    # Call error handler, mimic a reduce operation
-                    error_gen, handler_func = \
-                        state_error_handlers[tokens[0].sym]
-
-                    error_start = error_stack[-1].start
-                    error_pos = error_tokens[0].start
-                    error_end = error_tokens[-1].end
-
-                    value = error_handler(
-                        handler_func,
-                        error_gen,
-                        error_start,
-                        error_pos,
-                        error_end,
-                        expect_toks
-                    )
-                    tokens.insert(0, ParsionQueueItem(
-                        error_gen,
-                        value,
-                        error_start,
-                        error_end
-                    ))
-                except IndexError:
-                    expect_str = ",".join(expect_toks)
-                    raise ParsionParseError(
-                        f'Unexpected {cur_tok.sym}, expected {expect_str}',
-                        cur_state.start,
-                        cur_tok.start,
-                        cur_tok.end,
-                        expect_toks
-                    )
+                expect_toks = self._get_expected(cur_state.state)
+                error = (
+                    cur_state.state,
+                    cur_tok.sym,
+                    cur_state.start,
+                    cur_tok.start,
+                    cur_tok.end
+                )
+                recovery_pos = recovery[-1]
+                error_tokens = 0
+                if recovery_pos >= 0:
+                    recovery_state = stack[recovery_pos].state
+                    attempts = state_recoveries.get(recovery_state, 0)
+                    if max_errors is not None and len(errors) >= max_errors:
+                        raise self._limit_error(
+                            'Too many errors', error, errors)
+                    if max_state_recoveries is not None and \
+                            attempts >= max_state_recoveries:
+                        raise self._limit_error(
+                            'Too many recoveries in one state', error, errors)
+                    state_recoveries[recovery_state] = attempts + 1
+
+                    # Skip tokens until one that the error handler accepts
+                    state_error_handlers = error_handlers[recovery_state]
+                    skip_limit = len(tokens) if max_skipped_tokens is None \
+                        else max_skipped_tokens - skipped_tokens
+                    error_pos = cur_tok.start
+                    while len(tokens) > 0 and \
+                            tokens[-1].sym not in state_error_handlers:
+                        if error_tokens == skip_limit:
+                            raise self._limit_error(
+                                'Too many skipped tokens', error, errors)
+                        error_end = tokens.pop().end
+                        error_tokens += 1
+                    skipped_tokens += error_tokens
+
+                if error_tokens == 0 or len(tokens) == 0 or \
+                        recovery_pos == len(stack) - 1:
+                    raise self._error(error)
+                if keep_errors:
+                    errors.append(error)
+
+                # Call error handler, mimic a reduce operation
+                error_gen, handler_func = state_error_handlers[tokens[-1].sym]
+                error_start = stack[recovery_pos + 1].start
+                del stack[recovery_pos + 1:]
+                del recovery[recovery_pos + 1:]
+
+                value = error_handler(
+                    handler_func,
+                    error_gen,
+                    error_start,
+                    error_pos,
+                    error_end,
+                    expect_toks
+                )
+                tokens.append(ParsionQueueItem(
+                    error_gen,
+                    value,
+                    error_start,
+                    error_end
+                ))
             else:
-                op, id = self.parse_table[cur_state.state][cur_tok.sym]
+                op, id = cur_row[cur_tok.sym]
                 if op == 's':
                     # shift
-                    tokens.pop(0)
+                    tokens.pop()
                     stack.append(ParsionStackItem(
                         cur_tok.value,
                         id,
                         cur_tok.start,
                         cur_tok.end
                     ))
+                    recovery.append(
+                        len(stack) - 1 if id in error_handlers
+                        else recovery[-1]
+                    )
                 elif op == 'r':
                     # reduce
                     gen, goal, accepts = self.parse_grammar[id]
-                    reduce_start = stack[-len(accepts)].start
+                    base = len(stack) - len(accepts)
                     reduce_end = stack[-1].end
-                    tokens.insert(0, ParsionQueueItem(
+                    # Empty rules are placed at the end of the previous item
+                    reduce_start = stack[base].start if base < len(stack) \
+                        else reduce_end
+                    tokens.append(ParsionQueueItem(
                         gen,
                         reduce_handler(
+                            id,
                             goal,
-                            gen,
                             accepts,
-                            [p.value for p in stack[-len(accepts):]]
+                            [p.value for p in stack[base:]],
+                            reduce_start,
+                            reduce_end
                         ),
                         reduce_start,
                         reduce_end
                     ))
-                    stack = stack[:-len(accepts)]
+                    del stack[base:]
+                    del recovery[base:]
                 else:
                     raise ParsionInternalError(
                         'Internal error: neigher shift nor reduce')
@@ -140,20 +437,133 @@ class ParsionParser:
         # Therefore, pick out entry value and return
         return stack[1].value
 
+    def _parse_fast(self,
+                    input: Iterable[ParsionToken],
+                    reduce_handler: Callable[[
+                        int,
+                        Optional[str],
+                        List[bool],
+                        List[Any],
+                        int,
+                        int
+                    ], Any],
+                    error_handler: Callable[[
+                        str, str, int, int, int, AbstractSet[str]], Any],
+                    start_state: int = 0
+                    ) -> Any:
+        """
+        Parse without tracking positions
+
+        Only states and values are kept on the stack, and the reduce handler
+        is called with -1 as positions. On the first unexpected token, the
+        positions are reconstructed from the tokens, and parsing continues as
+        in _parse, so errors and error recovery are the same in both modes.
+        """
+        parse_table = self.parse_table
+        parse_grammar = self.parse_grammar
+        tokens = list(input)
+        states = [start_state]
+        values: List[Any] = ['START']
+
+        pos = 0
+        while pos < len(tokens):
+            cur_tok = tokens[pos]
+            cur_row = parse_table[states[-1]]
+            if cur_tok.name not in cur_row:
+                return self._resume(tokens, pos, values, reduce_handler,
+                                    error_handler, start_state)
+            op, id = cur_row[cur_tok.name]
+            if op == 's':
+                pos += 1
+                states.append(id)
+                values.append(cur_tok.value)
+            else:
+                gen, goal, accepts = parse_grammar[id]
+                base = len(states) - len(accepts)
+                value = reduce_handler(id, goal, accepts, values[base:],
+                                       -1, -1)
+                del states[base:]
+                del values[base:]
+                # The generated symbol is always shifted next
+                states.append(parse_table[states[-1]][gen][1])
+                values.append(value)
+
+        return values[1]
+
+    def _resume(self,
+                tokens: List[ParsionToken],
+                pos: int,
+                values: List[Any],
+                reduce_handler: Callable[[
+                    int,
+                    Optional[str],
+                    List[bool],
+                    List[Any],
+                    int,
+                    int
+                ], Any],
+                error_handler: Callable[[
+                    str, str, int, int, int, AbstractSet[str]], Any],
+                start_state: int = 0
+                ) -> Any:
+        """
+        Continue a parse stopped by _parse_fast at an unexpected token
+
+        The automaton is run again over the tokens up to the error, without
+        calling any handlers, tracking only states and positions. It takes the
+        same steps, so the result matches the values of the stopped parse.
+        """
+        parse_table = self.parse_table
+        parse_grammar = self.parse_grammar
+        stack = [ParsionStackItem('START', start_state, 0, 0)]
+        i = 0
+        while tokens[i].name in parse_table[stack[-1].state]:
+            cur_tok = tokens[i]
+            op, id = parse_table[stack[-1].state][cur_tok.name]
+            if op == 's':
+                i += 1
+                stack.append(ParsionStackItem(
+                    None, id, cur_tok.start, cur_tok.end))
+            else:
+                gen, _, accepts = parse_grammar[id]
+                base = len(stack) - len(accepts)
+                end = stack[-1].end
+                start = stack[base].start if base < len(stack) else end
+                del stack[base:]
+                stack.append(ParsionStackItem(
+                    None, parse_table[stack[-1].state][gen][1], start, end))
+        assert i == pos and len(stack) == len(values)
+
+        for item, value in zip(stack, values):
+            item.value = value
+        queue = [
+            ParsionQueueItem(tok.name, tok.value, tok.start, tok.end)
+            for tok
+            in reversed(tokens[pos:])
+        ]
+        return self._run(queue, stack, reduce_handler, error_handler,
+                         parse_table)
+
     def parse(self,
               input: Iterable[ParsionToken],
-              handlerobj: object) -> Any:
+              handlerobj: object,
+              start: str = 'entry') -> Any:
+        start_state = self._get_start_state(start)
 
         def _call_reduce(
+                id: int,
                 goal: Optional[str],
-                gen: str,
                 accepts: List[bool],
-                parts: List[Any]) -> Any:
+                parts: List[Any],
+                start: int,
+                end: int) -> Any:
             args = [p for a, p in zip(accepts, parts) if a]
 
             if goal is None:
                 assert len(args) == 1
                 return args[0]
+            elif goal[0] == '$':
+                return _BUILTIN_HANDLERS[goal](*args)
             else:
                 return getattr(handlerobj, goal)(*args)
 
@@ -163,7 +573,7 @@ class ParsionParser:
                 error_start: int,
                 error_pos: int,
                 error_end: int,
-                expect: Set[str]) -> Any:
+                expect: AbstractSet[str]) -> Any:
             return getattr(handlerobj, handler)(
                 gen,
                 error_start,
@@ -172,7 +582,86 @@ class ParsionParser:
                 expect
             )
 
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            return instrumentation._parse(
+                self,
+                input,
+                _call_reduce,
+                _call_error_handler,
+                start_state)
+        if not self.track_positions:
+            return self._parse_fast(
+                input,
+                _call_reduce,
+                _call_error_handler,
+                start_state)
         return self._parse(
             input,
             _call_reduce,
-            _call_error_handler)
+            _call_error_handler,
+            start_state=start_state)
+
+    def parse_tree(self,
+                   input: Iterable[ParsionToken],
+                   start: str = 'entry') -> ParsionTree:
+        """
+        Parse into a ParsionTree, without calling any handlers
+        """
+        start_state = self._get_start_state(start)
+        from .tree import ParsionTree, TOKEN, ERROR, LIST, _ParsionTreeList
+        tree = ParsionTree()
+
+        def _node(part: Any) -> int:
+            # Tokens are only added to the tree when accepted by a rule, and
+            # lists when complete
+            if type(part) is int:
+                return part
+            if type(part) is _ParsionTreeList:
+                return tree._add('$list', LIST, None, part.start, part.end,
+                                 part.children)
+            return tree._add(part.name, TOKEN, part.value, part.start,
+                             part.end, [])
+
+        def _add_node(
+                id: int,
+                goal: Optional[str],
+                accepts: List[bool],
+                parts: List[Any],
+                start: int,
+                end: int) -> Any:
+            children = [p for a, p in zip(accepts, parts) if a]
+
+            if goal is None:
+                assert len(children) == 1
+                return children[0]
+            elif goal == '$list_append':
+                values, value = children
+                values.children.append(_node(value))
+                values.end = end
+                return values
+            elif goal == '$list_new' or goal == '$list_empty':
+                return _ParsionTreeList(
+                    start, end, [_node(child) for child in children])
+            else:
+                return tree._add(goal, id, None, start, end,
+                                 [_node(child) for child in children])
+
+        def _add_error_node(
+                handler: str,
+                gen: str,
+                error_start: int,
+                error_pos: int,
+                error_end: int,
+                expect: AbstractSet[str]) -> Any:
+            return tree._add(handler, ERROR, None, error_start, error_end,
+                             [])
+
+        # Pass the tokens themselves as values, to tell them from node ids
+        tree.root = _node(self._parse(
+            (ParsionToken(tok.name, tok, tok.start, tok.end) for tok in input),
+            _add_node,
+            _add_error_node,
+            start_state=start_state
+        ))
+        return tree
@@ -23,7 +23,8 @@ def _self_check_handlers(par: ParsionBase) -> None:
                 raise ParsionSelfCheckError(
                     f'No handler for rule #{i} (gen: {gen}), but {argc} args'
                 )
-        else:
+        elif goal[0] != '$':
+            # Handlers starting with $ are builtin
             expected_funcs[goal] = argc
 
     # Check all error handlers are implemented
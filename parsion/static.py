@@ -0,0 +1,154 @@
+"""
+Export the parse tables of a Parsion language as Python source
+
+The generated module contains a ParsionStatic subclass of the language,
+which uses the precalculated tables instead of generating them, and inherits
+lexer rules and handlers from the original class.
+
+The tables can either be included in the source, or be written to a binary
+file, which is memory mapped when the static class is compiled. The binary
+file is expected to be stored next to the generated module.
+
+Usage:
+
+    python -m parsion.static module:ClassName > module_static.py
+    python -m parsion.static --binary module.tables module:ClassName \\
+        > module_static.py
+"""
+import argparse
+import os
+import sys
+from typing import List, Optional, Type
+
+from .core import Parsion
+from .stats import load_language
+
+
+def export_static(cls: Type[Parsion],
+                  name: Optional[str] = None,
+                  table_file: Optional[str] = None) -> str:
+    """
+    Generate Python source for a ParsionStatic version of a language
+
+    The handlers are checked against the grammar while exporting, and the
+    result is recorded as STATIC_SELF_CHECKED, so the check is skipped when
+    the static class is instantiated.
+
+    The class must be importable from its module, directly or as an
+    attribute of a class, so it can't be defined in a function.
+
+    If table_file is given, the tables are written to that file in binary
+    format, and the generated class loads them from a file with the same name
+    in the directory of the generated module.
+    """
+    if '<locals>' in cls.__qualname__:
+        raise ValueError(f'{cls.__qualname__}: a class defined in a '
+                         'function can\'t be imported by the generated module')
+    if name is None:
+        name = f'{cls.__name__}Static'
+
+    # The class is compiled from the same generator, if not compiled already,
+    # and checked when instantiated, unless it was already checked
+    fsm = cls._get_generator()
+    lang = cls()
+    if not cls.__dict__.get('_self_checked', False):
+        lang._self_check()
+    parse_grammar, parse_table, error_handlers = fsm.export()
+
+    if table_file is None:
+        imports = []
+        tables = [
+            '    STATIC_GRAMMAR = ' + _format_value(parse_grammar),
+            '    STATIC_TABLE = ' + _format_value(parse_table),
+            '    STATIC_ERROR_HANDLERS = ' + _format_value(error_handlers),
+            '    STATIC_NONASSOC_ERRORS = '
+            f'{_format_value(fsm.nonassoc_errors)}',
+        ]
+    else:
+        from .binary import dump_tables
+        with open(table_file, 'wb') as f:
+            dump_tables(f, parse_grammar, parse_table, error_handlers,
+                        fsm.nonassoc_errors)
+        imports = ['import os']
+        tables = [
+            '    STATIC_TABLE_FILE = os.path.join(',
+            '        os.path.dirname(__file__),',
+            f'        {os.path.basename(table_file)!r}',
+            '    )',
+        ]
+
+    return '\n'.join([
+        '# Generated by parsion.static, do not edit',
+        f'# Source: {cls.__module__}.{cls.__qualname__}',
+        *imports,
+        'from parsion import ParsionStatic',
+        f'from {cls.__module__} import {cls.__qualname__.split(".")[0]}',
+        '',
+        '',
+        f'class {name}(ParsionStatic, {cls.__qualname__}):',
+        '    STATIC_SELF_CHECKED = True',
+        *tables,
+        ''
+    ])
+
+
+def _format_value(value: object, indent: str = '    ') -> str:
+    """
+    Format a value as Python source, indented to fit in a class body
+
+    Lists and dicts are split to one element per line, the tables are too
+    big to be readable otherwise
+
+    >>> print(_format_value({1: {'INT': ('s', 2)}, 2: {}}))
+    {
+        1: {
+            'INT': ('s', 2),
+        },
+        2: {},
+    }
+    >>> print(_format_value([('entry', None, [True])]))
+    [
+        ('entry', None, [True]),
+    ]
+    """
+    inner = indent + '    '
+    if isinstance(value, dict) and len(value) > 0:
+        return '{\n' + ''.join(
+            f'{inner}{key!r}: {_format_value(item, inner)},\n'
+            for key, item in value.items()
+        ) + indent + '}'
+    if isinstance(value, list) and len(value) > 0:
+        return '[\n' + ''.join(
+            f'{inner}{_format_value(item, inner)},\n'
+            for item in value
+        ) + indent + ']'
+    return repr(value)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m parsion.static',
+        description='Export the parse tables of a Parsion language as Python '
+                    'source'
+    )
+    parser.add_argument('--name',
+                        help='name of the generated class, default is the '
+                             'language class name followed by Static')
+    parser.add_argument('--binary', metavar='FILE',
+                        help='write the tables to FILE in binary format, '
+                             'instead of including them in the source')
+    parser.add_argument('language',
+                        help='language class, as module:ClassName')
+    args = parser.parse_args(argv)
+
+    try:
+        cls = load_language(args.language)
+    except (ImportError, AttributeError, ValueError) as e:
+        parser.error(str(e))
+
+    print(export_static(cls, args.name, args.binary), end='')
+    return 0
+
+
+if __name__ == '__main__':  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+Print statistics about the table generation for a Parsion language
+
+Usage:
+
+    python -m parsion.stats [--json] module:ClassName
+"""
+import argparse
+import importlib
+import json
+import sys
+from typing import Dict, List, Optional, Type
+
+from .core import Parsion
+
+
+def load_language(path: str) -> Type[Parsion]:
+    """
+    Load a Parsion subclass given as module:ClassName
+    """
+    module_name, sep, class_name = path.partition(':')
+    if sep == '' or class_name == '':
+        raise ValueError(f'{path}: expected module:ClassName')
+    cls = getattr(importlib.import_module(module_name), class_name)
+    if not isinstance(cls, type) or not issubclass(cls, Parsion):
+        raise ValueError(f'{path}: not a Parsion subclass')
+    return cls
+
+
+def build_report(cls: Type[Parsion]) -> Dict[str, float]:
+    """
+    Generate the FSM for a language and return its statistics
+    """
+    return cls._create_fsm().stats()
+
+
+def format_report(stats: Dict[str, float]) -> str:
+    """
+    Format statistics as aligned lines of text
+
+    >>> print(format_report({'states': 12, 'table_density': 0.125}))
+    states                          12
+    table_density             0.125000
+    """
+    return '\n'.join(
+        f'{key:<20} {value:>12}' if isinstance(value, int)
+        else f'{key:<20} {value:>12.6f}'
+        for key, value in stats.items()
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m parsion.stats',
+        description='Print statistics about the table generation for a '
+                    'Parsion language'
+    )
+    parser.add_argument('--json', action='store_true',
+                        help='print the statistics as JSON')
+    parser.add_argument('language',
+                        help='language class, as module:ClassName')
+    args = parser.parse_args(argv)
+
+    try:
+        cls = load_language(args.language)
+    except (ImportError, AttributeError, ValueError) as e:
+        parser.error(str(e))
+
+    stats = build_report(cls)
+    if args.json:
+        print(json.dumps(stats, indent=2))
+    else:
+        print(format_report(stats))
+    return 0
+
+
+if __name__ == '__main__':  # pragma: no cover
+    sys.exit(main())
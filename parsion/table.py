@@ -0,0 +1,318 @@
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, \
+    Sequence as SequenceType, overload
+
+
+def _encode(action: Tuple[str, int]) -> int:
+    """
+    Encode a table action as an integer
+
+    Shift to state n is encoded as n + 1, reduce by rule n as -(n + 1), and 0
+    means no action
+
+    >>> _encode(('s', 0)), _encode(('s', 12)), _encode(('r', 0))
+    (1, 13, -1)
+    """
+    op, id = action
+    return id + 1 if op == 's' else -(id + 1)
+
+
+def _decode(value: int) -> Tuple[str, int]:
+    """
+    Decode an integer encoded table action
+
+    >>> _decode(1), _decode(13), _decode(-1)
+    (('s', 0), ('s', 12), ('r', 0))
+    """
+    return ('s', value - 1) if value > 0 else ('r', -value - 1)
+
+
+def _deep_sizeof(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    """
+    Estimate the memory used by an object, including referenced containers
+
+    Objects referenced several times are only counted once
+
+    >>> _deep_sizeof([]) == sys.getsizeof([])
+    True
+
+    >>> shared = ('s', 1)
+    >>> _deep_sizeof([shared, shared]) < _deep_sizeof([('s', 1), ('s', 2)])
+    True
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += _deep_sizeof(key, seen) + _deep_sizeof(value, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for value in obj:
+            size += _deep_sizeof(value, seen)
+    elif isinstance(obj, ParsionCompressedTable):
+        for value in vars(obj).values():
+            size += _deep_sizeof(value, seen)
+    return size
+
+
+def _find_base(entries: Tuple[Tuple[int, int], ...],
+               free: List[int],
+               check: 'array[int]',
+               action: 'array[int]') -> int:
+    """
+    Find the first displacement where all entries fit in free slots
+
+    Only displacements placing the first entry in a free slot, listed in free,
+    or after the end of the arrays are candidates. The arrays are grown to fit
+    the row.
+    """
+    if len(entries) == 0:
+        return 0
+
+    first = entries[0][0]
+    for slot in free[bisect_left(free, first):]:
+        base = slot - first
+        for sym_id, _ in entries:
+            idx = base + sym_id
+            if idx < len(check) and check[idx] != -1:
+                break
+        else:
+            break
+    else:
+        base = max(0, len(check) - first)
+
+    size = base + entries[-1][0] + 1
+    while len(check) < size:
+        free.append(len(check))
+        check.append(-1)
+        action.append(0)
+    return base
+
+
+class ParsionCompressedRow(Mapping[str, Tuple[str, int]]):
+    """
+    View of a single state in a ParsionCompressedTable
+
+    Behaves as the dict of a state in the uncompressed table, except that
+    symbols handled by the default reduction of the state are not listed,
+    but still looked up.
+    """
+    __slots__ = ('table', 'row')
+
+    table: 'ParsionCompressedTable'
+    row: int
+
+    def __init__(self, table: 'ParsionCompressedTable', row: int):
+        self.table = table
+        self.row = row
+
+    def _lookup(self, sym: object) -> int:
+        table = self.table
+        sym_id: Optional[int] = \
+            table.sym_ids.get(sym)  # type: ignore[call-overload]
+        if sym_id is not None:
+            idx = table.base[self.row] + sym_id
+            if idx < len(table.check) and table.check[idx] == self.row:
+                return table.action[idx]
+        return table.default[self.row]
+
+    def __contains__(self, sym: object) -> bool:
+        return self._lookup(sym) != 0
+
+    def __getitem__(self, sym: str) -> Tuple[str, int]:
+        value = self._lookup(sym)
+        if value == 0:
+            raise KeyError(sym)
+        return _decode(value)
+
+    def __iter__(self) -> Iterator[str]:
+        table = self.table
+        base = table.base[self.row]
+        for sym_id, sym in enumerate(table.symbols):
+            idx = base + sym_id
+            if idx < len(table.check) and table.check[idx] == self.row and \
+                    table.action[idx] != 0:
+                yield sym
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+class ParsionCompressedTable(Sequence[ParsionCompressedRow]):
+    """
+    A parse table packed into flat integer arrays
+
+    Identical states share one row. The most common reduction of each row is
+    moved to a per row default, and the remaining actions of all rows are
+    packed into one comb vector, using row displacement. Each lookup is a
+    constant number of array accesses.
+
+    The table can be used directly by ParsionParser in place of the list of
+    dicts generated by ParsionFSM. Since default reductions are made without
+    checking the next token, errors are detected in the state after the
+    default reductions, and the tokens handled by a default reduction are not
+    listed as expected. Symbols made errors by nonassoc precedence, given by
+    nonassoc_errors, are stored as entries without action in rows with a
+    default reduction, so they are still errors.
+
+    >>> table = ParsionCompressedTable([
+    ...     {'INT': ('s', 1), 'expr': ('s', 2)},
+    ...     {'$END': ('r', 2), '+': ('r', 2)},
+    ...     {'$END': ('r', 1)},
+    ...     {'$END': ('r', 2), '+': ('r', 2)}
+    ... ])
+    >>> len(table), table.row_count
+    (4, 3)
+    >>> table[0]['INT'], table[3]['+'], 'INT' in table[0], '+' in table[0]
+    (('s', 1), ('r', 2), True, False)
+    >>> dict(table[0])
+    {'INT': ('s', 1), 'expr': ('s', 2)}
+    >>> dict(table[1]), 'anything' in table[1]
+    ({}, True)
+    >>> table[0]['$END']
+    Traceback (most recent call last):
+    ...
+    KeyError: '$END'
+    """
+    symbols: List[str]
+    sym_ids: Dict[str, int]
+    state_rows: SequenceType[int]
+    base: SequenceType[int]
+    default: SequenceType[int]
+    check: SequenceType[int]
+    action: SequenceType[int]
+
+    def __init__(self,
+                 parse_table: List[Dict[str, Tuple[str, int]]],
+                 nonassoc_errors: Optional[Dict[int, List[str]]] = None):
+        if nonassoc_errors is None:
+            nonassoc_errors = {}
+        self._set_symbols(sorted({
+            sym
+            for state in parse_table
+            for sym in state.keys()
+        }.union(*nonassoc_errors.values())))
+
+        # Deduplicate rows, after moving the most common reduction to default
+        row_ids: Dict[Tuple[int, Tuple[Tuple[int, int], ...]], int] = {}
+        rows: List[Tuple[int, Tuple[Tuple[int, int], ...]]] = []
+        state_rows = array('i')
+        for state_id, state in enumerate(parse_table):
+            encoded = {
+                self.sym_ids[sym]: _encode(action)
+                for sym, action in state.items()
+            }
+            reductions = [value for value in encoded.values() if value < 0]
+            default = 0
+            if len(reductions) > 0:
+                default = max(set(reductions), key=reductions.count)
+            row_entries = [
+                (sym_id, value)
+                for sym_id, value in encoded.items()
+                if value != default
+            ]
+            if default != 0:
+                # Errors are stored as explicit entries without action, so
+                # the default reduction is not used for them
+                row_entries += [
+                    (self.sym_ids[sym], 0)
+                    for sym in nonassoc_errors.get(state_id, [])
+                ]
+            row = (default, tuple(sorted(row_entries)))
+            if row not in row_ids:
+                row_ids[row] = len(rows)
+                rows.append(row)
+            state_rows.append(row_ids[row])
+
+        # Pack the rows, the rows with most entries first
+        base = array('i', [0] * len(rows))
+        check = array('i')
+        action = array('i')
+        free: List[int] = []
+        for row_id in sorted(range(len(rows)),
+                             key=lambda row_id: -len(rows[row_id][1])):
+            entries = rows[row_id][1]
+            row_base = _find_base(entries, free, check, action)
+            base[row_id] = row_base
+            for sym_id, value in entries:
+                check[row_base + sym_id] = row_id
+                action[row_base + sym_id] = value
+                del free[bisect_left(free, row_base + sym_id)]
+
+        self.state_rows = state_rows
+        self.base = base
+        self.default = array('i', [default for default, _ in rows])
+        self.check = check
+        self.action = action
+
+    @classmethod
+    def from_arrays(cls,
+                    symbols: List[str],
+                    state_rows: SequenceType[int],
+                    base: SequenceType[int],
+                    default: SequenceType[int],
+                    check: SequenceType[int],
+                    action: SequenceType[int]
+                    ) -> 'ParsionCompressedTable':
+        """
+        Create a table from already packed arrays
+
+        The arrays can be any sequences of integers, for example memoryviews
+        of a memory mapped file, and are used without copying.
+        """
+        table = cls.__new__(cls)
+        table._set_symbols(symbols)
+        table.state_rows = state_rows
+        table.base = base
+        table.default = default
+        table.check = check
+        table.action = action
+        return table
+
+    def _set_symbols(self, symbols: List[str]) -> None:
+        self.symbols = symbols
+        self.sym_ids = {sym: i for i, sym in enumerate(symbols)}
+
+    @property
+    def row_count(self) -> int:
+        return len(self.base)
+
+    @overload
+    def __getitem__(self, state: int) -> ParsionCompressedRow:
+        ...
+
+    @overload
+    def __getitem__(self, state: slice) -> List[ParsionCompressedRow]:
+        ...
+
+    def __getitem__(self, state: Any) -> Any:
+        if isinstance(state, slice):
+            return [self[i] for i in range(len(self))[state]]
+        return ParsionCompressedRow(self, self.state_rows[state])
+
+    def __len__(self) -> int:
+        return len(self.state_rows)
+
+
+def memory_report(parse_table: List[Dict[str, Tuple[str, int]]]
+                  ) -> Dict[str, int]:
+    """
+    Compare the estimated memory usage of a parse table, in bytes, in dict
+    form and compressed form
+    """
+    compressed = ParsionCompressedTable(parse_table)
+    return {
+        'states': len(parse_table),
+        'rows': compressed.row_count,
+        'entries': sum(len(state) for state in parse_table),
+        'packed_slots': len(compressed.check),
+        'dict_bytes': _deep_sizeof(parse_table),
+        'compressed_bytes': _deep_sizeof(compressed),
+    }
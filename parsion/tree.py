@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Values of ParsionTree.rule for nodes not created by a rule
+TOKEN = -1
+ERROR = -2
+LIST = -3
+
+
+class ParsionTree:
+    """
+    Syntax tree stored in flat arrays, built by the parser without handlers
+
+    Each node is an index into the arrays. A node is either a token, a node
+    created by a rule with a handler name, or an error node created by an
+    error handler. The kind of a node is the token name, handler name or
+    error handler name. Rules without handler name don't create nodes, but
+    pass their only accepted part through, the same way as when parsing with
+    handlers. Parts of a rule not accepted, prefixed with _, are not children,
+    and such tokens are not stored.
+
+    Repetitions, X* and X+ in rules, create a node of kind $list, with the
+    elements as children. An absent optional, X? in a rule, creates a node of
+    kind $none without children.
+
+    Children of a node are stored as a range of the children array. Token
+    values are stored in values, which is None for other nodes.
+    """
+    kinds: List[str]
+    kind_ids: Dict[str, int]
+
+    kind: 'array[int]'
+    rule: 'array[int]'
+    start: 'array[int]'
+    end: 'array[int]'
+    child_start: 'array[int]'
+    child_end: 'array[int]'
+    children: 'array[int]'
+    values: List[Any]
+
+    root: int
+
+    def __init__(self) -> None:
+        self.kinds = []
+        self.kind_ids = {}
+        self.kind = array('i')
+        self.rule = array('i')
+        self.start = array('i')
+        self.end = array('i')
+        self.child_start = array('i')
+        self.child_end = array('i')
+        self.children = array('i')
+        self.values = []
+        self.root = -1
+
+    def _add(self, kind: str, rule: int, value: Any, start: int, end: int,
+             children: List[int]) -> int:
+        kind_id = self.kind_ids.get(kind)
+        if kind_id is None:
+            kind_id = self.kind_ids[kind] = len(self.kinds)
+            self.kinds.append(kind)
+
+        node = len(self.kind)
+        self.kind.append(kind_id)
+        self.rule.append(rule)
+        self.start.append(start)
+        self.end.append(end)
+        self.child_start.append(len(self.children))
+        self.children.extend(children)
+        self.child_end.append(len(self.children))
+        self.values.append(value)
+        return node
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    def cursor(self, node: Optional[int] = None) -> 'ParsionTreeCursor':
+        """
+        Get a cursor at a node, by default the root
+        """
+        return ParsionTreeCursor(self, self.root if node is None else node)
+
+    def get_kind(self, node: int) -> str:
+        return self.kinds[self.kind[node]]
+
+    def get_children(self, node: int) -> 'array[int]':
+        return self.children[self.child_start[node]:self.child_end[node]]
+
+    def walk(self, node: Optional[int] = None) -> Iterator[int]:
+        """
+        Iterate over all nodes below a node, by default the root, depth first
+        and in input order
+        """
+        stack = [self.root if node is None else node]
+        while len(stack) > 0:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(self.get_children(node)))
+
+    def to_tuple(self, node: Optional[int] = None) -> Tuple[Any, ...]:
+        """
+        Convert a subtree to nested tuples, mostly for debugging and tests
+
+        Tokens are converted to (kind, value), other nodes to kind followed by
+        the children.
+        """
+        if node is None:
+            node = self.root
+        if self.rule[node] == TOKEN:
+            return (self.get_kind(node), self.values[node])
+        return (self.get_kind(node), *(
+            self.to_tuple(child) for child in self.get_children(node)
+        ))
+
+
+class _ParsionTreeList:
+    """
+    A list being parsed, added to the tree when accepted by a rule
+    """
+    __slots__ = ('start', 'end', 'children')
+
+    start: int
+    end: int
+    children: List[int]
+
+    def __init__(self, start: int, end: int, children: List[int]):
+        self.start = start
+        self.end = end
+        self.children = children
+
+
+class ParsionTreeCursor:
+    """
+    Position in a ParsionTree, which can be moved between nodes
+
+    The cursor keeps the path from the node it was created at, so it can move
+    to the parent and siblings without the tree storing parent links.
+    """
+    __slots__ = ('tree', 'node', '_path')
+
+    tree: ParsionTree
+    node: int
+    _path: List[Tuple[int, int]]
+
+    def __init__(self, tree: ParsionTree, node: int):
+        self.tree = tree
+        self.node = node
+        self._path = []
+
+    @property
+    def kind(self) -> str:
+        return self.tree.kinds[self.tree.kind[self.node]]
+
+    @property
+    def rule(self) -> int:
+        return self.tree.rule[self.node]
+
+    @property
+    def start(self) -> int:
+        return self.tree.start[self.node]
+
+    @property
+    def end(self) -> int:
+        return self.tree.end[self.node]
+
+    @property
+    def value(self) -> Any:
+        return self.tree.values[self.node]
+
+    @property
+    def is_token(self) -> bool:
+        return self.tree.rule[self.node] == TOKEN
+
+    @property
+    def is_error(self) -> bool:
+        return self.tree.rule[self.node] == ERROR
+
+    @property
+    def child_count(self) -> int:
+        tree = self.tree
+        return tree.child_end[self.node] - tree.child_start[self.node]
+
+    def goto_first_child(self) -> bool:
+        if self.child_count == 0:
+            return False
+        self._path.append((self.node, 0))
+        self.node = self.tree.children[self.tree.child_start[self.node]]
+        return True
+
+    def goto_next_sibling(self) -> bool:
+        if len(self._path) == 0:
+            return False
+        parent, index = self._path[-1]
+        pos = self.tree.child_start[parent] + index + 1
+        if pos >= self.tree.child_end[parent]:
+            return False
+        self._path[-1] = (parent, index + 1)
+        self.node = self.tree.children[pos]
+        return True
+
+    def goto_parent(self) -> bool:
+        if len(self._path) == 0:
+            return False
+        self.node, _ = self._path.pop()
+        return True
@@ -0,0 +1,312 @@
+"""
+Lexer finding token boundaries with NumPy, for simple lexer rules
+
+A rule is simple if its regular expression is one group, matching either a
+single character of a set, one or more characters of a set, or one character
+of a set followed by any number of characters of another set. These are the
+usual rules for whitespace, numbers, names and punctuation. For such rules,
+the token starting at a position only depends on the character there, and
+ends at the first character not in the set of the rule. Both are found for
+all positions of the input at once, with lookup tables indexed by character.
+
+Tokens at positions where a rule that is not simple may match, at non-ASCII
+characters, or followed by a non-ASCII character that may be part of them, are
+matched by the regular expressions, so the tokens are the same as from
+ParsionLexer for any input.
+
+The tokens are collected as columns of start, end and rule, in NumPy arrays.
+Token objects are only created by tokenize, for the parser.
+
+Requires NumPy. Language classes select this lexer with VECTOR_LEXER, and use
+ParsionLexer if NumPy is not installed.
+"""
+import re
+from array import array
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple, \
+    Type
+
+import numpy as np
+import numpy.typing as npt
+
+from .lex import ParsionEndToken, ParsionLexer, ParsionLexerError, \
+    ParsionToken
+from .lexprofile import FirstSet, _ASCII, _class_first, _sre_parse, \
+    first_chars
+
+# Values of the first character table, besides rule indices
+_REGEX = -2
+_INVALID = -1
+
+# Index of all non-ASCII characters in the tables
+_NON_ASCII = 128
+
+
+def _char_set(item: Tuple[Any, Any]) -> Optional[FirstSet]:
+    """
+    Get the set of characters a regular expression item matches, if it
+    matches a single character
+    """
+    op, arg = item
+    if op is _sre_parse.LITERAL:
+        return _ASCII & {arg}, arg >= 128
+    if op is _sre_parse.IN:
+        return _class_first(arg)
+    return None
+
+
+def _repeated_set(item: Tuple[Any, Any], min_count: int
+                  ) -> Optional[FirstSet]:
+    """
+    Get the set of characters of a greedy, unbounded repetition of a single
+    character, with the given minimum count
+    """
+    op, arg = item
+    if op is not _sre_parse.MAX_REPEAT:
+        return None
+    low, high, pattern = arg
+    if low != min_count or high != _sre_parse.MAXREPEAT or len(pattern) != 1:
+        return None
+    return _char_set(pattern[0])
+
+
+def simple_rule(regexp: str) -> Optional[Tuple[FirstSet, FirstSet]]:
+    """
+    Get the sets of the first and following characters of a simple rule, or
+    None if the rule is not simple
+
+    >>> simple_rule(r'(;)')
+    ((frozenset({59}), False), (frozenset(), False))
+    >>> first, following = simple_rule(r'([a-z_][a-z0-9_]*)')
+    >>> len(first[0]), len(following[0])
+    (27, 37)
+    >>> simple_rule(r'(for)(?:[^a-z0-9_]|$)') is None
+    True
+    """
+    parsed = _sre_parse.parse(regexp)
+    if parsed.state.flags & ~re.UNICODE:
+        return None
+    if len(parsed.data) != 1 or parsed.data[0][0] is not _sre_parse.SUBPATTERN:
+        return None
+    group, add_flags, del_flags, items = parsed.data[0][1]
+    if group != 1 or add_flags != 0 or del_flags != 0:
+        return None
+
+    first: Optional[FirstSet]
+    following: Optional[FirstSet]
+    if len(items) == 1:
+        first = _char_set(items[0])
+        if first is not None:
+            return first, (frozenset(), False)
+        following = _repeated_set(items[0], 1)
+        if following is not None:
+            return following, following
+    elif len(items) == 2:
+        first = _char_set(items[0])
+        following = _repeated_set(items[1], 0)
+        if first is not None and following is not None:
+            return first, following
+    return None
+
+
+class ParsionTokenColumns:
+    """
+    Tokens of an input, as one array per attribute, in input order
+
+    Rule is the index of the lexer rule matching each token. Skipped input and
+    the end token are not included.
+    """
+    start: npt.NDArray[np.int64]
+    end: npt.NDArray[np.int64]
+    rule: npt.NDArray[np.int16]
+
+    def __init__(self,
+                 start: npt.NDArray[np.int64],
+                 end: npt.NDArray[np.int64],
+                 rule: npt.NDArray[np.int16]):
+        self.start = start
+        self.end = end
+        self.rule = rule
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+
+class ParsionVectorLexer(ParsionLexer):
+    """
+    Lexer producing the same tokens as ParsionLexer, with the boundaries of
+    tokens of simple rules found by NumPy
+
+    See the module documentation for which rules are simple.
+    """
+    # Rule of the token starting with each character, or _REGEX or _INVALID,
+    # and the set of following characters of that rule, or -1
+    first_rule: npt.NDArray[np.int16]
+    first_following: npt.NDArray[np.int16]
+
+    # Sets of following characters of the simple rules, and if each set may
+    # contain non-ASCII characters
+    following: List[npt.NDArray[np.bool_]]
+    following_non_ascii: List[bool]
+
+    def __init__(self,
+                 rules: List[Tuple[
+                     Optional[str],
+                     str,
+                     Callable[[str], Optional[Any]]
+                 ]]):
+        super().__init__(rules)
+        first_rule = [_INVALID] * (_NON_ASCII + 1)
+        first_following = [-1] * (_NON_ASCII + 1)
+        following_ids: Dict[FirstSet, int] = {}
+        self.following = []
+        self.following_non_ascii = []
+        for i, (_, regexp, _) in enumerate(rules):
+            simple = simple_rule(regexp)
+            if simple is None:
+                first = first_chars(regexp) or (_ASCII, True)
+                for c in first[0]:
+                    if first_rule[c] == _INVALID:
+                        first_rule[c] = _REGEX
+                continue
+
+            (first_set, _), following = simple
+            following_id = -1
+            if len(following[0]) > 0:
+                if following not in following_ids:
+                    following_ids[following] = len(self.following)
+                    table = np.zeros(_NON_ASCII + 1, dtype=np.bool_)
+                    table[sorted(following[0])] = True
+                    self.following.append(table)
+                    self.following_non_ascii.append(following[1])
+                following_id = following_ids[following]
+            for c in first_set:
+                if first_rule[c] == _INVALID:
+                    first_rule[c] = i
+                    first_following[c] = following_id
+
+        # Non-ASCII characters are always left to the regular expressions
+        first_rule[_NON_ASCII] = _REGEX
+        self.first_rule = np.array(first_rule, dtype=np.int16)
+        self.first_following = np.array(first_following, dtype=np.int16)
+
+    def _split(self, input: str
+               ) -> Tuple[npt.NDArray[np.int16],
+                          npt.NDArray[np.signedinteger[Any]]]:
+        """
+        Get the rule and end of the token starting at each position of the
+        input, if the token is of a simple rule
+        """
+        codes = np.frombuffer(input.encode('utf-32-le', 'surrogatepass'),
+                              dtype=np.uint32)
+        chars = np.empty(len(input) + 1, dtype=np.uint8)
+        np.minimum(codes, _NON_ASCII, out=chars[:-1], casting='unsafe')
+        chars[-1] = 0
+        del codes
+        rules = self.first_rule[chars[:-1]]
+        following = self.first_following[chars[:-1]]
+
+        # Tokens of single characters end at the next position. Other tokens
+        # end at the first position after the start with a character not in
+        # the set of following characters of the rule, or the end of input.
+        # Positions are stored in 32 bits where they fit, to save memory
+        index_type: Type[np.signedinteger[Any]] = \
+            np.int32 if len(input) < 2**31 else np.int64
+        ends = np.arange(1, len(input) + 1, dtype=index_type)
+        for following_id, table in enumerate(self.following):
+            started = following == following_id
+            if not started.any():
+                continue
+            breaks = np.arange(len(input) + 1, dtype=index_type)
+            breaks[table[chars]] = len(input)
+            breaks[-1] = len(input)
+            next_break = np.minimum.accumulate(breaks[::-1])[::-1]
+            ends[started] = next_break[1:][started]
+            if self.following_non_ascii[following_id]:
+                # Non-ASCII characters may continue the token, or not
+                uncertain = started & (chars[ends] == _NON_ASCII)
+                rules[uncertain] = _REGEX
+        return rules, ends
+
+    def _match(self, input: str, pos: int) -> Optional[Tuple[int, int, int]]:
+        """
+        Get the rule, start and end of the match of the first matching rule
+        at pos, as ParsionLexer.next_token, or None if no rule matches
+        """
+        for rule, (_, regexp, _) in enumerate(self.rules):
+            m = regexp.match(input, pos)
+            if m is not None:
+                return rule, m.start(1), m.end(1)
+        return None
+
+    def tokenize_columns(self, input: str) -> ParsionTokenColumns:
+        """
+        Split input into tokens, returned as columns
+
+        Raises ParsionLexerError at the same position as tokenize.
+        """
+        columns, error_pos = self._columns(input)
+        if error_pos is not None:
+            raise ParsionLexerError('Invalid input', input, error_pos)
+        return columns
+
+    def _columns(self, input: str
+                 ) -> Tuple[ParsionTokenColumns, Optional[int]]:
+        """
+        Get the tokens of input as columns, up to any invalid input, and the
+        position of the error for invalid input
+        """
+        split_rules, split_ends = self._split(input)
+        # Memoryviews of the arrays give the value at a position as an int,
+        # without converting the whole arrays to Python objects
+        rule_at = split_rules.data
+        end_at = split_ends.data
+        names = [name for name, _, _ in self.rules]
+
+        starts = array('q')
+        ends = array('q')
+        rules = array('h')
+        pos = 0
+        # End of the last token, where ParsionLexer reports errors
+        last_end = 0
+        error_pos = None
+        while pos < len(input):
+            rule = rule_at[pos]
+            if rule >= 0:
+                start = pos
+                end = end_at[pos]
+            else:
+                match = self._match(input, pos) if rule == _REGEX else None
+                if match is None:
+                    error_pos = last_end
+                    break
+                rule, start, end = match
+            if names[rule] is not None:
+                starts.append(start)
+                ends.append(end)
+                rules.append(rule)
+                last_end = end
+            pos = end
+        columns = ParsionTokenColumns(
+            np.frombuffer(starts, dtype=np.int64),
+            np.frombuffer(ends, dtype=np.int64),
+            np.frombuffer(rules, dtype=np.int16)
+        )
+        return columns, error_pos
+
+    def tokenize(self, input: str) -> Generator[ParsionToken, None, None]:
+        # Handlers are called in input order, before any lexer error is
+        # raised, as by ParsionLexer
+        columns, error_pos = self._columns(input)
+        token_rules = {
+            rule: (name, handler)
+            for rule, (name, _, handler) in enumerate(self.rules)
+            if name is not None
+        }
+        for start, end, rule in zip(columns.start.data,
+                                    columns.end.data,
+                                    columns.rule.data):
+            name, handler = token_rules[rule]
+            yield ParsionToken(name, handler(input[start:end]), start, end)
+        if error_pos is not None:
+            raise ParsionLexerError('Invalid input', input, error_pos)
+        yield ParsionEndToken(len(input))
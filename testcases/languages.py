@@ -0,0 +1,178 @@
+from types import ModuleType
+from typing import Any, List, Optional, Set
+from parsion import Parsion
+
+
+class ExprLang(Parsion):  # pragma: no cover
+    LEXER_RULES = [
+        (None,       r'(\s+)', lambda x: None),
+        ('INT',      r'([0-9]+|0x[0-9a-fA-F]+)', lambda x: int(x, base=0)),
+
+        ('+',        r'(\+)', lambda x: None),
+        ('-',        r'(-)', lambda x: None),
+        ('*',        r'(\*)', lambda x: None),
+        ('/',        r'(\/)', lambda x: None),
+
+        ('(',        r'([\(])', lambda x: None),
+        (')',        r'([\)])', lambda x: None),
+        (';',        r'(;)', lambda x: None)
+    ]
+    GRAMMAR_RULES = [
+        ('entry',         'entry',        'stmts'),
+        ('stmts_list',    'stmts',        'stmt _; stmts'),
+        ('stmts_tail',    'stmts',        'stmt'),
+
+        # proxy statement, to be able to isolate errors to top level
+        (None,            'stmt',         'expr'),
+        ('stmt_error',    'stmt',         '$ERROR'),
+
+        (None,            'expr',         'expr1'),
+        ('expr_add',      'expr1',        'expr1 _+ expr2'),
+        ('expr_sub',      'expr1',        'expr1 _- expr2'),
+        (None,            'expr1',        'expr2'),
+        ('expr_mult',     'expr2',        'expr2 _* expr3'),
+        ('expr_div',      'expr2',        'expr2 _/ expr3'),
+        (None,            'expr2',        'expr3'),
+        ('expr_neg',      'expr3',        '_- expr4'),
+        (None,            'expr3',        'expr4'),
+        ('expr_int',      'expr4',        'INT'),
+        (None,            'expr4',        '_( expr _)'),
+    ]
+
+    def stmts_list(self,
+                   expr: Optional[int],
+                   list: List[Optional[int]]
+                   ) -> List[Optional[int]]:
+        return [expr] + list
+
+    def stmts_tail(self,
+                   expr: Optional[int]
+                   ) -> List[Optional[int]]:
+        return [expr]
+
+    def expr_add(self, lhs: int, rhs: int) -> int:
+        return lhs + rhs
+
+    def expr_sub(self, lhs: int, rhs: int) -> int:
+        return lhs - rhs
+
+    def expr_mult(self, lhs: int, rhs: int) -> int:
+        return lhs * rhs
+
+    def expr_div(self, lhs: int, rhs: int) -> int:
+        return lhs // rhs
+
+    def expr_neg(self, v: int) -> int:
+        return -v
+
+    def expr_int(self, v: int) -> int:
+        return v
+
+
+class ExprLangErrorHandler(ExprLang):  # pragma: no cover
+    def stmt_error(self,
+                   gen: str,
+                   start: int,
+                   pos: int,
+                   end: int,
+                   expect: Set[str]) -> Any:
+        assert gen == 'stmt'
+        return None
+
+
+class ExprDefaultErrorHandler(ExprLang):  # pragma: no cover
+    def stmt_error(self,
+                   gen: str,
+                   start: int,
+                   pos: int,
+                   end: int,
+                   expect: Set[str]) -> Any:
+        # Pass error handler to default. Usually added directly
+        return self.default_error(gen, start, pos, end, expect)
+
+
+class EntryLang(ExprLangErrorHandler):
+    ENTRY_POINTS = ['expr', 'stmts']
+
+
+class PrecLang(Parsion):
+    LEXER_RULES = [
+        (None,       r'(\s+)', lambda x: None),
+        ('INT',      r'([0-9]+)', lambda x: int(x)),
+        ('==',       r'(==)', lambda x: None),
+        ('+',        r'(\+)', lambda x: None),
+        ('-',        r'(-)', lambda x: None),
+        ('*',        r'(\*)', lambda x: None),
+        ('/',        r'(\/)', lambda x: None),
+        ('^',        r'(\^)', lambda x: None),
+        ('(',        r'([\(])', lambda x: None),
+        (')',        r'([\)])', lambda x: None),
+    ]
+    PRECEDENCE = [
+        ('nonassoc',    '=='),
+        ('left',        '+ -'),
+        ('left',        '* /'),
+        ('right',       '^'),
+        ('right',       'NEG'),
+    ]
+    GRAMMAR_RULES = [
+        ('entry',       'entry',    'expr'),
+        ('expr_binop',  'expr',     'expr == expr'),
+        ('expr_binop',  'expr',     'expr + expr'),
+        ('expr_binop',  'expr',     'expr - expr'),
+        ('expr_binop',  'expr',     'expr * expr'),
+        ('expr_binop',  'expr',     'expr / expr'),
+        ('expr_binop',  'expr',     'expr ^ expr'),
+        ('expr_neg',    'expr',     '_- expr %prec NEG'),
+        (None,          'expr',     'INT'),
+        (None,          'expr',     '_( expr _)'),
+    ]
+
+    def expr_binop(self, lhs: Any, op: None, rhs: Any) -> Any:
+        # Operators are accepted, but their tokens have no value
+        return ('op', lhs, rhs)
+
+    def expr_neg(self, v: Any) -> Any:
+        return ('neg', v)
+
+
+class CallLang(Parsion):
+    LEXER_RULES = [
+        (None,       r'(\s+)', lambda x: None),
+        ('NAME',     r'([a-z]+)', lambda x: x),
+        ('INT',      r'([0-9]+)', lambda x: int(x)),
+        ('MINUS',    r'(-)', lambda x: None),
+        ('(',        r'(\()', lambda x: None),
+        (')',        r'(\))', lambda x: None),
+        (',',        r'(,)', lambda x: None),
+        (';',        r'(;)', lambda x: None),
+    ]
+    GRAMMAR_RULES = [
+        (None,          'entry',    'stmt*'),
+        (None,          'stmt',     'call _;'),
+        ('call',        'call',     'NAME _( arg*/, _)'),
+        ('arg',         'arg',      'MINUS? INT'),
+        ('arg_nested',  'arg',      'call'),
+        ('block',       'stmt',     '_( INT+ _)'),
+        ('block',       'stmt',     'INT+ _;'),
+    ]
+
+    def call(self, name: str, args: List[Any]) -> Any:
+        return (name, args)
+
+    def arg(self, neg: Optional[None], value: int) -> int:
+        # The accepted - token has the value None, as an absent optional
+        return value if neg is None else value
+
+    def arg_nested(self, call: Any) -> Any:
+        return call
+
+    def block(self, values: List[int]) -> Any:
+        return ('block', values)
+
+
+def load_static(source: str, path: str = 'static_lang.py') -> Any:
+    module = ModuleType('static_lang')
+    module.__file__ = path
+    exec(source, module.__dict__)
+    return module
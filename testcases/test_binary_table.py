@@ -0,0 +1,98 @@
+import struct
+from pathlib import Path
+import pytest
+from parsion import ParsionStatic, ParsionTableFormatError
+from parsion.binary import FORMAT_VERSION, _ARRAY_NAMES, dump_tables, \
+    load_tables
+from parsion.parsegen import ParsionFSM
+from parsion.table import ParsionCompressedTable
+from languages import ExprLang, ExprLangErrorHandler
+
+
+@pytest.fixture
+def table_file(tmp_path: Path) -> str:
+    path = tmp_path / 'expr.tables'
+    with open(path, 'wb') as f:
+        dump_tables(f, *ParsionFSM(ExprLang.GRAMMAR_RULES).export())
+    return str(path)
+
+
+def test_round_trip(table_file: str) -> None:
+    parse_grammar, parse_table, error_handlers = \
+        ParsionFSM(ExprLang.GRAMMAR_RULES).export()
+    loaded_grammar, loaded_table, loaded_handlers = load_tables(table_file)
+
+    assert loaded_grammar == parse_grammar
+    assert loaded_handlers == error_handlers
+    assert isinstance(loaded_table.check, memoryview)
+
+    # Lookups, including the default reductions, match the compressed table
+    compressed = ParsionCompressedTable(parse_table)
+    assert len(loaded_table) == len(compressed)
+    for loaded_row, row in zip(loaded_table, compressed):
+        assert dict(loaded_row) == dict(row)
+        for sym in compressed.symbols + ['unknown']:
+            assert (sym in loaded_row) == (sym in row)
+
+
+def test_static_table_file(table_file: str) -> None:
+    class StaticLang(ParsionStatic, ExprLangErrorHandler):
+        STATIC_TABLE_FILE = table_file
+
+    lang = StaticLang()
+    assert lang.parse('1 + 2 * 3; 4') == [7, 4]
+    assert lang.parse('3+ *; 43*4') == [None, 43 * 4]
+
+
+def test_format_errors(tmp_path: Path, table_file: str) -> None:
+    data = Path(table_file).read_bytes()
+    path = tmp_path / 'broken.tables'
+
+    path.write_bytes(b'')
+    with pytest.raises(ParsionTableFormatError, match='empty'):
+        load_tables(str(path))
+
+    path.write_bytes(b'XXXX' + data[4:])
+    with pytest.raises(ParsionTableFormatError, match='not a parse table'):
+        load_tables(str(path))
+
+    version = struct.pack('<i', FORMAT_VERSION + 1)
+    path.write_bytes(data[:4] + version + data[8:])
+    with pytest.raises(ParsionTableFormatError, match='version'):
+        load_tables(str(path))
+
+    for size in [6, 40, len(data) - 4]:
+        path.write_bytes(data[:size])
+        with pytest.raises(ParsionTableFormatError, match='truncated'):
+            load_tables(str(path))
+
+
+def _array_offset(data: bytes, name: str) -> int:
+    """
+    Get the offset of the first value of an array in a parse table file
+    """
+    length: int = struct.unpack_from('<i', data, 8)[0]
+    pos = 12 + length + (-length % 4)
+    for array_name in _ARRAY_NAMES:
+        if array_name == name:
+            return pos + 4
+        (count,) = struct.unpack_from('<i', data, pos)
+        pos += 4 + 4 * count
+    raise KeyError(name)  # pragma: no cover
+
+
+@pytest.mark.parametrize('name, string_id', [
+    ('symbols', 1000),
+    ('rule_gen', -1),
+    ('rule_goal', -2),
+    ('handler_name', 1000),
+])
+def test_invalid_string_id(tmp_path: Path, table_file: str,
+                           name: str, string_id: int) -> None:
+    data = Path(table_file).read_bytes()
+    offset = _array_offset(data, name)
+    data = data[:offset] + struct.pack('<i', string_id) + data[offset + 4:]
+    path = tmp_path / 'broken.tables'
+    path.write_bytes(data)
+    with pytest.raises(ParsionTableFormatError, match='invalid string id'):
+        load_tables(str(path))
@@ -0,0 +1,119 @@
+import threading
+from typing import List, Tuple
+import pytest
+from parsion import Parsion, ParsionStatic, ParsionLexer, ParsionParser
+from parsion.core import ParsionBase
+
+
+class IntLang(Parsion):
+    LEXER_RULES = [
+        (None,       r'(\s+)', lambda x: None),
+        ('INT',      r'([0-9]+)', lambda x: int(x))
+    ]
+    GRAMMAR_RULES = [
+        ('entry',         'entry',        'expr'),
+        ('expr_int',      'expr',         'INT'),
+        ('expr_int_expr', 'expr',         'INT expr')
+    ]
+
+    def expr_int(self, x: int) -> List[int]:
+        return [x]
+
+    def expr_int_expr(self, x: int, xs: List[int]) -> List[int]:
+        return [x] + xs
+
+
+def test_shared_between_instances() -> None:
+    class Lang(IntLang):
+        pass
+
+    first = Lang()
+    second = Lang()
+    assert first.lexer is second.lexer
+    assert first.parser is second.parser
+    assert first.parse_table is second.parse_table
+    assert second.parse('1 2 3') == [1, 2, 3]
+
+    # Subclasses may change the rules, and are compiled separately
+    class SubLang(Lang):
+        GRAMMAR_RULES = Lang.GRAMMAR_RULES[:2]
+
+    sub = SubLang()
+    assert sub.parser is not first.parser
+    assert sub.parse('1') == [1]
+
+
+def test_static_shared_between_instances() -> None:
+    class StaticLang(ParsionStatic):
+        LEXER_RULES = IntLang.LEXER_RULES
+        STATIC_GRAMMAR = [
+            ('$ENTRY', None, [True, False]),
+            ('entry', 'entry', [True]),
+            ('expr', 'expr_int', [True]),
+        ]
+        STATIC_TABLE = [
+            {'INT': ('s', 1), 'expr': ('s', 2), 'entry': ('s', 3)},
+            {'$END': ('r', 2)},
+            {'$END': ('r', 1)},
+            {'$END': ('s', 4)},
+            {}
+        ]
+
+        def expr_int(self, x: int) -> int:
+            return x
+
+    assert StaticLang().parser is StaticLang().parser
+    assert StaticLang().parse('12') == 12
+
+
+def test_self_check_once() -> None:
+    checks = []
+
+    class Lang(IntLang):
+        def _self_check(self) -> None:
+            checks.append(self)
+            super()._self_check()
+
+    Lang()
+    Lang()
+    assert len(checks) == 1
+
+    # The check is done for each class, as handlers may differ
+    class SubLang(Lang):
+        pass
+
+    SubLang()
+    assert len(checks) == 2
+
+
+def test_compile_once_in_threads() -> None:
+    compiles = []
+
+    class Lang(IntLang):
+        @classmethod
+        def _compile(cls) -> Tuple[ParsionLexer, ParsionParser]:
+            compiles.append(cls)
+            return super()._compile()
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(Lang().parse('1 2')))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert compiles == [Lang]
+    assert results == [[1, 2]] * 8
+
+
+def test_compile_required() -> None:
+    # ParsionBase is abstract, subclasses must implement _compile
+    class NoCompileLang(ParsionBase):
+        pass
+
+    lexer, parser = IntLang._get_compiled()
+    with pytest.raises(TypeError):
+        NoCompileLang(lexer, parser)  # type: ignore[abstract]
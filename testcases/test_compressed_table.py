@@ -0,0 +1,170 @@
+from typing import Any, List, Optional, Set
+import pytest
+from parsion import Parsion, ParsionStatic, ParsionParseError
+from parsion.parsegen import ParsionFSM
+from parsion.table import ParsionCompressedTable, memory_report
+
+
+class ExprLang(Parsion):
+    LEXER_RULES = [
+        (None,       r'(\s+)', lambda x: None),
+        ('INT',      r'([0-9]+|0x[0-9a-fA-F]+)', lambda x: int(x, base=0)),
+
+        ('+',        r'(\+)', lambda x: None),
+        ('-',        r'(-)', lambda x: None),
+        ('*',        r'(\*)', lambda x: None),
+        ('/',        r'(\/)', lambda x: None),
+
+        ('(',        r'([\(])', lambda x: None),
+        (')',        r'([\)])', lambda x: None),
+        (';',        r'(;)', lambda x: None)
+    ]
+    GRAMMAR_RULES = [
+        ('entry',         'entry',        'stmts'),
+        ('stmts_list',    'stmts',        'stmt _; stmts'),
+        ('stmts_tail',    'stmts',        'stmt'),
+
+        (None,            'stmt',         'expr'),
+        ('stmt_error',    'stmt',         '$ERROR'),
+
+        (None,            'expr',         'expr1'),
+        ('expr_add',      'expr1',        'expr1 _+ expr2'),
+        ('expr_sub',      'expr1',        'expr1 _- expr2'),
+        (None,            'expr1',        'expr2'),
+        ('expr_mult',     'expr2',        'expr2 _* expr3'),
+        ('expr_div',      'expr2',        'expr2 _/ expr3'),
+        (None,            'expr2',        'expr3'),
+        ('expr_neg',      'expr3',        '_- expr4'),
+        (None,            'expr3',        'expr4'),
+        ('expr_int',      'expr4',        'INT'),
+        (None,            'expr4',        '_( expr _)'),
+    ]
+
+    def stmts_list(self,
+                   expr: Optional[int],
+                   list: List[Optional[int]]
+                   ) -> List[Optional[int]]:
+        return [expr] + list
+
+    def stmts_tail(self,
+                   expr: Optional[int]
+                   ) -> List[Optional[int]]:
+        return [expr]
+
+    def expr_add(self, lhs: int, rhs: int) -> int:
+        return lhs + rhs
+
+    def expr_sub(self, lhs: int, rhs: int) -> int:
+        return lhs - rhs
+
+    def expr_mult(self, lhs: int, rhs: int) -> int:
+        return lhs * rhs
+
+    def expr_div(self, lhs: int, rhs: int) -> int:
+        return lhs // rhs
+
+    def expr_neg(self, v: int) -> int:
+        return -v
+
+    def expr_int(self, v: int) -> int:
+        return v
+
+    def stmt_error(self,
+                   gen: str,
+                   start: int,
+                   pos: int,
+                   end: int,
+                   expect: Set[str]) -> Any:
+        return None
+
+
+class CompressedExprLang(ExprLang):
+    COMPRESS_TABLE = True
+
+
+def test_compressed_lookup() -> None:
+    """
+    All explicit entries of the table are kept, or handled by the default
+    reduction of the state
+    """
+    _, table, _ = ParsionFSM(ExprLang.GRAMMAR_RULES).export()
+    compressed = ParsionCompressedTable(table)
+    assert len(compressed) == len(table)
+    assert compressed.row_count <= len(table)
+    for state, row in zip(table, compressed):
+        assert set(row.keys()) <= set(state.keys())
+        assert len(row) <= len(state)
+        for sym, action in state.items():
+            assert sym in row
+            assert row[sym] == action
+
+
+def test_compressed_parse() -> None:
+    lang = CompressedExprLang()
+    assert isinstance(lang.parse_table, ParsionCompressedTable)
+    assert lang.parse("(12+3)*4; 1+3; 43*-4-8/2") == \
+        [(12 + 3) * 4, 1 + 3, 43 * -4 - 8 // 2]
+
+
+def test_compressed_error_recovery() -> None:
+    lang = CompressedExprLang()
+    assert lang.parse("(12+3)*4; 3+ *; 43*4") == [(12 + 3) * 4, None, 43 * 4]
+
+
+def test_compressed_parse_error() -> None:
+    class NoRecoveryLang(CompressedExprLang):
+        GRAMMAR_RULES = [
+            rule for rule in ExprLang.GRAMMAR_RULES if rule[2] != '$ERROR'
+        ]
+
+    with pytest.raises(ParsionParseError) as e:
+        NoRecoveryLang().parse("1 + 2 )")
+    assert isinstance(e.value, ParsionParseError)
+    assert e.value.pos == 6
+    assert ')' not in e.value.expect
+
+
+def test_compressed_static() -> None:
+    class StaticLang(ParsionStatic):
+        LEXER_RULES = [
+            (None,       r'(\s+)', lambda x: None),
+            ('INT',      r'([0-9]+)', lambda x: int(x))
+        ]
+        STATIC_GRAMMAR = [
+            ('$ENTRY', None, [True, False]),
+            ('entry', 'entry', [True]),
+            ('expr', 'expr_int', [True]),
+            ('expr', 'expr_int_expr', [True, True])
+        ]
+        STATIC_TABLE = [
+            {'INT': ('s', 1), 'expr': ('s', 2), 'entry': ('s', 3)},
+            {'INT': ('s', 1), 'expr': ('s', 4), '$END': ('r', 2)},
+            {'$END': ('r', 1)},
+            {'$END': ('s', 5)},
+            {'$END': ('r', 3)},
+            {}
+        ]
+        COMPRESS_TABLE = True
+
+        def expr_int(self, x: int) -> List[int]:
+            return [x]
+
+        def expr_int_expr(self, x: int, xs: List[int]) -> List[int]:
+            return [x] + xs
+
+    assert StaticLang().parse('12 13 14') == [12, 13, 14]
+
+
+def test_compressed_slice() -> None:
+    _, table, _ = ParsionFSM(ExprLang.GRAMMAR_RULES).export()
+    compressed = ParsionCompressedTable(table)
+    assert [row.row for row in compressed[1:3]] == \
+        [compressed.state_rows[1], compressed.state_rows[2]]
+
+
+def test_memory_report() -> None:
+    _, table, _ = ParsionFSM(ExprLang.GRAMMAR_RULES).export()
+    report = memory_report(table)
+    assert report['states'] == len(table)
+    assert report['entries'] == sum(len(state) for state in table)
+    assert report['compressed_bytes'] < report['dict_bytes']
@@ -0,0 +1,74 @@
+import threading
+from typing import List
+import pytest
+from parsion import ParsionLexerError
+from languages import ExprLangErrorHandler
+
+
+INPUTS = [
+    f'{i} + {i} * 2; ({i} - 1) * 3; {i} / 2'
+    for i in range(200)
+]
+
+
+def expected(i: int) -> List[int]:
+    return [i + i * 2, (i - 1) * 3, i // 2]
+
+
+def test_parse_concurrent() -> None:
+    lang = ExprLangErrorHandler()
+    assert lang.parse_concurrent(INPUTS, max_workers=4) == \
+        [expected(i) for i in range(200)]
+
+
+def test_parse_concurrent_error() -> None:
+    with pytest.raises(ParsionLexerError):
+        ExprLangErrorHandler().parse_concurrent(['1 + 2', '1 + x', '3'],
+                                                max_workers=2)
+
+
+def test_handler_per_thread() -> None:
+    created = []
+    lock = threading.Lock()
+
+    class CountingLang(ExprLangErrorHandler):
+        """
+        Handlers with state, which can't be shared between threads
+        """
+        def __init__(self) -> None:
+            super().__init__()
+            self.thread = threading.get_ident()
+            with lock:
+                created.append(self)
+
+        def expr_int(self, v: int) -> int:
+            assert self.thread == threading.get_ident()
+            return v
+
+    lang = CountingLang()
+    results = lang.parse_concurrent(INPUTS, max_workers=4,
+                                    handler_factory=CountingLang)
+    assert results == [expected(i) for i in range(200)]
+    assert 1 < len(created) <= 5
+
+
+def test_shared_instance_in_threads() -> None:
+    """
+    One instance used directly from several threads at the same time
+    """
+    lang = ExprLangErrorHandler()
+    barrier = threading.Barrier(8)
+    errors = []
+
+    def worker(offset: int) -> None:
+        barrier.wait()
+        for i in range(offset, 200, 8):
+            if lang.parse(INPUTS[i]) != expected(i):  # pragma: no cover
+                errors.append(i)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
@@ -0,0 +1,116 @@
+from typing import Any
+import pytest
+from parsion import Parsion, ParsionGeneratorError, ParsionParseError
+from parsion.parsegen import ParsionFSM
+from parsion.static import export_static
+from languages import ExprLang, ExprLangErrorHandler, EntryLang, load_static
+
+
+class FastEntryLang(EntryLang):
+    TRACK_POSITIONS = False
+
+
+class CachedEntryLang(EntryLang):
+    PURE_HANDLERS = True
+    PARSE_CACHE_SIZE = 10
+
+
+def _parse_error(lang: Parsion, input: str, start: str) -> Any:
+    with pytest.raises(ParsionParseError) as e:
+        lang.parse(input, start=start)
+    return e.value.start, e.value.pos, e.value.end, e.value.expect
+
+
+@pytest.mark.parametrize('cls', [EntryLang, FastEntryLang])
+def test_parse(cls: Any) -> None:
+    lang = cls()
+    assert lang.parse('1+2; 3') == [3, 3]
+    assert lang.parse('1+2; 3', start='stmts') == [3, 3]
+    assert lang.parse('(1+2)*3', start='expr') == 9
+
+    # Error handlers are used from all entry points that reach them
+    assert lang.parse('1+ *; 3', start='stmts') == [None, 3]
+    assert _parse_error(lang, '1; 2', 'expr') == \
+        (0, 1, 2, {'$END', '+', '-', '*', '/'})
+    assert _parse_error(lang, '1+*', 'expr') == \
+        _parse_error(EntryLang(), '1+*', 'expr')
+
+    with pytest.raises(ValueError):
+        lang.parse('1', start='expr4')
+
+
+def test_start_states() -> None:
+    lang = EntryLang()
+    assert lang.parser.start_states == {'entry': 0, 'expr': 1, 'stmts': 2}
+    assert lang.parse_grammar[1:3] == [
+        ('$ENTRY', None, [True, False]),
+        ('$ENTRY', None, [True, False]),
+    ]
+    assert lang.parse_grammar[3:] == \
+        ExprLangErrorHandler().parse_grammar[1:]
+
+    # Without entry points, the table is unchanged
+    assert ParsionFSM(ExprLang.GRAMMAR_RULES, entry_points=[]).export() \
+        == ParsionFSM(ExprLang.GRAMMAR_RULES).export()
+
+    # The entry points share states, so one table is smaller than one table
+    # for each entry point
+    shared = len(lang.parse_table)
+    expr_only = len(ParsionFSM([
+        (None, 'entry', 'expr'),
+    ] + ExprLang.GRAMMAR_RULES[1:]).states)
+    assert shared < len(ExprLangErrorHandler().parse_table) + expr_only
+
+    # A base generator is only extended with the same entry points
+    base = ParsionFSM(ExprLang.GRAMMAR_RULES)
+    assert ParsionFSM(ExprLang.GRAMMAR_RULES, base=base,
+                      entry_points=['expr']).base is None
+
+
+def test_parse_tree() -> None:
+    tree = EntryLang().parse_tree('1 + 2', start='expr')
+    assert tree.to_tuple() == \
+        ('expr_add', ('expr_int', ('INT', 1)), ('expr_int', ('INT', 2)))
+
+
+def test_instrumentation() -> None:
+    lang = EntryLang()
+    instrumentation = lang.parser.enable_instrumentation()
+    try:
+        assert lang.parse('2*3', start='expr') == 6
+    finally:
+        lang.parser.disable_instrumentation()
+    assert instrumentation.parses == 1
+
+
+def test_parse_cache() -> None:
+    # Only results from entry are cached
+    lang = CachedEntryLang()
+    assert lang.parse('1+2') == [3]
+    assert lang.parse('1+2', start='expr') == 3
+    assert lang.parse('1+2') == [3]
+    assert lang.parse_cache is not None
+    assert (lang.parse_cache.hits, lang.parse_cache.misses) == (1, 1)
+
+
+def test_concurrent() -> None:
+    assert EntryLang().parse_concurrent(['1', '2*3'], 2, start='expr') == \
+        [1, 6]
+
+
+def test_static() -> None:
+    module = load_static(export_static(EntryLang))
+    lang = module.EntryLangStatic()
+    assert lang.parse('2*3', start='expr') == 6
+    assert lang.parse('1; 2', start='stmts') == [1, 2]
+
+
+@pytest.mark.parametrize('entry_points', [
+    ['expr5'],
+    ['$ENTRY'],
+    ['entry'],
+    ['expr', 'expr'],
+])
+def test_bad_entry_points(entry_points: Any) -> None:
+    with pytest.raises(ParsionGeneratorError):
+        ParsionFSM(ExprLang.GRAMMAR_RULES, entry_points=entry_points)
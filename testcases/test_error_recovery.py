@@ -1,95 +1,8 @@
-from typing import Any, List, Optional, Set
+from typing import Any, List, Set
 import pytest
 from parsion import Parsion, ParsionSelfCheckError, ParsionGeneratorError
-from parsion.exceptions import ParsionParseError
-
-
-class ExprLang(Parsion):  # pragma: no cover
-    LEXER_RULES = [
-        (None,       r'(\s+)', lambda x: None),
-        ('INT',      r'([0-9]+|0x[0-9a-fA-F]+)', lambda x: int(x, base=0)),
-
-        ('+',        r'(\+)', lambda x: None),
-        ('-',        r'(-)', lambda x: None),
-        ('*',        r'(\*)', lambda x: None),
-        ('/',        r'(\/)', lambda x: None),
-
-        ('(',        r'([\(])', lambda x: None),
-        (')',        r'([\)])', lambda x: None),
-        (';',        r'(;)', lambda x: None)
-    ]
-    GRAMMAR_RULES = [
-        ('entry',         'entry',        'stmts'),
-        ('stmts_list',    'stmts',        'stmt _; stmts'),
-        ('stmts_tail',    'stmts',        'stmt'),
-
-        # proxy statement, to be able to isolate errors to top level
-        (None,            'stmt',         'expr'),
-        ('stmt_error',    'stmt',         '$ERROR'),
-
-        (None,            'expr',         'expr1'),
-        ('expr_add',      'expr1',        'expr1 _+ expr2'),
-        ('expr_sub',      'expr1',        'expr1 _- expr2'),
-        (None,            'expr1',        'expr2'),
-        ('expr_mult',     'expr2',        'expr2 _* expr3'),
-        ('expr_div',      'expr2',        'expr2 _/ expr3'),
-        (None,            'expr2',        'expr3'),
-        ('expr_neg',      'expr3',        '_- expr4'),
-        (None,            'expr3',        'expr4'),
-        ('expr_int',      'expr4',        'INT'),
-        (None,            'expr4',        '_( expr _)'),
-    ]
-
-    def stmts_list(self,
-                   expr: Optional[int],
-                   list: List[Optional[int]]
-                   ) -> List[Optional[int]]:
-        return [expr] + list
-
-    def stmts_tail(self,
-                   expr: Optional[int]
-                   ) -> List[Optional[int]]:
-        return [expr]
-
-    def expr_add(self, lhs: int, rhs: int) -> int:
-        return lhs + rhs
-
-    def expr_sub(self, lhs: int, rhs: int) -> int:
-        return lhs - rhs
-
-    def expr_mult(self, lhs: int, rhs: int) -> int:
-        return lhs * rhs
-
-    def expr_div(self, lhs: int, rhs: int) -> int:
-        return lhs // rhs
-
-    def expr_neg(self, v: int) -> int:
-        return -v
-
-    def expr_int(self, v: int) -> int:
-        return v
-
-
-class ExprLangErrorHandler(ExprLang):  # pragma: no cover
-    def stmt_error(self,
-                   gen: str,
-                   start: int,
-                   pos: int,
-                   end: int,
-                   expect: Set[str]) -> Any:
-        assert gen == 'stmt'
-        return None
-
-
-class ExprDefaultErrorHandler(ExprLang):  # pragma: no cover
-    def stmt_error(self,
-                   gen: str,
-                   start: int,
-                   pos: int,
-                   end: int,
-                   expect: Set[str]) -> Any:
-        # Pass error handler to default. Usually added directly
-        return self.default_error(gen, start, pos, end, expect)
+from parsion.exceptions import ParsionParseError, ParsionRecoveryLimitError
+from languages import ExprLang, ExprLangErrorHandler, ExprDefaultErrorHandler
 
 
 def test_simple_parse() -> None:
@@ -150,3 +63,98 @@ def test_conflicing_error_handlers() -> None:
 
     with pytest.raises(ParsionGeneratorError):
         ConflictingErrorLang()
+
+
+def test_many_errors() -> None:
+    lang = ExprLangErrorHandler()
+    input = "1; 3 4 5 +; (2 *) + 1; " * 200 + "7"
+    assert lang.parse(input) == [1, None, None] * 200 + [7]
+
+
+def test_recover_in_statement() -> None:
+    """
+    A state completing a statement is not a recovery state for errors later
+    in the same statement
+    """
+    class StmtLang(Parsion):
+        LEXER_RULES = [
+            (None,        r'(\s+)', lambda x: None),
+            ('INT',       r'([0-9]+)', lambda x: int(x)),
+            ('+',         r'(\+)', lambda x: None),
+            (';',         r'(;)', lambda x: None)
+        ]
+        GRAMMAR_RULES = [
+            ('entry',         'entry',        'stmts'),
+            ('stmts_list',    'stmts',        'stmt _; stmts'),
+            ('stmts_tail',    'stmts',        'stmt'),
+            (None,            'stmt',         'expr'),
+            ('stmt_error',    'stmt',         '$ERROR'),
+            ('expr_add',      'expr',         'expr _+ INT'),
+            (None,            'expr',         'INT'),
+        ]
+
+        def stmts_list(self, stmt: Any, stmts: List[Any]) -> List[Any]:
+            return [stmt] + stmts
+
+        def stmts_tail(self, stmt: Any) -> List[Any]:
+            return [stmt]
+
+        def expr_add(self, lhs: int, rhs: int) -> int:
+            return lhs + rhs
+
+        def stmt_error(self, gen: str, start: int, pos: int, end: int,
+                       expect: Set[str]) -> None:
+            return None
+
+    result = StmtLang().parse('1 + + 2; 3; 4 + 5 5; 6 + 7')
+    assert result == [None, 3, None, 13]
+
+
+def test_recovery_limits() -> None:
+    class LimitedLang(ExprLangErrorHandler):
+        MAX_ERRORS = 2
+
+    input = "1 + +; 2; 3 4; (5 5; 6"
+    with pytest.raises(ParsionRecoveryLimitError) as e:
+        LimitedLang().parse(input)
+    assert isinstance(e.value, ParsionParseError)
+    assert [input[error.pos:error.end] for error in e.value.errors] == \
+        ['+', '4', '5']
+    assert e.value.pos == e.value.errors[-1].pos
+    assert LimitedLang().parse("1 + +; 2; 3 4") == [None, 2, None]
+
+    class SkipLimitedLang(ExprLangErrorHandler):
+        MAX_SKIPPED_TOKENS = 4
+
+    assert SkipLimitedLang().parse("1 2 3; 4 5 6") == [None, None]
+    with pytest.raises(ParsionRecoveryLimitError) as e:
+        SkipLimitedLang().parse("1 2 3; 4 5 6 7")
+    assert len(e.value.errors) == 2
+
+    class StateLimitedLang(ExprLangErrorHandler):
+        MAX_STATE_RECOVERIES = 1
+
+    # The first statement recovers in the start state, and the following in
+    # the state after ;
+    assert StateLimitedLang().parse("1 2; 3 4; 5") == [None, None, 5]
+    with pytest.raises(ParsionRecoveryLimitError):
+        StateLimitedLang().parse("1 2; 3 4; 5 6")
+
+
+def test_recovered_errors_not_created(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Errors that are recovered from are only created when a limit is reached
+    lang = ExprLangErrorHandler()
+    created: List[Any] = []
+    create_error = lang.parser._error
+
+    def counted_error(error: Any) -> ParsionParseError:
+        created.append(error)
+        return create_error(error)
+
+    monkeypatch.setattr(lang.parser, '_error', counted_error)
+    assert lang.parse("1 + +; 2; 3 4") == [None, 2, None]
+    assert created == []
+    with pytest.raises(ParsionParseError) as e:
+        lang.parse("1 + +; 2 +")
+    assert str(e.value.args[1]).startswith('Unexpected $END, expected ')
+    assert len(created) == 1
@@ -0,0 +1,84 @@
+from typing import Any
+import pytest
+from parsion import ParsionLexerError, ParsionParseError
+from languages import ExprLangErrorHandler, EntryLang, PrecLang
+
+OPERATORS = {'+', '-', '*', '/'}
+OPERANDS = {'INT', '(', '-'}
+
+
+class CompressedExprLang(ExprLangErrorHandler):
+    COMPRESS_TABLE = True
+
+
+def test_expected_at() -> None:
+    lang = EntryLang()
+    assert lang.expected_at('', 0) == OPERANDS
+    assert lang.expected_at('1 + 2', 0) == OPERANDS
+    assert lang.expected_at('1 + 2', 1) == OPERATORS | {';', '$END'}
+    assert lang.expected_at('1 + 2', 3) == OPERANDS
+    assert lang.expected_at('(1 + 2', 6) == OPERATORS | {')'}
+    assert lang.expected_at('1; 2', 1, start='expr') == \
+        OPERATORS | {'$END'}
+
+    # A token is only consumed if it ends at or before the offset
+    assert lang.expected_at('12 + 3', 1) == OPERANDS
+    assert lang.expected_at('1 + ', 4) == OPERANDS
+
+    # Errors before the offset are recovered from
+    assert lang.expected_at('1 + *; 2', 8) == OPERATORS | {';', '$END'}
+    with pytest.raises(ParsionParseError):
+        lang.expected_at('1 + *', 5)
+
+    # Text that can't be tokenized is only an error before the offset
+    assert lang.expected_at('1 + @', 3) == OPERANDS
+    assert lang.expected_at('1 + @', 4) == OPERANDS
+    assert lang.expected_at('1 +@', 3) == OPERANDS
+    with pytest.raises(ParsionLexerError):
+        lang.expected_at('1 + @', 5)
+    with pytest.raises(ParsionLexerError):
+        lang.expected_at('1 @ 2', 4)
+
+
+def test_reductions() -> None:
+    # Terminals with a reduce action are only expected if shifted after the
+    # reductions, also when the table uses default reductions
+    assert PrecLang().expected_at('1 == 2', 6) == \
+        {'+', '-', '*', '/', '^', '$END'}
+    lang = CompressedExprLang()
+    assert lang.expected_at('(1 + 2', 6) == {'+', '-', '*', '/', ')'}
+
+
+def test_continued() -> None:
+    lang = EntryLang()
+    input = '; '.join(str(i) for i in range(30))
+    assert lang.expected_at(input, 11) == OPERANDS
+    assert lang._expected_prefix is not None
+    stack = lang._expected_prefix[4]
+    assert lang.expected_at(input, 48) == OPERATORS | {';', '$END'}
+    assert lang._expected_prefix[4] is not stack
+
+    # Continued queries give the same results as queries from the start
+    for offset in range(49, len(input) + 1):
+        expected = lang.expected_at(input, offset)
+        assert EntryLang().expected_at(input, offset) == expected
+
+    # Queries before the last one, and other inputs, start over
+    assert lang.expected_at(input, 0) == OPERANDS
+    assert lang.expected_at('1 +', 3) == OPERANDS
+    assert lang.expected_at('1 +', 3, start='expr') == OPERANDS
+
+
+def test_raising_error_handler() -> None:
+    # Error handlers are not called, so recovery succeeds even where the
+    # handler stops parsing
+    class StrictLang(EntryLang):
+        def stmt_error(self, gen: str, start: int, pos: int, end: int,
+                       expect: Any) -> None:
+            raise ParsionParseError('Error in statement', start, pos, end,
+                                    expect)
+
+    lang = StrictLang()
+    with pytest.raises(ParsionParseError):
+        lang.parse('1 + *; 2')
+    assert lang.expected_at('1 + *; 2', 8) == OPERATORS | {';', '$END'}
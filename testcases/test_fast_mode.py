@@ -0,0 +1,65 @@
+from typing import Any
+import pytest
+from parsion import Parsion, ParsionParseError
+from languages import ExprLangErrorHandler, ExprDefaultErrorHandler, \
+    PrecLang, CallLang
+
+
+class FastExprLang(ExprLangErrorHandler):
+    TRACK_POSITIONS = False
+
+
+class FastDefaultErrorLang(ExprDefaultErrorHandler):
+    TRACK_POSITIONS = False
+
+
+class FastPrecLang(PrecLang):
+    TRACK_POSITIONS = False
+
+
+class FastCallLang(CallLang):
+    TRACK_POSITIONS = False
+
+
+def _parse_error(lang: Parsion, input: str) -> Any:
+    with pytest.raises(ParsionParseError) as e:
+        lang.parse(input)
+    return e.value.start, e.value.pos, e.value.end, e.value.expect
+
+
+def test_parse() -> None:
+    lang = FastExprLang()
+    assert not lang.parser.track_positions
+    assert ExprLangErrorHandler().parser.track_positions
+    assert lang.parse('(12+3)*4; 1+3; 43*4') == [(12 + 3) * 4, 1 + 3, 43 * 4]
+
+    assert FastPrecLang().parse('-1 - 2 * 3') == \
+        PrecLang().parse('-1 - 2 * 3')
+    assert FastCallLang().parse('f(1, g(), -3); (4 5) 6;') == \
+        CallLang().parse('f(1, g(), -3); (4 5) 6;')
+
+
+@pytest.mark.parametrize('lang, fast_lang, input', [
+    (PrecLang(), FastPrecLang(), '1 + (2 * 3 4'),
+    (PrecLang(), FastPrecLang(), '1 == 2 == 3'),
+    (CallLang(), FastCallLang(), 'f(1); g(h(), 2,);'),
+    (CallLang(), FastCallLang(), 'f() 1;'),
+    (ExprDefaultErrorHandler(), FastDefaultErrorLang(),
+     '(12+3)*4; 3+ *; 43*4'),
+])
+def test_errors(lang: Parsion, fast_lang: Parsion, input: str) -> None:
+    # Positions are reconstructed when an error is found
+    assert _parse_error(fast_lang, input) == _parse_error(lang, input)
+
+
+def test_recovery() -> None:
+    # Parsing continues with positions after the first error
+    lang = FastExprLang()
+    assert lang.parse('(12+3)*4; 3+ *; 43*4; 1 2; 5') == \
+        [(12 + 3) * 4, None, 43 * 4, None, 5]
+
+
+def test_parse_tree() -> None:
+    tree = FastCallLang().parse_tree('f(1, 2);')
+    assert tree.to_tuple() == CallLang().parse_tree('f(1, 2);').to_tuple()
+    assert (tree.start[tree.root], tree.end[tree.root]) == (0, 8)
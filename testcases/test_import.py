@@ -0,0 +1,86 @@
+import subprocess
+import sys
+import pytest
+import parsion
+
+
+def test_lazy_attribute() -> None:
+    from parsion.table import ParsionCompressedTable
+    assert parsion.ParsionCompressedTable is ParsionCompressedTable
+    from parsion.tree import ParsionTree
+    assert parsion.ParsionTree is ParsionTree
+
+    with pytest.raises(AttributeError):
+        parsion.NoSuchName
+
+
+def test_static_language_imports() -> None:
+    """
+    A static language shouldn't load the generator or typing
+    """
+    script = '''
+import sys
+from parsion import ParsionStatic
+
+
+class StaticLang(ParsionStatic):
+    LEXER_RULES = [
+        ('INT', r'([0-9]+)', lambda x: int(x)),
+    ]
+    STATIC_SELF_CHECKED = True
+    STATIC_GRAMMAR = [
+        ('$ENTRY', None, [True, False]),
+        ('entry', 'entry', [True]),
+        ('expr', None, [True]),
+    ]
+    STATIC_TABLE = [
+        {'INT': ('s', 1), 'expr': ('s', 2), 'entry': ('s', 3)},
+        {'$END': ('r', 2)},
+        {'$END': ('r', 1)},
+        {'$END': ('s', 4)},
+        {}
+    ]
+
+    def entry(self, v):
+        return v
+
+
+assert StaticLang().parse('12') == 12
+print(' '.join(sorted(
+    name for name in ('typing', 'dataclasses', 'inspect',
+                      'concurrent.futures', 'parsion.parsegen',
+                      'parsion.table', 'parsion.tree', 'parsion.self_check')
+    if name in sys.modules
+)))
+'''
+    result = subprocess.run(
+        [sys.executable, '-c', script],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    assert result.stdout.strip() == ''
+
+
+def test_star_import() -> None:
+    """
+    A star import shouldn't load the parts loaded on first use, or need
+    NumPy
+    """
+    script = '''
+import sys
+sys.modules['numpy'] = None
+from parsion import *
+print(' '.join(sorted(
+    name for name in ('parsion.table', 'parsion.tree', 'parsion.instrument',
+                      'parsion.veclex')
+    if name in sys.modules
+)))
+'''
+    result = subprocess.run(
+        [sys.executable, '-c', script],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    assert result.stdout.strip() == ''
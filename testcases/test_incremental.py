@@ -0,0 +1,168 @@
+from typing import Any, List, Optional
+from parsion import Parsion
+from parsion.parsegen import ParsionFSM
+
+
+def _keyword(word: str) -> str:
+    return f'({word})(?:[^a-z0-9_]|$)'
+
+
+class BaseLang(Parsion):
+    KEEP_GENERATOR = True
+    LEXER_RULES = [
+        (None,       r'(\s+)', lambda x: None),
+        ('NAME',     r'([a-z_][a-z0-9_]*)', lambda x: x),
+        ('INT',      r'([0-9]+)', lambda x: int(x)),
+        ('==',       r'(==)', lambda x: x),
+        ('=',        r'(=)', lambda x: None),
+        ('+',        r'(\+)', lambda x: x),
+        ('(',        r'(\()', lambda x: None),
+        (')',        r'(\))', lambda x: None),
+        (',',        r'(,)', lambda x: None),
+        (';',        r'(;)', lambda x: None),
+    ]
+    PRECEDENCE = [
+        ('nonassoc',    '=='),
+        ('left',        '+'),
+    ]
+    GRAMMAR_RULES = [
+        ('entry',       'entry',    'stmts'),
+        ('stmts_list',  'stmts',    'stmts stmt'),
+        ('stmts_first', 'stmts',    'stmt'),
+        ('assign',      'stmt',     'NAME _= expr _;'),
+        (None,          'expr',     'value'),
+        ('expr_error',  'expr',     '$ERROR'),
+        ('binop',       'value',    'value == value'),
+        ('binop',       'value',    'value + value'),
+        ('var',         'value',    'NAME'),
+        (None,          'value',    'INT'),
+        (None,          'value',    '_( expr _)'),
+    ]
+
+    def stmts_list(self, stmts: List[Any], stmt: Any) -> List[Any]:
+        return stmts + [stmt]
+
+    def stmts_first(self, stmt: Any) -> List[Any]:
+        return [stmt]
+
+    def assign(self, name: str, value: Any) -> Any:
+        return ('=', name, value)
+
+    def expr_error(self, gen: str, start: int, pos: int, end: int,
+                   expect: Any) -> None:
+        return None
+
+    def binop(self, lhs: Any, op: str, rhs: Any) -> Any:
+        return (op, lhs, rhs)
+
+    def var(self, name: str) -> Any:
+        return ('var', name)
+
+
+class PrintLang(BaseLang):
+    LEXER_RULES = [
+        ('PRINT',    _keyword('print'), lambda x: None),
+    ] + BaseLang.LEXER_RULES
+    GRAMMAR_RULES = BaseLang.GRAMMAR_RULES + [
+        ('print',       'stmt',     '_PRINT expr _;'),
+    ]
+
+    def print(self, value: Any) -> Any:
+        return ('print', value)
+
+
+class PrintListLang(BaseLang):
+    LEXER_RULES = PrintLang.LEXER_RULES
+    GRAMMAR_RULES = BaseLang.GRAMMAR_RULES + [
+        ('print',       'stmt',     '_PRINT expr*/, _;'),
+    ]
+
+    def print(self, values: List[Any]) -> Any:
+        return ('print', values)
+
+
+class CallLang(BaseLang):
+    GRAMMAR_RULES = BaseLang.GRAMMAR_RULES + [
+        ('call',        'value',    'NAME _( expr _)'),
+    ]
+
+    def call(self, name: str, arg: Any) -> Any:
+        return ('call', name, arg)
+
+
+class ReorderedLang(BaseLang):
+    GRAMMAR_RULES = BaseLang.GRAMMAR_RULES[::-1]
+
+
+class AssocLang(PrintLang):
+    KEEP_GENERATOR = False
+    PRECEDENCE = [
+        ('left',        '== +'),
+    ]
+
+
+def _scratch(cls: Any) -> ParsionFSM:
+    return ParsionFSM(cls.GRAMMAR_RULES, precedence=cls.PRECEDENCE)
+
+
+def test_extend_base() -> None:
+    # The base is compiled when needed by the subclass
+    lang = PrintLang()
+    generator = PrintLang._generator
+    assert generator.base is BaseLang._generator
+    assert generator.base_states > 0
+    assert generator.export() == _scratch(PrintLang).export()
+
+    input = 'a = 1 + 2; print a == 3; print (1 + + 2); b = 4 == 4;'
+    assert lang.parse(input) == [
+        ('=', 'a', ('+', 1, 2)),
+        ('print', ('==', ('var', 'a'), 3)),
+        ('print', None),
+        ('=', 'b', ('==', 4, 4)),
+    ]
+    assert BaseLang().parse('a = (1 == 2) + 3;') == [
+        ('=', 'a', ('+', ('==', 1, 2), 3)),
+    ]
+
+
+def test_extend_base_twice() -> None:
+    # Classes extending the same base share its item pool, but add their own
+    # rules with the same ids
+    lang = CallLang()
+    assert CallLang._generator.pool is PrintLang._generator.pool
+    assert CallLang._generator.grammar[-1].id == \
+        PrintLang._generator.grammar[-1].id
+    assert CallLang._generator.export() == _scratch(CallLang).export()
+    assert lang.parse('a = f(1 + 2);') == [
+        ('=', 'a', ('call', 'f', ('+', 1, 2))),
+    ]
+    assert PrintLang().parse('print 1 == 2;') == [('print', ('==', 1, 2))]
+
+
+def test_changed_precedence() -> None:
+    # States are not copied from a base with other precedence
+    generator = AssocLang._create_fsm()
+    assert generator.base is PrintLang._generator
+    assert generator.base_states == 0
+    assert generator.export() == _scratch(AssocLang).export()
+    assert AssocLang().parse('print 1 == 2 == 3;') == \
+        [('print', ('==', ('==', 1, 2), 3))]
+
+
+def test_not_extended() -> None:
+    assert ReorderedLang._create_fsm().base is None
+
+    # Rules that make more symbols nullable change the shared rules
+    assert PrintListLang._create_fsm().base is None
+    assert PrintListLang().parse('print; print 1, 2;') == [
+        ('print', []),
+        ('print', [1, 2]),
+    ]
+
+
+def test_generator_stats() -> None:
+    base: Optional[ParsionFSM] = BaseLang._generator
+    assert base is not None
+    assert base.stats()['base_states'] == 0
+    assert PrintLang._generator.stats()['base_states'] == \
+        PrintLang._generator.base_states
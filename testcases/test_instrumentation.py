@@ -0,0 +1,92 @@
+import json
+import parsion
+from parsion.instrument import ParsionInstrumentation
+from languages import ExprLangErrorHandler
+
+
+class InstrumentedLang(ExprLangErrorHandler):
+    pass
+
+
+def test_instrumentation() -> None:
+    lang = InstrumentedLang()
+    instrumentation = lang.parser.enable_instrumentation()
+    assert isinstance(instrumentation, ParsionInstrumentation)
+    assert getattr(parsion, 'ParsionInstrumentation') is \
+        ParsionInstrumentation
+    assert lang.parser.enable_instrumentation() is instrumentation
+
+    assert lang.parse('1 + 2*3; 3+ *; 4') == [7, None, 4]
+    stats = instrumentation.snapshot()
+    assert stats['parses'] == 1
+    assert stats['recoveries'] == {'stmt_error': 1}
+    assert set(stats['handler_time']) == {
+        'entry', 'stmts_list', 'stmts_tail', 'stmt_error', 'expr_add',
+        'expr_mult', 'expr_int'
+    } - {'stmt_error'}
+
+    rules = {
+        lang.parse_grammar[id][1]: count
+        for id, count in stats['reduces'].items()
+    }
+    assert rules['expr_int'] == 5
+    assert rules['stmts_list'] == 2
+    # Tokens are counted as shifts, and states entered after a reduction or
+    # a recovery are counted as gotos
+    assert sum(stats['shifts'].values()) == 11
+    assert sum(stats['gotos'].values()) == \
+        sum(stats['reduces'].values()) + 1
+
+    # All counts are kept in the snapshot, and it can be exported
+    json.dumps(stats)
+    lang.parse('1')
+    assert stats['parses'] == 1
+    assert instrumentation.snapshot()['parses'] == 2
+
+    # The wrapped table has the same content as the table of the parser
+    row = instrumentation.parse_table[0]
+    assert len(row) == len(lang.parse_table[0])
+    assert list(row) == list(lang.parse_table[0])
+
+    instrumentation.reset()
+    assert instrumentation.snapshot() == {
+        'parses': 0,
+        'shifts': {},
+        'gotos': {},
+        'reduces': {},
+        'handler_time': {},
+        'recoveries': {}
+    }
+
+
+def test_disable_instrumentation() -> None:
+    lang = InstrumentedLang()
+    instrumentation = lang.parser.enable_instrumentation()
+    lang.parser.disable_instrumentation()
+    assert lang.parse('1 + 2') == [3]
+    assert instrumentation.parses == 0
+    assert lang.parser.instrumentation is None
+
+    # Instrumentation is per class, the parser is not shared with the base
+    assert ExprLangErrorHandler().parser.instrumentation is None
+
+
+class SharedLang(ExprLangErrorHandler):
+    pass
+
+
+def test_instrumentation_class_wide() -> None:
+    lang = SharedLang()
+    instrumentation = lang.parser.enable_instrumentation()
+
+    # The parser is shared by all instances of the class, so parses of other
+    # instances, and of other threads, are counted too
+    other = SharedLang()
+    assert other.parser.instrumentation is instrumentation
+    assert other.parse('1') == [1]
+    assert other.parse_concurrent(['2', '3', '4'], max_workers=2) == \
+        [[2], [3], [4]]
+    assert instrumentation.parses == 4
+
+    other.parser.disable_instrumentation()
+    assert lang.parser.instrumentation is None
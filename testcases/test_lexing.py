@@ -39,3 +39,11 @@ def test_invalid_token() -> None:
     lang = ExprLang()
     with pytest.raises(ParsionLexerError):
         list(lang.lexer.tokenize('( 1+3 ) invalid'))
+
+
+def test_trailing_skipped_input() -> None:
+    lang = ExprLang()
+    raw_tokens = list(lang.lexer.tokenize(' 1 + 2 '))
+    assert [(tok.name, tok.start) for tok in raw_tokens] == \
+        [('INT', 1), ('+', 3), ('INT', 5), ('$END', 7)]
+    assert [tok.name for tok in lang.lexer.tokenize('  ')] == ['$END']
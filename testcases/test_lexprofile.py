@@ -0,0 +1,95 @@
+import pytest
+from parsion import Parsion, ParsionLexer, ParsionLexerError
+from parsion.lexprofile import first_chars, main, profile_lexer, \
+    reorder_rules, rules_may_overlap
+
+
+class KeywordLang(Parsion):
+    LEXER_RULES = [
+        ('IF',       r'(if)(?:[^a-z0-9_]|$)', lambda x: None),
+        ('NAME',     r'([a-z_][a-z0-9_]*)', lambda x: x),
+        ('STR',      r'("(?:[^"\\]|\\.)*")', lambda x: x[1:-1]),
+        ('=',        r'(=)', lambda x: None),
+        (';',        r'(;)', lambda x: None),
+        ('INT',      r'([0-9]+)', lambda x: int(x)),
+        (None,       r'(\s+)', lambda x: None),
+        ('CHAR',     r'(.)', lambda x: x),
+    ]
+
+
+CORPUS = [
+    'a = 1; b = 22; if c = "x"; d = 3 4 5 6 7;',
+    'if if_x = 12 13 14 15 ?',
+]
+
+
+def tokens(lexer: ParsionLexer, input: str) -> list:  # type: ignore[type-arg]
+    return [(tok.name, tok.value, tok.start) for tok in lexer.tokenize(input)]
+
+
+def test_first_chars() -> None:
+    assert first_chars(r'(a)') == (frozenset({97}), False)
+    assert first_chars(r'(å)') == (frozenset(), True)
+    assert first_chars(r'([^a])') == (frozenset(range(128)) - {97}, True)
+    assert first_chars(r'([^ab])') == (frozenset(range(128)) - {97, 98}, True)
+    assert first_chars(r'(?:xy|[a-cå-ÿ])') == \
+        (frozenset({120, 97, 98, 99}), True)
+    assert first_chars(r'(?:xy|z?)a') == (frozenset({120, 122, 97}), False)
+    assert first_chars(r'(\d+?)') == (frozenset(range(48, 58)), True)
+    assert first_chars(r'(?=a)b') == (frozenset({98}), False)
+    assert first_chars(r'\ba') == (frozenset({97}), False)
+
+    assert first_chars(r'(.)') == (frozenset(range(128)), True)
+    assert first_chars(r'(a)\1') == (frozenset({97}), False)
+    assert first_chars(r'(?i)a') is None
+    assert first_chars(r'(?i:a)') is None
+    assert first_chars(r'(a?)\1') is None
+    assert first_chars(r'([\d\w])') == first_chars(r'(\w)')
+    assert first_chars(r'(a|)') is None
+
+
+def test_overlap() -> None:
+    rules = KeywordLang.LEXER_RULES
+    assert rules_may_overlap(rules[0][1], rules[1][1])
+    assert not rules_may_overlap(rules[1][1], rules[5][1])
+    assert not rules_may_overlap(r'([a])', r'([^a])')
+    assert rules_may_overlap(r'(å)', r'([^a])')
+    assert rules_may_overlap(r'(\W)', r'([å])')
+
+
+def test_profile_and_reorder() -> None:
+    lexer = ParsionLexer(KeywordLang.LEXER_RULES)
+    profile = profile_lexer(lexer, CORPUS)
+    assert profile.names[0] == 'IF'
+    assert profile.hits[0] == 2
+    assert profile.attempts[0] == sum(profile.hits)
+    assert 'NAME' in profile.format()
+
+    rules = reorder_rules(KeywordLang.LEXER_RULES, profile.hits)
+    names = [name for name, _, _ in rules]
+    # Keywords stay before names, and the catch all rule stays last
+    assert names.index('IF') < names.index('NAME')
+    assert names[-1] == 'CHAR'
+    assert names[0] is None
+
+    reordered = ParsionLexer(rules)
+    assert profile_lexer(reordered, CORPUS).total_attempts < \
+        profile.total_attempts
+    for input in CORPUS:
+        assert tokens(reordered, input) == tokens(lexer, input)
+
+    with pytest.raises(ParsionLexerError):
+        profile_lexer(ParsionLexer(rules[:-1]), ['?'])
+
+
+def test_cli(tmp_path: pytest.TempPathFactory,
+             capsys: pytest.CaptureFixture[str]) -> None:
+    file = tmp_path / 'input.txt'  # type: ignore[operator]
+    file.write_text(CORPUS[0])
+    assert main(['testcases.test_lexprofile:KeywordLang', str(file)]) == 0
+    out = capsys.readouterr().out
+    assert 'Suggested order' in out
+    assert "('CHAR', '(.)', ...)" in out
+
+    with pytest.raises(SystemExit):
+        main(['testcases.test_lexprofile:NoSuchLang', str(file)])
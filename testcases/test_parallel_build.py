@@ -0,0 +1,68 @@
+from typing import List, Optional, Tuple
+import pytest
+from parsion import Parsion, ParsionGeneratorError
+from parsion.parsegen import ParsionFSM, _init_worker, _worker_gen_follows
+
+
+GRAMMAR_RULES: List[Tuple[Optional[str], str, str]] = [
+    ('entry',         'entry',        'stmts'),
+    ('stmts_list',    'stmts',        'stmt _; stmts'),
+    ('stmts_tail',    'stmts',        'stmt'),
+    (None,            'stmt',         'expr'),
+    ('stmt_error',    'stmt',         '$ERROR'),
+    ('expr_add',      'expr',         'expr _+ term'),
+    (None,            'expr',         'term'),
+    ('term_mult',     'term',         'term _* atom'),
+    (None,            'term',         'atom'),
+    ('atom_int',      'atom',         'INT'),
+    (None,            'atom',         '_( expr _)'),
+]
+
+
+def test_parallel_same_tables() -> None:
+    serial = ParsionFSM(GRAMMAR_RULES)
+    parallel = ParsionFSM(GRAMMAR_RULES, processes=2)
+    assert parallel.export() == serial.export()
+
+
+def test_parallel_conflict() -> None:
+    with pytest.raises(ParsionGeneratorError):
+        ParsionFSM([
+            (None,          'entry',        'expr'),
+            ('op_A',        'expr',         'expr A expr'),
+            ('lit_C',       'expr',         'C'),
+        ], processes=2)
+
+
+def test_worker_follows() -> None:
+    """
+    Run the worker side in this process, to verify it calculates the same
+    follow sets as the generator itself
+    """
+    fsm = ParsionFSM(GRAMMAR_RULES)
+    _init_worker(GRAMMAR_RULES)
+    for state in fsm.states:
+        for kernel in state.transitions().values():
+            requests = fsm._get_closure_requests(kernel)
+            assert _worker_gen_follows(requests) == \
+                fsm._get_gen_follows(requests)
+
+
+def test_parallel_parsion() -> None:
+    class ParallelLang(Parsion):
+        LEXER_RULES = [
+            (None,       r'(\s+)', lambda x: None),
+            ('INT',      r'([0-9]+)', lambda x: int(x)),
+            ('+',        r'(\+)', lambda x: None),
+        ]
+        GRAMMAR_RULES = [
+            ('entry',       'entry',        'expr'),
+            ('expr_add',    'expr',         'expr _+ INT'),
+            (None,          'expr',         'INT'),
+        ]
+        GENERATOR_PROCESSES = 2
+
+        def expr_add(self, lhs: int, rhs: int) -> int:
+            return lhs + rhs
+
+    assert ParallelLang().parse('1 + 2 + 3') == 6
@@ -0,0 +1,139 @@
+import sys
+from typing import Any, List
+import pytest
+from parsion import ParsionLexerError, ParsionSelfCheckError
+from languages import ExprLangErrorHandler
+
+
+class CachedLang(ExprLangErrorHandler):
+    PURE_HANDLERS = True
+    PARSE_CACHE_SIZE = 3
+
+
+def test_cache_disabled() -> None:
+    assert ExprLangErrorHandler().parse_cache is None
+
+
+def test_requires_pure_handlers() -> None:
+    class ImpureLang(ExprLangErrorHandler):
+        PARSE_CACHE_SIZE = 10
+
+    with pytest.raises(ParsionSelfCheckError):
+        ImpureLang()
+
+
+def test_cache_hits() -> None:
+    parsed: List[int] = []
+
+    class CountingLang(CachedLang):
+        def expr_int(self, v: int) -> int:
+            parsed.append(v)
+            return v
+
+    lang = CountingLang()
+    assert lang.parse('1 + 2') == [3]
+    assert lang.parse('1 + 2') == [3]
+    assert lang.parse('1 + 2') is lang.parse('1 + 2')
+    assert parsed == [1, 2]
+
+    cache = lang.parse_cache
+    assert cache is not None
+    assert (cache.hits, cache.misses, len(cache)) == (3, 1, 1)
+
+    # Errors are not cached
+    for _ in range(2):
+        with pytest.raises(ParsionLexerError):
+            lang.parse('1 + x')
+    assert (cache.misses, len(cache)) == (3, 1)
+
+
+def test_cache_eviction() -> None:
+    lang = CachedLang()
+    cache = lang.parse_cache
+    assert cache is not None
+
+    for i in range(5):
+        lang.parse(f'{i}')
+    assert len(cache) == 3
+
+    # Least recently used is evicted first
+    lang.parse('2')
+    lang.parse('5')
+    assert list(cache._entries) == ['4', '2', '5']
+
+    # Sizes are only measured with a byte limit
+    assert cache.bytes == 0
+
+
+def _entry_size(lang: ExprLangErrorHandler, input: str, result: Any) -> int:
+    return sys.getsizeof(input) + lang.parse_result_size(result)
+
+
+def test_cache_bytes() -> None:
+    class SmallCacheLang(CachedLang):
+        PARSE_CACHE_SIZE = 100
+        PARSE_CACHE_BYTES = 3 * _entry_size(ExprLangErrorHandler(), '1', [1])
+
+    lang = SmallCacheLang()
+    cache = lang.parse_cache
+    assert cache is not None
+
+    for i in range(1, 6):
+        lang.parse(f'{i}')
+    assert len(cache) == 3
+    assert cache.bytes == SmallCacheLang.PARSE_CACHE_BYTES
+
+    # Too big to be cached at all
+    assert lang.parse(' + '.join(['1'] * 100)) == [100]
+    assert len(cache) == 3
+    assert list(cache._entries) == ['3', '4', '5']
+
+
+def test_cache_result_bytes() -> None:
+    # Results are counted, not only inputs
+    class ResultSizeLang(CachedLang):
+        PARSE_CACHE_BYTES = 1000
+
+        def parse_result_size(self, result: Any) -> int:
+            return 600 * len(result)
+
+    lang = ResultSizeLang()
+    cache = lang.parse_cache
+    assert cache is not None
+
+    lang.parse('1; 2')
+    assert len(cache) == 0
+    lang.parse('1')
+    lang.parse('2')
+    assert list(cache._entries) == ['2']
+    assert cache.bytes == _entry_size(lang, '2', [2])
+
+
+def test_cache_invalidate() -> None:
+    class LimitedLang(CachedLang):
+        PARSE_CACHE_BYTES = 10000
+
+    lang = LimitedLang()
+    cache = lang.parse_cache
+    assert cache is not None
+
+    lang.parse('1')
+    lang.parse('2')
+    cache.invalidate('1')
+    cache.invalidate('3')
+    assert list(cache._entries) == ['2']
+    assert cache.bytes == _entry_size(lang, '2', [2])
+
+    cache.invalidate()
+    assert (len(cache), cache.bytes) == (0, 0)
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_parse_concurrent_cached() -> None:
+    lang = CachedLang()
+    cache = lang.parse_cache
+    assert cache is not None
+
+    assert lang.parse_concurrent(['1', '2', '1', '1'], max_workers=1) == \
+        [[1], [2], [1], [1]]
+    assert (cache.hits, cache.misses) == (2, 2)
@@ -0,0 +1,86 @@
+from parsion.tree import TOKEN
+from languages import ExprLangErrorHandler
+
+
+def test_parse_tree() -> None:
+    tree = ExprLangErrorHandler().parse_tree('1 + 2*3; (4)')
+    # Tokens not accepted by any rule are not stored
+    assert len(tree) == 13
+    assert tree.to_tuple() == (
+        'entry',
+        ('stmts_list',
+            ('expr_add',
+                ('expr_int', ('INT', 1)),
+                ('expr_mult',
+                    ('expr_int', ('INT', 2)),
+                    ('expr_int', ('INT', 3)))),
+            ('stmts_tail',
+                ('expr_int', ('INT', 4))))
+    )
+
+    kinds = [tree.get_kind(node) for node in tree.walk()]
+    assert kinds[:5] == ['entry', 'stmts_list', 'expr_add', 'expr_int', 'INT']
+    assert [tree.values[node] for node in tree.walk()
+            if tree.rule[node] == TOKEN] == [1, 2, 3, 4]
+
+
+def test_error_node() -> None:
+    tree = ExprLangErrorHandler().parse_tree('3+ *; 5')
+    cursor = tree.cursor()
+    assert cursor.goto_first_child()
+    assert cursor.kind == 'stmts_list'
+    assert cursor.goto_first_child()
+    assert cursor.kind == 'stmt_error'
+    assert cursor.is_error and not cursor.is_token
+    assert (cursor.start, cursor.end) == (0, 4)
+    assert cursor.child_count == 0
+
+
+def test_cursor() -> None:
+    input = '1 + 2*3'
+    tree = ExprLangErrorHandler().parse_tree(input)
+    cursor = tree.cursor()
+
+    assert not cursor.goto_parent()
+    assert not cursor.goto_next_sibling()
+    assert cursor.kind == 'entry'
+
+    assert cursor.goto_first_child()
+    assert cursor.kind == 'stmts_tail'
+    assert not cursor.goto_next_sibling()
+    assert cursor.goto_first_child()
+    assert cursor.kind == 'expr_add'
+    assert input[cursor.start:cursor.end] == '1 + 2*3'
+    assert cursor.rule > 0
+
+    assert cursor.goto_first_child()
+    assert cursor.goto_next_sibling()
+    assert cursor.kind == 'expr_mult'
+    assert input[cursor.start:cursor.end] == '2*3'
+    assert not cursor.goto_next_sibling()
+
+    assert cursor.goto_first_child()
+    assert cursor.goto_first_child()
+    assert cursor.is_token
+    assert (cursor.kind, cursor.value) == ('INT', 2)
+    assert not cursor.goto_first_child()
+
+    assert cursor.goto_parent()
+    assert cursor.goto_parent()
+    assert cursor.goto_parent()
+    assert cursor.kind == 'expr_add'
+
+    # A cursor can start at any node
+    sub = tree.cursor(cursor.node)
+    assert sub.kind == 'expr_add'
+    assert not sub.goto_parent()
+
+
+def test_token_root() -> None:
+    class TokenLang(ExprLangErrorHandler):
+        GRAMMAR_RULES = [
+            (None,          'entry',        'INT'),
+        ]
+
+    tree = TokenLang().parse_tree('12')
+    assert tree.to_tuple() == ('INT', 12)
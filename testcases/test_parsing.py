@@ -162,3 +162,28 @@ def test_shift_reduce_conflict() -> None:
 
     with pytest.raises(ParsionGeneratorError):
         ShiftReduceLang()
+
+
+def test_first_of_alternatives() -> None:
+    """
+    A symbol followed by a symbol with several rules, must be reducable by
+    the first token of each of the rules
+    """
+    class SeqLang(Parsion):
+        LEXER_RULES = [
+            (sym, f'({sym})', lambda x: x)
+            for sym in ['A', 'B', 'C']
+        ]
+        GRAMMAR_RULES = [
+            ('seq',         'entry',        'head tail'),
+            (None,          'head',         'A'),
+            (None,          'tail',         'B'),
+            (None,          'tail',         'C')
+        ]
+
+        def seq(self, head: str, tail: str) -> str:
+            return head + tail
+
+    lang = SeqLang()
+    assert lang.parse('AB') == 'AB'
+    assert lang.parse('AC') == 'AC'
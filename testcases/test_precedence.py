@@ -0,0 +1,102 @@
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+import pytest
+from parsion import ParsionGeneratorError, ParsionParseError
+from parsion.parsegen import ParsionFSM
+from parsion.static import export_static
+from languages import PrecLang, load_static
+
+
+class CompressedPrecLang(PrecLang):
+    COMPRESS_TABLE = True
+
+
+@pytest.fixture(params=['dict', 'compressed', 'binary', 'static'])
+def prec_lang(request: pytest.FixtureRequest, tmp_path: Path) -> Any:
+    if request.param == 'dict':
+        return PrecLang()
+    if request.param == 'compressed':
+        return CompressedPrecLang()
+    if request.param == 'binary':
+        module = load_static(export_static(
+            PrecLang, table_file=str(tmp_path / 'prec.tables')
+        ), str(tmp_path / 'prec_static.py'))
+    else:
+        module = load_static(export_static(PrecLang))
+
+    class StaticPrecLang(module.PrecLangStatic):  # type: ignore
+        COMPRESS_TABLE = True
+
+    return StaticPrecLang()
+
+
+def test_associativity(prec_lang: Any) -> None:
+    lang = prec_lang
+    assert lang.parse('1 - 2 - 3') == ('op', ('op', 1, 2), 3)
+    assert lang.parse('1 ^ 2 ^ 3') == ('op', 1, ('op', 2, 3))
+    assert lang.parse('1 == 2 + 3') == ('op', 1, ('op', 2, 3))
+    with pytest.raises(ParsionParseError):
+        lang.parse('1 == 2 == 3')
+
+
+def test_precedence() -> None:
+    lang = PrecLang()
+    assert lang.parse('1 + 2 * 3') == ('op', 1, ('op', 2, 3))
+    assert lang.parse('1 * 2 + 3') == ('op', ('op', 1, 2), 3)
+    assert lang.parse('(1 + 2) * 3') == ('op', ('op', 1, 2), 3)
+    assert lang.parse('1 * 2 ^ 3') == ('op', 1, ('op', 2, 3))
+
+    # %prec gives negation higher precedence than binary -
+    assert lang.parse('-1 - 2') == ('op', ('neg', 1), 2)
+    assert lang.parse('-1 ^ 2') == ('op', ('neg', 1), 2)
+
+
+def test_fewer_states() -> None:
+    # The same operators, with one symbol per precedence level
+    chain_rules: List[Tuple[Optional[str], str, str]] = [
+        ('entry',       'entry',    'expr'),
+        ('expr_binop',  'expr',     'expr1 == expr1'),
+        (None,          'expr',     'expr1'),
+        ('expr_binop',  'expr1',    'expr1 + expr2'),
+        ('expr_binop',  'expr1',    'expr1 - expr2'),
+        (None,          'expr1',    'expr2'),
+        ('expr_binop',  'expr2',    'expr2 * expr3'),
+        ('expr_binop',  'expr2',    'expr2 / expr3'),
+        (None,          'expr2',    'expr3'),
+        ('expr_binop',  'expr3',    'expr4 ^ expr3'),
+        (None,          'expr3',    'expr4'),
+        ('expr_neg',    'expr4',    '_- expr4'),
+        (None,          'expr4',    'INT'),
+        (None,          'expr4',    '_( expr _)'),
+    ]
+    chain = ParsionFSM(chain_rules)
+    flat = ParsionFSM(PrecLang.GRAMMAR_RULES, precedence=PrecLang.PRECEDENCE)
+    assert len(flat.states) < len(chain.states)
+
+
+def test_unresolved_conflict() -> None:
+    with pytest.raises(ParsionGeneratorError):
+        # No precedence for -
+        ParsionFSM(PrecLang.GRAMMAR_RULES, precedence=[
+            (assoc, syms.replace('-', ''))
+            for assoc, syms in PrecLang.PRECEDENCE
+        ])
+
+    with pytest.raises(ParsionGeneratorError):
+        # Reduce/reduce conflicts are not resolved
+        ParsionFSM([
+            ('entry',   'entry',    'a'),
+            ('entry',   'entry',    'b'),
+            ('a',       'a',        'X'),
+            ('b',       'b',        'X'),
+        ], precedence=[('left', 'X')])
+
+
+def test_invalid_precedence() -> None:
+    with pytest.raises(ParsionGeneratorError):
+        ParsionFSM(PrecLang.GRAMMAR_RULES, precedence=[('middle', '+')])
+    with pytest.raises(ParsionGeneratorError):
+        ParsionFSM(PrecLang.GRAMMAR_RULES,
+                   precedence=[('left', '+'), ('right', '+')])
+    with pytest.raises(ParsionGeneratorError):
+        ParsionFSM(PrecLang.GRAMMAR_RULES, precedence=[('left', '+ - * /')])
@@ -0,0 +1,111 @@
+from typing import Any, List, Optional
+import pytest
+from parsion import Parsion, ParsionGeneratorError, ParsionParseError
+from parsion.tree import LIST
+from languages import CallLang
+
+
+class SignLang(Parsion):
+    LEXER_RULES = [
+        (None,       r'(\s+)', lambda x: None),
+        ('INT',      r'([0-9]+)', lambda x: int(x)),
+        ('MINUS',    r'(-)', lambda x: '-'),
+    ]
+    GRAMMAR_RULES = [
+        ('signed',      'entry',    'MINUS? INT'),
+    ]
+
+    def signed(self, sign: Optional[str], value: int) -> int:
+        return -value if sign == '-' else value
+
+
+def test_lists() -> None:
+    lang = CallLang()
+    assert lang.parse('') == []
+    assert lang.parse('f();') == [('f', [])]
+    assert lang.parse('f(1); g(1, 2, h(3));') == [
+        ('f', [1]),
+        ('g', [1, 2, ('h', [3])]),
+    ]
+    assert lang.parse('(1 2 3) 4 5;') == [
+        ('block', [1, 2, 3]),
+        ('block', [4, 5]),
+    ]
+
+    with pytest.raises(ParsionParseError):
+        lang.parse('f(1,);')
+    with pytest.raises(ParsionParseError):
+        lang.parse('f(1 2);')
+    with pytest.raises(ParsionParseError):
+        lang.parse('();')
+
+
+def test_optional() -> None:
+    lang = SignLang()
+    assert lang.parse('12') == 12
+    assert lang.parse('-12') == -12
+    with pytest.raises(ParsionParseError):
+        lang.parse('--12')
+
+
+def test_separator_on_optional() -> None:
+    class BadLang(Parsion):
+        LEXER_RULES = [
+            ('INT',      r'([0-9]+)', lambda x: int(x)),
+        ]
+        GRAMMAR_RULES = [
+            (None,          'entry',    'INT?/,'),
+        ]
+
+    with pytest.raises(ParsionGeneratorError):
+        BadLang()
+
+
+def test_parse_tree() -> None:
+    tree = CallLang().parse_tree('f(1, -2); (3 4)')
+    assert tree.rule[tree.root] == LIST
+    assert tree.to_tuple() == (
+        '$list',
+        ('call',
+            ('NAME', 'f'),
+            ('$list',
+                ('arg', ('$none',), ('INT', 1)),
+                ('arg', ('MINUS', None), ('INT', 2)))),
+        ('block', ('$list', ('INT', 3), ('INT', 4))),
+    )
+
+    cursor = tree.cursor()
+    assert cursor.goto_first_child()
+    assert (cursor.start, cursor.end) == (0, 8)
+    assert cursor.goto_first_child()
+    assert cursor.goto_next_sibling()
+    assert cursor.kind == '$list'
+    assert (cursor.start, cursor.end) == (2, 7)
+
+    tree = CallLang().parse_tree('')
+    assert tree.to_tuple() == ('$list',)
+
+
+def test_long_list() -> None:
+    lang = CallLang()
+    count = 10000
+    result = lang.parse('f(' + ', '.join(['1'] * count) + ');')
+    assert result == [('f', [1] * count)]
+
+    # Each element is appended to the list as soon as it is parsed, so the
+    # stack doesn't grow with the length of the list
+    goals: List[Optional[str]] = []
+
+    def reduce_handler(id: int, goal: Optional[str], accepts: List[bool],
+                       parts: List[Any], start: int, end: int) -> Any:
+        goals.append(goal)
+        return None
+
+    lang.parser._parse(lang.lexer.tokenize('f(1, 2, 3);'), reduce_handler,
+                       lambda *args: None)
+    assert goals == [
+        '$none', 'arg', '$list_new',
+        '$none', 'arg', '$list_append',
+        '$none', 'arg', '$list_append',
+        None, 'call', None, '$list_new', None, None,
+    ]
@@ -0,0 +1,161 @@
+from pathlib import Path
+from typing import Any, List
+import pytest
+from parsion import Parsion, ParsionSelfCheckError
+from parsion.parsegen import ParsionFSM
+from parsion.static import export_static, main
+from languages import load_static
+
+
+class ListLang(Parsion):
+    LEXER_RULES = [
+        (None,       r'(\s+)', lambda x: None),
+        ('INT',      r'([0-9]+)', lambda x: int(x)),
+        (';',        r'(;)', lambda x: None)
+    ]
+    GRAMMAR_RULES = [
+        ('entry',         'entry',        'stmts'),
+        ('stmts_list',    'stmts',        'stmt _; stmts'),
+        ('stmts_tail',    'stmts',        'stmt'),
+        (None,            'stmt',         'INT'),
+        ('stmt_error',    'stmt',         '$ERROR')
+    ]
+
+    def stmts_list(self, x: Any, xs: List[Any]) -> List[Any]:
+        return [x] + xs
+
+    def stmts_tail(self, x: Any) -> List[Any]:
+        return [x]
+
+    def stmt_error(self, gen: str, start: int, pos: int, end: int,
+                   expect: Any) -> None:  # pragma: no cover
+        return None
+
+
+class Languages:
+    class NestedLang(ListLang):
+        pass
+
+
+class BrokenLang(ListLang):
+    def stmts_tail(self  # type: ignore[override]
+                   ) -> List[Any]:  # pragma: no cover
+        return []
+
+
+class UncheckedLang(BrokenLang):
+    SELF_CHECK = False
+
+
+class CountedLang(ListLang):
+    # Generators created and self checks run, for all subclasses
+    counts = {'fsm': 0, 'check': 0}
+
+    @classmethod
+    def _create_fsm(cls) -> ParsionFSM:
+        cls.counts['fsm'] += 1
+        return super()._create_fsm()
+
+    def _self_check(self) -> None:
+        self.counts['check'] += 1
+        super()._self_check()
+
+
+class KeptLang(CountedLang):
+    KEEP_GENERATOR = True
+
+
+class CompressedListLang(ListLang):
+    COMPRESS_TABLE = True
+
+
+def test_export_static() -> None:
+    module = load_static(export_static(ListLang))
+    checks = []
+
+    class CountedLang(module.ListLangStatic):  # type: ignore
+        STATIC_SELF_CHECKED = True
+
+        def _self_check(self) -> None:  # pragma: no cover
+            checks.append(self)
+
+    lang = CountedLang()
+    assert lang.parse('1; 2; 3') == [1, 2, 3]
+    assert lang.parser.error_handlers == ListLang().parser.error_handlers
+    assert checks == []
+
+
+def test_export_static_compressed() -> None:
+    module = load_static(export_static(CompressedListLang, 'StaticLang'))
+    lang = module.StaticLang()
+    assert lang.parse('1; 2; 3') == [1, 2, 3]
+    assert lang.parser.error_handlers \
+        == CompressedListLang().parser.error_handlers
+
+
+def test_subclass_checked() -> None:
+    module = load_static(export_static(ListLang))
+
+    class SubLang(module.ListLangStatic):  # type: ignore
+        def stmts_tail(self) -> List[Any]:  # pragma: no cover
+            return []
+
+    with pytest.raises(ParsionSelfCheckError):
+        SubLang()
+
+
+def test_export_checks_handlers() -> None:
+    with pytest.raises(ParsionSelfCheckError):
+        export_static(BrokenLang)
+
+
+def test_export_nested() -> None:
+    module = load_static(export_static(Languages.NestedLang))
+    assert module.NestedLangStatic().parse('1; 2') == [1, 2]
+
+    class LocalLang(ListLang):
+        pass
+
+    with pytest.raises(ValueError, match='defined in a function'):
+        export_static(LocalLang)
+
+
+def test_export_checks_unchecked() -> None:
+    UncheckedLang()
+    with pytest.raises(ParsionSelfCheckError):
+        export_static(UncheckedLang)
+
+
+def test_export_builds_once() -> None:
+    counts = CountedLang.counts
+    export_static(CountedLang)
+    assert counts == {'fsm': 1, 'check': 1}
+
+    # A compiled and checked class only needs a generator
+    export_static(CountedLang)
+    assert counts == {'fsm': 2, 'check': 1}
+
+    KeptLang()
+    export_static(KeptLang)
+    assert counts == {'fsm': 3, 'check': 2}
+
+
+def test_cli(capsys: pytest.CaptureFixture[str]) -> None:
+    assert main(['--name', 'CliLang',
+                 'testcases.test_static_export:ListLang']) == 0
+    module = load_static(capsys.readouterr().out)
+    assert module.CliLang().parse('4; 5') == [4, 5]
+
+    with pytest.raises(SystemExit):
+        main(['testcases.test_static_export'])
+
+
+def test_export_binary(tmp_path: Path,
+                       capsys: pytest.CaptureFixture[str]) -> None:
+    assert main(['--binary', str(tmp_path / 'list.tables'),
+                 'testcases.test_static_export:ListLang']) == 0
+    module = load_static(capsys.readouterr().out,
+                         str(tmp_path / 'list_static.py'))
+    lang = module.ListLangStatic()
+    assert lang.parse('4; 5') == [4, 5]
+    assert lang.parser.error_handlers == ListLang().parser.error_handlers
@@ -0,0 +1,65 @@
+import json
+import pytest
+from parsion import Parsion
+from parsion.parsegen import ParsionFSM
+from parsion.stats import build_report, load_language, main
+
+
+class StmtLang(Parsion):
+    GRAMMAR_RULES = [
+        ('entry',         'entry',        'stmts'),
+        ('stmts_list',    'stmts',        'stmt _; stmts'),
+        ('stmts_tail',    'stmts',        'stmt'),
+        (None,            'stmt',         'expr'),
+        ('stmt_error',    'stmt',         '$ERROR'),
+        ('expr_add',      'expr',         'expr _+ INT'),
+        ('expr_int',      'expr',         'INT'),
+    ]
+
+
+def test_fsm_stats() -> None:
+    fsm = ParsionFSM(StmtLang.GRAMMAR_RULES)
+    stats = fsm.stats()
+
+    assert stats['rules'] == 7
+    assert stats['states'] == len(fsm.states)
+    assert stats['table_entries'] == sum(len(s) for s in fsm.table)
+    assert stats['error_handler_states'] == len(fsm.error_handlers) > 0
+    assert stats['items_per_state_min'] <= stats['items_per_state_avg'] \
+        <= stats['items_per_state_max']
+    assert 0 < stats['table_density'] < 1
+    assert stats['table_bytes'] > 0
+    assert stats['time_firsts'] >= 0
+    assert stats['time_closures'] > 0
+    assert stats['time_states'] > 0
+
+
+def test_parallel_stats() -> None:
+    serial = ParsionFSM(StmtLang.GRAMMAR_RULES).stats()
+    parallel = ParsionFSM(StmtLang.GRAMMAR_RULES, processes=2).stats()
+    assert parallel['time_closures'] > 0
+    assert {k: v for k, v in parallel.items() if not k.startswith('time_')} \
+        == {k: v for k, v in serial.items() if not k.startswith('time_')}
+
+
+def test_load_language() -> None:
+    assert load_language('parsion:Parsion') is Parsion
+    assert load_language('testcases.test_stats:StmtLang').GRAMMAR_RULES \
+        == StmtLang.GRAMMAR_RULES
+    assert build_report(StmtLang)['rules'] == 7
+
+    with pytest.raises(ValueError):
+        load_language('testcases.test_stats')
+    with pytest.raises(ValueError):
+        load_language('testcases.test_stats:ParsionFSM')
+
+
+def test_cli(capsys: pytest.CaptureFixture[str]) -> None:
+    assert main(['testcases.test_stats:StmtLang']) == 0
+    assert 'table_density' in capsys.readouterr().out
+
+    assert main(['--json', 'testcases.test_stats:StmtLang']) == 0
+    assert json.loads(capsys.readouterr().out)['rules'] == 7
+
+    with pytest.raises(SystemExit):
+        main(['testcases.test_stats:NoSuchLang'])
@@ -0,0 +1,123 @@
+import sys
+from typing import Any, List, Optional, Tuple
+import pytest
+import parsion
+from parsion import ParsionLexer, ParsionLexerError
+from languages import ExprLangErrorHandler
+
+# NumPy is an optional dependency
+pytest.importorskip('numpy')
+from parsion.veclex import ParsionVectorLexer, simple_rule  # noqa: E402
+
+KEYWORD_RULES: List[Tuple[Optional[str], str, Any]] = [
+    (None,       r'(\s+)', lambda x: None),
+    ('STR',      r'("(?:[^"\\]|\\.)*")', lambda x: x[1:-1]),
+    ('INT',      r'([0-9]+|0x[0-9a-fA-F]+)', lambda x: int(x, base=0)),
+    ('FOR',      r'(for)(?:[^a-z0-9_]|$)', lambda x: None),
+    ('NAME',     r'([a-z_][a-z0-9_]*)', lambda x: x),
+    ('==',       r'(==)', lambda x: None),
+    ('=',        r'(=)', lambda x: None),
+    ('+',        r'(\+)', lambda x: None),
+    ('(',        r'([\(])', lambda x: None),
+]
+
+WORD_RULES: List[Tuple[Optional[str], str, Any]] = [
+    (None,       r'(\s+)', lambda x: None),
+    ('WORD',     r'(\w+)', lambda x: x),
+    ('PUNCT',    r'([^\w\s])', lambda x: x),
+]
+
+
+class VectorExprLang(ExprLangErrorHandler):
+    VECTOR_LEXER = True
+
+
+def _tokens(lexer: ParsionLexer, input: str) -> Any:
+    try:
+        return [(tok.name, tok.value, tok.start, tok.end)
+                for tok in lexer.tokenize(input)]
+    except ParsionLexerError as e:
+        return e.pos
+
+
+@pytest.mark.parametrize('regexp, simple', [
+    (r'(\s+)', True),
+    (r'([0-9]+)', True),
+    (r'(\+)', True),
+    (r'([a-z_][a-z0-9_]*)', True),
+    (r'(==)', False),
+    (r'([0-9]+|0x[0-9a-fA-F]+)', False),
+    (r'([0-9]+?)', False),
+    (r'([0-9]{1,3})', False),
+    (r'([0-9]+)(?:\s)', False),
+    (r'(?i)(a+)', False),
+    (r'((?i:a)+)', False),
+    (r'(?:a+)', False),
+    (r'(?i:a+)', False),
+    (r'(.)', False),
+])
+def test_simple_rule(regexp: str, simple: bool) -> None:
+    assert (simple_rule(regexp) is not None) == simple
+
+
+@pytest.mark.parametrize('rules, input', [
+    (KEYWORD_RULES, 'for x = 0x1f + foreach == "a\\"b" (fo'),
+    (KEYWORD_RULES, '  x12 = 34  '),
+    (KEYWORD_RULES, ''),
+    (KEYWORD_RULES, 'x = é'),
+    (KEYWORD_RULES, 'x = "é" + y'),
+    (KEYWORD_RULES, 'x = 1 - 2'),
+    (KEYWORD_RULES, 'x = "abc'),
+    (WORD_RULES, 'naïve café + straße!'),
+    (WORD_RULES, 'é '),
+])
+def test_same_tokens(rules: Any, input: str) -> None:
+    assert _tokens(ParsionVectorLexer(rules), input) == \
+        _tokens(ParsionLexer(rules), input)
+
+
+def test_columns() -> None:
+    lexer = ParsionVectorLexer(KEYWORD_RULES)
+    input = 'for x = "a" + 12'
+    columns = lexer.tokenize_columns(input)
+    assert len(columns) == 6
+    assert columns.start.tolist() == [0, 4, 6, 8, 12, 14]
+    assert columns.end.tolist() == [3, 5, 7, 11, 13, 16]
+    assert [KEYWORD_RULES[rule][0] for rule in columns.rule.tolist()] == \
+        ['FOR', 'NAME', '=', 'STR', '+', 'INT']
+    assert len(lexer.tokenize_columns('  ')) == 0
+
+    with pytest.raises(ParsionLexerError) as e:
+        lexer.tokenize_columns('x = 1 - 2')
+    assert e.value.pos == 5
+
+
+def test_handler_errors_first() -> None:
+    # Handlers are called for the tokens before invalid input, as by
+    # ParsionLexer, so their errors are raised first
+    def handler(value: str) -> Any:
+        raise ValueError(value)
+
+    lexer = ParsionVectorLexer([('INT', r'([0-9]+)', handler)])
+    with pytest.raises(ValueError, match='12'):
+        list(lexer.tokenize('12x'))
+
+
+def test_language() -> None:
+    lang = VectorExprLang()
+    assert isinstance(lang.lexer, ParsionVectorLexer)
+    assert parsion.ParsionVectorLexer is ParsionVectorLexer
+    assert lang.parse('(12+3)*4; 3+ *; 43') == [60, None, 43]
+
+
+def test_without_numpy(monkeypatch: pytest.MonkeyPatch) -> None:
+    # The regular expression lexer is used if NumPy can't be imported
+    monkeypatch.setitem(sys.modules, 'numpy', None)
+    monkeypatch.delitem(sys.modules, 'parsion.veclex')
+
+    class FallbackLang(ExprLangErrorHandler):
+        VECTOR_LEXER = True
+
+    lang = FallbackLang()
+    assert type(lang.lexer) is ParsionLexer
+    assert lang.parse('1+2') == [3]